@@ -6,10 +6,12 @@ READ-ONLY Bunq API access for maximum security
 SECURED with session cookies and rate limiting
 """
 
-from flask import Flask, jsonify, request, Response, session, make_response, send_from_directory, abort
+from flask import Flask, jsonify, request, Response, session, make_response, abort
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_caching import Cache
-from functools import wraps
+from flask_caching.backends.base import BaseCache
+from functools import wraps, lru_cache
 from bunq.sdk.context.api_context import ApiContext
 from bunq.sdk.context.api_environment_type import ApiEnvironmentType
 from bunq.sdk.context.bunq_context import BunqContext
@@ -33,7 +35,25 @@ import ipaddress
 import shutil
 import subprocess
 import threading
-from collections import defaultdict
+import pickle
+import bisect
+import operator
+import atexit
+import sys
+import zlib
+import gzip
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import brotli
+except ImportError:  # optional: responses fall back to gzip
+    brotli = None
+
+try:
+    import numpy as np
+except ImportError:  # optional: analytics fall back to pure Python
+    np = None
 
 # ============================================
 # LOGGING CONFIGURATION
@@ -85,6 +105,9 @@ _FX_RUNTIME_CACHE = {}
 _ENDPOINT_DISCOVERY_CACHE = {}
 _VAULTWARDEN_CLI_LOCK = threading.Lock()
 _BUNQ_INIT_LOCK = threading.Lock()
+_BUNQ_SESSION_LOCK = threading.Lock()
+_BUNQ_FETCH_EXECUTOR = None
+_BUNQ_FETCH_EXECUTOR_LOCK = threading.Lock()
 _BUNQ_CONTEXT_INITIALIZED = False
 _BUNQ_INIT_LAST_ATTEMPT_TS = 0.0
 _BUNQ_INIT_LAST_ERROR = None
@@ -1551,8 +1574,14 @@ def _list_payments_paginated(
     cached_endpoint, cached_mode,
     page_size, max_pages,
     discover_fn, source_name, missing_error,
+    stop_at_id=None,
 ):
-    """Shared paginated payment-list core used by both payment and card-payment fetchers."""
+    """
+    Shared paginated payment-list core used by both payment and card-payment fetchers.
+
+    With stop_at_id (incremental sync high-water mark) only payments newer than that
+    id are collected and paging stops as soon as a page reaches it.
+    """
     candidates = []
     if cached_endpoint is not None and cached_mode is not None:
         candidates.append(('cached', cached_endpoint, (cached_mode,)))
@@ -1580,6 +1609,7 @@ def _list_payments_paginated(
                     if older_id is not None:
                         query_params['older_id'] = older_id
 
+                    _BUNQ_GET_BUCKET.acquire()
                     result = _call_payment_list(ep, account_id, mode, params=query_params)
                     pages_fetched += 1
                     payments = getattr(result, 'value', result)
@@ -1599,18 +1629,23 @@ def _list_payments_paginated(
                         if dedupe_key in seen_payment_ids:
                             continue
                         seen_payment_ids.add(dedupe_key)
-                        collected.append(payment)
 
                         payment_id = _extract_payment_numeric_id(payment)
                         if payment_id is not None:
                             if oldest_payment_id is None or payment_id < oldest_payment_id:
                                 oldest_payment_id = payment_id
+                        if stop_at_id is not None and payment_id is not None and payment_id <= stop_at_id:
+                            continue
+                        collected.append(payment)
 
                         created_at = _extract_payment_created_datetime(payment)
                         if created_at is not None:
                             if oldest_payment_created is None or created_at < oldest_payment_created:
                                 oldest_payment_created = created_at
 
+                    if stop_at_id is not None and oldest_payment_id is not None and oldest_payment_id <= stop_at_id:
+                        stop_reason = 'high_water_reached'
+                        break
                     if cutoff_date and oldest_payment_created and oldest_payment_created < cutoff_date:
                         stop_reason = 'cutoff_reached'
                         break
@@ -1640,6 +1675,7 @@ def _list_payments_paginated(
                     'stop_reason': stop_reason,
                     'truncated': stop_reason == 'max_pages_reached',
                     'count': len(collected),
+                    'stop_at_id': stop_at_id,
                 }
                 if return_meta:
                     return collected, metadata, ep, mode
@@ -1655,7 +1691,7 @@ def _list_payments_paginated(
     raise RuntimeError(f"bunq-sdk {source_name} list failed: {last_exc}")
 
 
-def list_payments_for_account(account_id, cutoff_date=None, return_meta=False):
+def list_payments_for_account(account_id, cutoff_date=None, return_meta=False, stop_at_id=None):
     """List payments for one monetary account across bunq-sdk variants."""
     global _PAYMENT_ENDPOINT, _PAYMENT_LIST_MODE
     ensure_bunq_session_active()
@@ -1664,13 +1700,14 @@ def list_payments_for_account(account_id, cutoff_date=None, return_meta=False):
         _PAYMENT_ENDPOINT, _PAYMENT_LIST_MODE,
         _BUNQ_PAYMENT_PAGE_SIZE, _BUNQ_PAYMENT_MAX_PAGES,
         discover_payment_endpoints, 'payment', 'bunq-sdk missing payment endpoint',
+        stop_at_id=stop_at_id,
     )
     _PAYMENT_ENDPOINT = ep
     _PAYMENT_LIST_MODE = mode
     return (collected, metadata) if return_meta else collected
 
 
-def list_card_payments_for_account(account_id, cutoff_date=None, return_meta=False):
+def list_card_payments_for_account(account_id, cutoff_date=None, return_meta=False, stop_at_id=None):
     """List card payments for one monetary account when endpoint is available."""
     global _CARD_PAYMENT_ENDPOINT, _CARD_PAYMENT_LIST_MODE
     ensure_bunq_session_active()
@@ -1679,6 +1716,7 @@ def list_card_payments_for_account(account_id, cutoff_date=None, return_meta=Fal
         _CARD_PAYMENT_ENDPOINT, _CARD_PAYMENT_LIST_MODE,
         _BUNQ_CARD_PAYMENT_PAGE_SIZE, _BUNQ_CARD_PAYMENT_MAX_PAGES,
         discover_card_payment_endpoints, 'card_payment', 'bunq-sdk missing card payment endpoint',
+        stop_at_id=stop_at_id,
     )
     _CARD_PAYMENT_ENDPOINT = ep
     _CARD_PAYMENT_LIST_MODE = mode
@@ -2244,20 +2282,74 @@ app = Flask(__name__)
 STATIC_DIR = APP_DIR
 STATIC_FILES = {'index.html', 'styles.css', 'app.js'}
 
-# Simple in-memory cache (per process)
+# Response caching; the backend (shared SQLite or per-process) is RESPONSE_CACHE_BACKEND below.
 CACHE_ENABLED = get_bool_env('CACHE_ENABLED', True)
 CACHE_TTL_SECONDS = get_int_env('CACHE_TTL_SECONDS', 60)
 DEFAULT_PAGE_SIZE = get_int_env('DEFAULT_PAGE_SIZE', 500)
 MAX_PAGE_SIZE = get_int_env('MAX_PAGE_SIZE', 2000)
+# Pages with at least this many rows are streamed row by row instead of built with jsonify.
+STREAM_JSON_MIN_ROWS = max(get_int_env('STREAM_JSON_MIN_ROWS', 500), 1)
+# JSON API bodies below this size are sent uncompressed (streamed bodies are always compressed).
+COMPRESS_MIN_BYTES = max(get_int_env('COMPRESS_MIN_BYTES', 1024), 0)
 MAX_DAYS = get_int_env('MAX_DAYS', 3650)
+# Response cache backend: 'sqlite' is shared by all gunicorn workers and survives
+# restarts; 'simple' keeps the old per-process in-memory cache.
+RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'sqlite').strip().lower()
+RESPONSE_CACHE_MAX_MB = max(get_int_env('RESPONSE_CACHE_MAX_MB', 128), 1)
+RESPONSE_CACHE_MAX_ENTRIES = max(get_int_env('RESPONSE_CACHE_MAX_ENTRIES', 2000), 1)
+# Values that pickle to more than this are not written to the shared cache.
+RESPONSE_CACHE_MAX_ENTRY_KB = max(get_int_env('RESPONSE_CACHE_MAX_ENTRY_KB', 4096), 1)
+# Stale-while-revalidate: after CACHE_TTL_SECONDS an entry is served stale (and
+# refreshed in the background) for at most CACHE_MAX_STALE_SECONDS more. 0 disables.
+CACHE_MAX_STALE_SECONDS = max(get_int_env('CACHE_MAX_STALE_SECONDS', 600), 0)
+# Materialized /api/transactions result sets: pages of one walk are sliced from
+# the same snapshot, so the snapshot must outlive the regular response TTL.
+TRANSACTION_SNAPSHOT_TTL_SECONDS = max(
+    get_int_env('TRANSACTION_SNAPSHOT_TTL_SECONDS', max(CACHE_TTL_SECONDS, 300)),
+    CACHE_TTL_SECONDS + CACHE_MAX_STALE_SECONDS,
+)
+# Result sets each worker keeps in memory, so the pages of one walk do not each
+# load the full set from the shared response cache. 0 disables.
+TRANSACTION_SNAPSHOT_MEMO_ENTRIES = max(get_int_env('TRANSACTION_SNAPSHOT_MEMO_ENTRIES', 4), 0)
+# Rows per response-cache entry of a stored result set (keeps each entry small).
+TRANSACTION_SNAPSHOT_SLICE_ROWS = max(get_int_env('TRANSACTION_SNAPSHOT_SLICE_ROWS', 5000), 1)
 
 # Local data store for historical analytics (P1)
 DATA_DB_ENABLED = get_bool_env('DATA_DB_ENABLED', True)
 DATA_DB_PATH = os.getenv('DATA_DB_PATH', os.path.join('config', 'dashboard_data.db'))
+# Write-behind: history-store writes from the request path are queued and written by
+# one background thread per process every DATA_DB_WRITE_BEHIND_MS (0 = write inline).
+DATA_DB_WRITE_BEHIND_MS = max(get_int_env('DATA_DB_WRITE_BEHIND_MS', 2000), 0)
+DATA_DB_WRITE_BEHIND_MAX_PENDING = max(get_int_env('DATA_DB_WRITE_BEHIND_MAX_PENDING', 10000), 1)
+# An unchanged balance snapshot is rewritten (captured_at refresh) at most this often.
+ACCOUNT_SNAPSHOT_MIN_INTERVAL_SECONDS = max(get_int_env('ACCOUNT_SNAPSHOT_MIN_INTERVAL_SECONDS', 300), 0)
 FX_ENABLED = get_bool_env('FX_ENABLED', True)
 FX_RATE_SOURCE = os.getenv('FX_RATE_SOURCE', 'frankfurter').strip().lower()
 FX_REQUEST_TIMEOUT_SECONDS = get_int_env('FX_REQUEST_TIMEOUT_SECONDS', 8)
 FX_CACHE_HOURS = get_int_env('FX_CACHE_HOURS', 24)
+# A failed or empty rate lookup is not retried for this long (0 = retry every time).
+FX_NEGATIVE_CACHE_SECONDS = max(get_int_env('FX_NEGATIVE_CACHE_SECONDS', 300), 0)
+# Incremental Bunq sync: fetch only payments newer than the stored high-water mark
+# and serve older history from transaction_cache (requires DATA_DB_ENABLED).
+TRANSACTION_SYNC_ENABLED = get_bool_env('TRANSACTION_SYNC_ENABLED', True)
+# /api/statistics is answered from transaction_cache while the last sync is younger
+# than this bound; older syncs fall back to the live Bunq path.
+STATISTICS_MAX_STALENESS_SECONDS = max(get_int_env('STATISTICS_MAX_STALENESS_SECONDS', 6 * 3600), 0)
+# How often a worker checks whether another worker changed the category rules.
+CATEGORY_RULES_RELOAD_SECONDS = max(get_int_env('CATEGORY_RULES_RELOAD_SECONDS', 5), 1)
+# Background pre-warm scheduler: one gunicorn worker at a time (SQLite lease) refreshes
+# accounts, transaction_cache and the common day windows every interval.
+SCHEDULER_ENABLED = get_bool_env('SCHEDULER_ENABLED', True)
+SCHEDULER_INTERVAL_SECONDS = max(get_int_env('SCHEDULER_INTERVAL_SECONDS', 900), 60)
+SCHEDULER_LEASE_SECONDS = max(get_int_env('SCHEDULER_LEASE_SECONDS', SCHEDULER_INTERVAL_SECONDS * 2), SCHEDULER_INTERVAL_SECONDS + 30)
+SCHEDULER_WARM_DAYS = sorted({
+    max(1, min(int(part), MAX_DAYS))
+    for part in os.getenv('SCHEDULER_WARM_DAYS', '30,90,365').split(',')
+    if part.strip().isdigit()
+})
+# Account filters (account_ids) the dashboard user requested recently are warmed
+# too, most recent first; 0 warms only the unfiltered windows.
+SCHEDULER_WARM_ACCOUNT_FILTERS = max(get_int_env('SCHEDULER_WARM_ACCOUNT_FILTERS', 3), 0)
 AUTO_SET_BUNQ_WHITELIST_IP = get_bool_env('AUTO_SET_BUNQ_WHITELIST_IP', True)
 AUTO_SET_BUNQ_WHITELIST_DEACTIVATE_OTHERS = get_bool_env('AUTO_SET_BUNQ_WHITELIST_DEACTIVATE_OTHERS', False)
 USE_VAULTWARDEN = get_bool_env('USE_VAULTWARDEN', True)
@@ -2269,14 +2361,926 @@ _BUNQ_CARD_PAYMENT_PAGE_SIZE = min(200, max(1, get_int_env('BUNQ_CARD_PAYMENT_PA
 _BUNQ_PAYMENT_MAX_PAGES = max(1, get_int_env('BUNQ_PAYMENT_MAX_PAGES', 50))
 _BUNQ_CARD_PAYMENT_MAX_PAGES = max(1, get_int_env('BUNQ_CARD_PAYMENT_MAX_PAGES', _BUNQ_PAYMENT_MAX_PAGES))
 
+# Concurrent Bunq fetching: bounded worker pool + shared GET budget.
+# Bunq documents a GET limit of 3 requests per 3 seconds; set BUNQ_GET_RATE_LIMIT=0 to disable.
+BUNQ_FETCH_WORKERS = max(1, get_int_env('BUNQ_FETCH_WORKERS', 4))
+BUNQ_GET_RATE_LIMIT = max(0, get_int_env('BUNQ_GET_RATE_LIMIT', 3))
+BUNQ_GET_RATE_WINDOW_SECONDS = max(1, get_int_env('BUNQ_GET_RATE_WINDOW_SECONDS', 3))
+
+class TokenBucket:
+    """Thread-safe token bucket shared by all Bunq fetch threads in this process."""
+
+    def __init__(self, capacity, window_seconds):
+        self.capacity = capacity
+        self.refill_per_second = (capacity / float(window_seconds)) if capacity > 0 else 0.0
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until one token is available; no-op when the bucket is disabled."""
+        if self.capacity <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    float(self.capacity),
+                    self._tokens + (now - self._updated_at) * self.refill_per_second,
+                )
+                self._updated_at = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+                sleep_seconds = (1.0 - self._tokens) / self.refill_per_second
+            time.sleep(sleep_seconds)
+            waited += sleep_seconds
+
+_BUNQ_GET_BUCKET = TokenBucket(BUNQ_GET_RATE_LIMIT, BUNQ_GET_RATE_WINDOW_SECONDS)
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls within this process: the first caller for a
+    key runs the function, later callers wait and share its result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.counters = {'leaders': 0, 'coalesced': 0}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = {'event': threading.Event(), 'result': None, 'error': None}
+                self._calls[key] = call
+                self.counters['leaders'] += 1
+                is_leader = True
+            else:
+                self.counters['coalesced'] += 1
+                is_leader = False
+
+        if not is_leader:
+            call['event'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = fn()
+            return call['result']
+        except Exception as exc:
+            call['error'] = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call['event'].set()
+
+    def stats(self):
+        with self._lock:
+            return {**self.counters, 'in_flight': len(self._calls)}
+
+_SINGLE_FLIGHT = SingleFlight()
+
+def get_bunq_fetch_executor():
+    """Lazily create the per-process Bunq fetch pool (after gunicorn forks workers)."""
+    global _BUNQ_FETCH_EXECUTOR
+    if _BUNQ_FETCH_EXECUTOR is None:
+        with _BUNQ_FETCH_EXECUTOR_LOCK:
+            if _BUNQ_FETCH_EXECUTOR is None:
+                _BUNQ_FETCH_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=BUNQ_FETCH_WORKERS,
+                    thread_name_prefix='bunq-fetch',
+                )
+    return _BUNQ_FETCH_EXECUTOR
+
+_DATA_DB_LOCAL = threading.local()
+_DATA_DB_CONNECTIONS = {}
+_DATA_DB_CONNECTIONS_PID = None
+_DATA_DB_CONNECTIONS_LOCK = threading.Lock()
+
+def _open_data_db_connection():
+    os.makedirs(os.path.dirname(DATA_DB_PATH), exist_ok=True)
+    # check_same_thread=False only so shutdown can close connections of finished
+    # threads; each connection is still used by exactly one thread.
+    connection = sqlite3.connect(DATA_DB_PATH, timeout=10, check_same_thread=False, cached_statements=256)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+def _close_data_db_connection(connection):
+    try:
+        connection.execute("PRAGMA optimize")
+        connection.close()
+    except Exception as exc:
+        logger.debug(f"Closing history store connection failed: {exc}")
+
 def get_data_db_connection():
+    """
+    Return this thread's connection to the history store, opening it on first use.
+
+    Connections live as long as their thread, so pragmas run once and sqlite3's
+    per-connection statement cache is reused across calls. Callers hand the
+    connection back with release_data_db_connection() instead of closing it.
+    """
+    global _DATA_DB_CONNECTIONS_PID
     if not DATA_DB_ENABLED:
         return None
-    os.makedirs(os.path.dirname(DATA_DB_PATH), exist_ok=True)
-    connection = sqlite3.connect(DATA_DB_PATH, timeout=10)
-    connection.row_factory = sqlite3.Row
+    connection = getattr(_DATA_DB_LOCAL, 'connection', None)
+    if connection is not None and getattr(_DATA_DB_LOCAL, 'pid', None) == os.getpid():
+        return connection
+
+    connection = _open_data_db_connection()
+    _DATA_DB_LOCAL.connection = connection
+    _DATA_DB_LOCAL.pid = os.getpid()
+    current = threading.current_thread()
+    with _DATA_DB_CONNECTIONS_LOCK:
+        if _DATA_DB_CONNECTIONS_PID != os.getpid():
+            # Forked child: connections inherited from the parent must not be touched.
+            _DATA_DB_CONNECTIONS.clear()
+            _DATA_DB_CONNECTIONS_PID = os.getpid()
+        # Short-lived threads (background refreshes) leave their connection behind.
+        for thread, stale_connection in list(_DATA_DB_CONNECTIONS.values()):
+            if not thread.is_alive():
+                _DATA_DB_CONNECTIONS.pop(thread.ident, None)
+                _close_data_db_connection(stale_connection)
+        _DATA_DB_CONNECTIONS[current.ident] = (current, connection)
     return connection
 
+def release_data_db_connection(connection):
+    """End of a unit of work: never leave a transaction open on a pooled connection."""
+    if connection is not None and connection.in_transaction:
+        connection.rollback()
+
+def close_data_db_connections():
+    """Close every pooled connection of this process (worker shutdown)."""
+    with _DATA_DB_CONNECTIONS_LOCK:
+        connections = list(_DATA_DB_CONNECTIONS.values())
+        _DATA_DB_CONNECTIONS.clear()
+    for _, connection in connections:
+        _close_data_db_connection(connection)
+    _DATA_DB_LOCAL.connection = None
+
+atexit.register(close_data_db_connections)
+
+class WriteBehindQueue:
+    """
+    Per-process write-behind buffer for one history-store table.
+
+    Request threads submit rows keyed by their primary key; a newer row for a key
+    that is still queued replaces it, so repeated writes fold into one. A single
+    background thread hands everything queued to write_batch(connection, rows)
+    in one transaction every interval, so rows submitted together always commit
+    together. prepare_batch(rows) runs first, outside the transaction (network
+    lookups), and after_write(rows) once the batch is committed. The queue is
+    bounded: a submit that finds it full writes the batch itself (backpressure).
+    A failed batch is requeued whole, even past the bound: its rows may carry
+    sync marks that already let the next fetch skip them. Pending rows are
+    flushed at exit.
+    """
+
+    def __init__(self, name, write_batch, prepare_batch=None, after_write=None, interval_ms=None, max_pending=None):
+        self.name = name
+        self._write_batch = write_batch
+        self._prepare_batch = prepare_batch
+        self._after_write = after_write
+        self.interval_ms = DATA_DB_WRITE_BEHIND_MS if interval_ms is None else interval_ms
+        self.max_pending = max_pending or DATA_DB_WRITE_BEHIND_MAX_PENDING
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending = {}
+        self._thread = None
+        self._pid = None
+        self.counters = {
+            'submitted': 0,
+            'folded': 0,
+            'written': 0,
+            'batches': 0,
+            'inline_flushes': 0,
+            'failures': 0,
+            'requeued': 0,
+            'peak_pending': 0,
+        }
+        self.last_batch_rows = 0
+        self.last_flush_ms = None
+        self.last_error = None
+        self.last_flush_at = None
+        atexit.register(self.flush)
+
+    def submit(self, key, row):
+        self.submit_many([(key, row)])
+
+    def submit_many(self, items):
+        """Queue (key, row) pairs; they reach the same batch or an earlier one."""
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked child: the parent's thread and queued rows are not ours.
+                self._pending.clear()
+                self._thread = None
+                self._pid = os.getpid()
+            for key, row in items:
+                self.counters['submitted'] += 1
+                if key in self._pending:
+                    self.counters['folded'] += 1
+                self._pending[key] = row
+            self.counters['peak_pending'] = max(self.counters['peak_pending'], len(self._pending))
+            full = len(self._pending) >= self.max_pending
+            if full and self.interval_ms:
+                self.counters['inline_flushes'] += 1
+            if self.interval_ms and not full and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f'write-behind-{self.name}', daemon=True)
+                self._thread.start()
+        if full or not self.interval_ms:
+            self.flush()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval_ms / 1000.0)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as exc:
+                # flush() requeues its own failures; never let the writer thread die.
+                logger.warning(f"⚠️ Write-behind {self.name} writer error: {exc}")
+
+    def flush(self):
+        """Write everything queued so far; returns the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                if self._pid != os.getpid() or not self._pending:
+                    return 0
+                batch, self._pending = self._pending, {}
+            started = time.perf_counter()
+            connection = None
+            try:
+                # Opening the connection can fail too (makedirs, a locked WAL switch).
+                connection = get_data_db_connection()
+                if connection is None:
+                    raise sqlite3.OperationalError('history store unavailable')
+                rows = list(batch.values())
+                if self._prepare_batch is not None:
+                    rows = self._prepare_batch(rows)
+                with connection:
+                    self._write_batch(connection, rows)
+            except Exception as exc:
+                self.counters['failures'] += 1
+                self.last_error = str(exc)
+                logger.warning(f"⚠️ Write-behind flush of {len(batch)} {self.name} row(s) failed: {exc}")
+                with self._lock:
+                    # Retry next interval, ahead of what arrived meanwhile; a newer
+                    # row for the same key replaces the failed one.
+                    batch.update(self._pending)
+                    self._pending = batch
+                    self.counters['requeued'] += len(batch)
+                    self.counters['peak_pending'] = max(self.counters['peak_pending'], len(self._pending))
+                return 0
+            finally:
+                release_data_db_connection(connection)
+            if self._after_write is not None:
+                try:
+                    self._after_write(rows)
+                except Exception as exc:
+                    logger.warning(f"⚠️ Write-behind {self.name} after-write hook failed: {exc}")
+            self.counters['written'] += len(batch)
+            self.counters['batches'] += 1
+            self.last_batch_rows = len(batch)
+            self.last_flush_ms = round((time.perf_counter() - started) * 1000, 1)
+            self.last_error = None
+            self.last_flush_at = datetime.now(timezone.utc).isoformat()
+            return len(batch)
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self.counters,
+                'pending': len(self._pending),
+                'interval_ms': self.interval_ms,
+                'max_pending': self.max_pending,
+                'last_batch_rows': self.last_batch_rows,
+                'last_flush_ms': self.last_flush_ms,
+                'last_flush_at': self.last_flush_at,
+                'last_error': self.last_error,
+            }
+
+def _transaction_cache_key_sql(tx_id, account_id, source, tx_date, amount, description):
+    return build_transaction_cache_key({
+        'id': tx_id,
+        'account_id': account_id,
+        'source': source,
+        'date': tx_date,
+        'amount': amount,
+        'description': description,
+    })
+
+def migrate_transaction_cache_keys(connection):
+    """
+    Rebuild a transaction_cache keyed by SHA-256 hex strings on integer keys.
+    Rows that map to the same key (older stores kept one row per changed
+    description or amount) collapse into the most recently captured one.
+    Runs in the caller's transaction, or in its own IMMEDIATE transaction when
+    the caller holds none (DDL does not open one implicitly); returns True when
+    rows were migrated.
+    """
+    if not connection.in_transaction:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            migrated = migrate_transaction_cache_keys(connection)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        return migrated
+    key_type = next(
+        (row['type'] for row in connection.execute("PRAGMA table_info(transaction_cache)") if row['name'] == 'tx_key'),
+        None,
+    )
+    if key_type is None or key_type.upper() == 'INTEGER':
+        return False
+
+    columns = [row['name'] for row in connection.execute("PRAGMA table_info(transaction_cache)")]
+    definitions = {
+        row['name']: f"{row['name']} {row['type']}"
+        + (' NOT NULL' if row['notnull'] else '')
+        + (f" DEFAULT {row['dflt_value']}" if row['dflt_value'] is not None else '')
+        for row in connection.execute("PRAGMA table_info(transaction_cache)")
+    }
+    definitions['tx_key'] = 'tx_key INTEGER PRIMARY KEY'
+    value_columns = [name for name in columns if name != 'tx_key']
+    connection.create_function('transaction_cache_key', 6, _transaction_cache_key_sql, deterministic=True)
+    connection.execute("DROP TABLE IF EXISTS transaction_cache_migrating")
+    connection.execute(
+        f"CREATE TABLE transaction_cache_migrating ({', '.join(definitions[name] for name in columns)})"
+    )
+    connection.execute(f"""
+        INSERT INTO transaction_cache_migrating (tx_key, {', '.join(value_columns)})
+        SELECT transaction_cache_key(tx_id, account_id, source, tx_date, amount, description),
+               {', '.join(value_columns)}
+        FROM transaction_cache
+        WHERE true
+        ON CONFLICT(tx_key) DO UPDATE SET
+            {', '.join(f'{name} = excluded.{name}' for name in value_columns)}
+        WHERE excluded.captured_at > transaction_cache_migrating.captured_at
+    """)
+    connection.execute("DROP TABLE transaction_cache")
+    connection.execute("ALTER TABLE transaction_cache_migrating RENAME TO transaction_cache")
+    return True
+
+def _ensure_table_columns(connection, table_name, columns):
+    """Add missing columns to an existing table (lightweight forward-only migration)."""
+    existing = {row['name'] for row in connection.execute(f"PRAGMA table_info({table_name})")}
+    for column_name, column_type in columns:
+        if column_name not in existing:
+            connection.execute(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}")
+
+# Daily rollup of transaction_cache (epoch day x account x category x internal x
+# named merchant), kept exact by triggers on every insert/update/delete of a raw row.
+# Expressions take {row} = 'NEW.' / 'OLD.' / '' (plain SELECT).
+_ROLLUP_STATS_AMOUNT = (
+    "(CASE WHEN {row}amount_eur IS NOT NULL THEN {row}amount_eur "
+    "WHEN UPPER(COALESCE({row}currency, 'EUR')) = 'EUR' THEN {row}amount ELSE 0 END)"
+)
+_ROLLUP_DIMENSIONS = (
+    # Epoch day (tx_day); rows whose tx_date SQLite cannot parse land on day 0.
+    ('day', "COALESCE({row}tx_day, 0)"),
+    ('account_id', "{row}account_id"),
+    ('category', "COALESCE(NULLIF(TRIM({row}category), ''), 'Overig')"),
+    ('is_internal_transfer', "{row}is_internal_transfer"),
+    ('has_merchant', (
+        "(CASE WHEN TRIM(COALESCE({row}merchant, '')) != '' "
+        "AND LOWER(TRIM({row}merchant)) NOT IN ('unknown', 'onbekend') THEN 1 ELSE 0 END)"
+    )),
+)
+_ROLLUP_MEASURES = (
+    ('tx_count', "1"),
+    ('income_eur', f"(CASE WHEN {_ROLLUP_STATS_AMOUNT} > 0 THEN {_ROLLUP_STATS_AMOUNT} ELSE 0 END)"),
+    ('expense_eur', f"(CASE WHEN {_ROLLUP_STATS_AMOUNT} < 0 THEN -{_ROLLUP_STATS_AMOUNT} ELSE 0 END)"),
+    ('sum_native', "{row}amount"),
+    ('native_income_count', "(CASE WHEN {row}amount > 0 THEN 1 ELSE 0 END)"),
+    ('native_expense_count', "(CASE WHEN {row}amount < 0 THEN 1 ELSE 0 END)"),
+    ('native_expense_amount', "(CASE WHEN {row}amount < 0 THEN -{row}amount ELSE 0 END)"),
+    ('eur_known_count', "(CASE WHEN {row}amount_eur IS NOT NULL THEN 1 ELSE 0 END)"),
+)
+# Raw columns that feed a rollup dimension or measure.
+_ROLLUP_SOURCE_COLUMNS = (
+    'tx_date', 'account_id', 'category', 'is_internal_transfer', 'merchant', 'amount', 'amount_eur', 'currency',
+)
+_ROLLUP_COLUMNS = (
+    [name for name, _ in _ROLLUP_DIMENSIONS] + [name for name, _ in _ROLLUP_MEASURES] + ['last_captured_at']
+)
+
+def _rollup_row_sql(row):
+    """Dimension and measure expressions (plus captured_at) of one raw row."""
+    return [expr.format(row=row) for _, expr in (*_ROLLUP_DIMENSIONS, *_ROLLUP_MEASURES)] + [f"{row}captured_at"]
+
+def _rollup_apply_sql(row, sign):
+    """Trigger statement(s) adding (sign='+') or removing (sign='-') one raw row."""
+    values = _rollup_row_sql(row)
+    dimension_count = len(_ROLLUP_DIMENSIONS)
+    if sign == '-':
+        values = (
+            values[:dimension_count]
+            + [f"-{expr}" for expr in values[dimension_count:-1]]
+            + ['NULL']
+        )
+    key_columns = ', '.join(name for name, _ in _ROLLUP_DIMENSIONS)
+    statements = [f"""
+        INSERT INTO transaction_daily_rollup ({', '.join(_ROLLUP_COLUMNS)})
+        VALUES ({', '.join(values)})
+        ON CONFLICT({key_columns}) DO UPDATE SET
+            {', '.join(f"{name} = {name} + excluded.{name}" for name, _ in _ROLLUP_MEASURES)},
+            last_captured_at = CASE
+                WHEN excluded.last_captured_at > COALESCE(transaction_daily_rollup.last_captured_at, '')
+                THEN excluded.last_captured_at
+                ELSE transaction_daily_rollup.last_captured_at
+            END;
+    """]
+    if sign == '-':
+        key_match = ' AND '.join(
+            f"{name} = {expr}" for name, expr in zip((name for name, _ in _ROLLUP_DIMENSIONS), values)
+        )
+        statements.append(f"DELETE FROM transaction_daily_rollup WHERE {key_match} AND tx_count <= 0;")
+    return '\n'.join(statements)
+
+def install_transaction_rollup(connection):
+    """
+    Create transaction_daily_rollup and its maintenance triggers.
+
+    The first install (or a missing trigger) rebuilds the rollup from
+    transaction_cache inside the same IMMEDIATE transaction, so concurrent
+    workers and writers never see a half-built rollup.
+    """
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        rebuilt = _install_transaction_rollup(connection)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    return rebuilt
+
+def _install_transaction_rollup(connection):
+    """install_transaction_rollup inside the caller's transaction; returns True when rebuilt."""
+    changed = ' OR '.join(f"OLD.{column} IS NOT NEW.{column}" for column in _ROLLUP_SOURCE_COLUMNS)
+    unchanged = ' AND '.join(f"OLD.{column} IS NEW.{column}" for column in _ROLLUP_SOURCE_COLUMNS)
+    new_key = ' AND '.join(
+        f"{name} = {expr.format(row='NEW.')}" for name, expr in _ROLLUP_DIMENSIONS
+    )
+    triggers = {
+        'trg_transaction_rollup_insert': f"""
+            CREATE TRIGGER trg_transaction_rollup_insert AFTER INSERT ON transaction_cache
+            BEGIN {_rollup_apply_sql('NEW.', '+')} END
+        """,
+        'trg_transaction_rollup_delete': f"""
+            CREATE TRIGGER trg_transaction_rollup_delete AFTER DELETE ON transaction_cache
+            BEGIN {_rollup_apply_sql('OLD.', '-')} END
+        """,
+        'trg_transaction_rollup_update': f"""
+            CREATE TRIGGER trg_transaction_rollup_update AFTER UPDATE ON transaction_cache
+            WHEN {changed}
+            BEGIN {_rollup_apply_sql('OLD.', '-')} {_rollup_apply_sql('NEW.', '+')} END
+        """,
+        # Re-captured but otherwise identical row: only the capture time moves.
+        'trg_transaction_rollup_capture': f"""
+            CREATE TRIGGER trg_transaction_rollup_capture AFTER UPDATE OF captured_at ON transaction_cache
+            WHEN {unchanged} AND NEW.captured_at > OLD.captured_at
+            BEGIN
+                UPDATE transaction_daily_rollup SET last_captured_at = NEW.captured_at
+                WHERE {new_key} AND COALESCE(last_captured_at, '') < NEW.captured_at;
+            END
+        """,
+    }
+    connection.execute(f"""
+        CREATE TABLE IF NOT EXISTS transaction_daily_rollup (
+            day INTEGER NOT NULL,
+            account_id TEXT NOT NULL,
+            category TEXT NOT NULL,
+            is_internal_transfer INTEGER NOT NULL,
+            has_merchant INTEGER NOT NULL,
+            {', '.join(f"{name} {'INTEGER' if name.endswith('count') else 'REAL'} NOT NULL DEFAULT 0" for name, _ in _ROLLUP_MEASURES)},
+            last_captured_at TEXT,
+            PRIMARY KEY (day, account_id, category, is_internal_transfer, has_merchant)
+        ) WITHOUT ROWID
+    """)
+    existing = {
+        row[0]
+        for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_transaction_rollup_%'"
+        )
+    }
+    if existing == set(triggers):
+        return False
+    for name in existing:
+        connection.execute(f"DROP TRIGGER {name}")
+    for sql in triggers.values():
+        connection.execute(sql)
+    rebuild_transaction_rollup(connection)
+    return True
+
+def rebuild_transaction_rollup(connection):
+    """Recompute transaction_daily_rollup from transaction_cache (caller owns the transaction)."""
+    dimension_sql = [expr.format(row='') for _, expr in _ROLLUP_DIMENSIONS]
+    measure_sql = [f"SUM({expr.format(row='')})" for _, expr in _ROLLUP_MEASURES]
+    connection.execute("DELETE FROM transaction_daily_rollup")
+    connection.execute(f"""
+        INSERT INTO transaction_daily_rollup ({', '.join(_ROLLUP_COLUMNS)})
+        SELECT {', '.join(dimension_sql + measure_sql)}, MAX(captured_at)
+        FROM transaction_cache
+        GROUP BY {', '.join(str(position) for position in range(1, len(dimension_sql) + 1))}
+    """)
+
+def epoch_seconds(value_iso):
+    """UTC epoch seconds of an ISO timestamp, matching the tx_epoch column."""
+    return int(parse_bunq_datetime(value_iso, context='cutoff').timestamp())
+
+def rollup_window_source(cutoff_iso):
+    """
+    (sql, params) for a subquery with the rollup columns covering tx_date >= cutoff_iso:
+    whole days after the cutoff day come from the rollup, the partial cutoff day
+    from raw rows (one row each, same columns), so sums stay exact. `day` is
+    returned as YYYY-MM-DD.
+    """
+    cutoff_epoch = epoch_seconds(cutoff_iso)
+    next_day = cutoff_epoch // 86400 + 1
+    raw_columns = _rollup_row_sql('')
+    day_key = "date({} * 86400, 'unixepoch') AS day"
+    sql = f"""
+        SELECT {', '.join([day_key.format('day'), *_ROLLUP_COLUMNS[1:]])}
+        FROM transaction_daily_rollup
+        WHERE day >= ?
+        UNION ALL
+        SELECT {', '.join([day_key.format(raw_columns[0]), *raw_columns[1:]])}
+        FROM transaction_cache
+        WHERE tx_epoch >= ? AND tx_epoch < ?
+    """
+    return sql, [next_day, cutoff_epoch, next_day * 86400]
+
+def _create_base_schema(connection):
+    """
+    Schema v1: every table and index the store had before PRAGMA user_version was
+    tracked, including the columns, integer tx_key and indexes that unversioned
+    releases added in place. An unversioned store may have any subset of those,
+    so this step both creates a fresh store and brings an old one up to v1;
+    tx_epoch/tx_day and the rollup come later (v2).
+    """
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS account_snapshots (
+            snapshot_date TEXT NOT NULL,
+            account_id TEXT NOT NULL,
+            description TEXT,
+            account_type TEXT,
+            account_class TEXT,
+            status TEXT,
+            balance_value REAL NOT NULL,
+            balance_currency TEXT NOT NULL,
+            balance_eur_value REAL,
+            fx_rate_to_eur REAL,
+            captured_at TEXT NOT NULL,
+            PRIMARY KEY (snapshot_date, account_id)
+        )
+    """)
+
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS transaction_cache (
+            tx_key INTEGER PRIMARY KEY,
+            tx_id TEXT,
+            account_id TEXT NOT NULL,
+            account_name TEXT,
+            tx_date TEXT NOT NULL,
+            amount REAL NOT NULL,
+            currency TEXT,
+            amount_eur REAL,
+            description TEXT,
+            counterparty TEXT,
+            merchant TEXT,
+            category TEXT,
+            tx_type TEXT,
+            is_internal_transfer INTEGER NOT NULL DEFAULT 0,
+            captured_at TEXT NOT NULL
+        )
+    """)
+    # Columns added for incremental sync: enough to rebuild the API row shape.
+    _ensure_table_columns(connection, 'transaction_cache', (
+        ('source', 'TEXT'),
+        ('fx_rate_to_eur', 'REAL'),
+        ('counterparty_account_name', 'TEXT'),
+        ('counterparty_account_id', 'TEXT'),
+        ('counterparty_iban', 'TEXT'),
+        # NULL: captured before MCCs were stored; '' when Bunq sent none.
+        ('merchant_category_code', 'TEXT'),
+        # Fingerprint of the stored content; NULL until rewritten (or while FX is missing).
+        ('content_hash', 'INTEGER'),
+    ))
+    if migrate_transaction_cache_keys(connection):
+        logger.info("📦 Migrated transaction_cache to integer keys")
+
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS transaction_sync_state (
+            account_id TEXT NOT NULL,
+            source TEXT NOT NULL,
+            high_water_id INTEGER,
+            synced_from TEXT NOT NULL,
+            last_synced_at TEXT NOT NULL,
+            PRIMARY KEY (account_id, source)
+        )
+    """)
+
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS category_rules (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pattern TEXT,
+            field TEXT NOT NULL DEFAULT 'any',
+            mcc TEXT,
+            amount_sign TEXT NOT NULL DEFAULT 'any',
+            priority INTEGER NOT NULL DEFAULT 100,
+            category TEXT NOT NULL,
+            enabled INTEGER NOT NULL DEFAULT 1,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    """)
+
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS category_rules_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    """)
+    connection.execute("INSERT OR IGNORE INTO category_rules_state (id, version) VALUES (1, 0)")
+
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS scheduler_lease (
+            name TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            renewed_at TEXT NOT NULL
+        )
+    """)
+
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS fx_rates (
+            base_currency TEXT NOT NULL,
+            quote_currency TEXT NOT NULL,
+            rate_date TEXT NOT NULL,
+            rate REAL NOT NULL,
+            source TEXT NOT NULL,
+            fetched_at TEXT NOT NULL,
+            PRIMARY KEY (base_currency, quote_currency, rate_date)
+        )
+    """)
+
+    connection.execute("""
+        CREATE INDEX IF NOT EXISTS idx_account_snapshots_date
+        ON account_snapshots(snapshot_date)
+    """)
+
+    connection.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transaction_cache_date
+        ON transaction_cache(tx_date)
+    """)
+
+    connection.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transaction_cache_account
+        ON transaction_cache(account_id)
+    """)
+
+    connection.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transaction_cache_account_source_date
+        ON transaction_cache(account_id, source, tx_date)
+    """)
+
+    connection.execute("""
+        CREATE INDEX IF NOT EXISTS idx_fx_rates_date
+        ON fx_rates(rate_date)
+    """)
+
+    # Covering index for the SQL statistics engine (no table lookups needed).
+    connection.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transaction_cache_stats
+        ON transaction_cache(tx_date, is_internal_transfer, category, amount_eur, amount, currency)
+    """)
+
+# Typed dates of transaction_cache.tx_date: UTC epoch seconds and epoch day (NULL
+# when SQLite cannot parse the text). Plain columns filled by the upsert rather
+# than generated columns: SQLite does not treat an index holding a generated
+# column as covering.
+_TX_EPOCH_SQL = "CAST(strftime('%s', {date}) AS INTEGER)"
+_TX_DAY_SQL = f"({_TX_EPOCH_SQL} / 86400)"
+
+def _add_typed_transaction_dates(connection):
+    """Add and backfill tx_epoch/tx_day, and re-key the daily rollup on the epoch day (WITHOUT ROWID)."""
+    # The rollup triggers would fire for every backfilled row; the rollup is
+    # rebuilt from scratch below, in the same transaction.
+    for (name,) in connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_transaction_rollup_%'"
+    ).fetchall():
+        connection.execute(f"DROP TRIGGER {name}")
+    _ensure_table_columns(connection, 'transaction_cache', (('tx_epoch', 'INTEGER'), ('tx_day', 'INTEGER')))
+    connection.execute(f"""
+        UPDATE transaction_cache
+        SET tx_epoch = {_TX_EPOCH_SQL.format(date='tx_date')}, tx_day = {_TX_DAY_SQL.format(date='tx_date')}
+        WHERE tx_epoch IS NULL
+    """)
+    connection.execute("DROP TABLE IF EXISTS transaction_daily_rollup")
+    _install_transaction_rollup(connection)
+
+def _create_index_step(name, table, columns):
+    def step(connection):
+        connection.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})")
+    step.__name__ = f"create_{name}"
+    return step
+
+def _drop_text_date_indexes(connection):
+    # Superseded by the tx_epoch indexes; account_snapshots is clustered on its date.
+    for name in (
+        'idx_transaction_cache_date',
+        'idx_transaction_cache_account',
+        'idx_transaction_cache_account_source_date',
+        'idx_transaction_cache_stats',
+        'idx_account_snapshots_date',
+    ):
+        connection.execute(f"DROP INDEX IF EXISTS {name}")
+
+def _rebuild_without_rowid(table):
+    """Step that stores `table` clustered on its primary key (WITHOUT ROWID), keeping its indexes."""
+    def step(connection):
+        row = connection.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        if row is None or 'WITHOUT ROWID' in row['sql'].upper():
+            return
+        indexes = [
+            index['sql'] for index in connection.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                (table,),
+            )
+        ]
+        create_sql = re.sub(
+            rf'^CREATE TABLE\s+"?{table}"?', f'CREATE TABLE {table}_migrating', row['sql'], count=1,
+        )
+        connection.execute(f"DROP TABLE IF EXISTS {table}_migrating")
+        connection.execute(f"{create_sql} WITHOUT ROWID")
+        connection.execute(f"INSERT INTO {table}_migrating SELECT * FROM {table}")
+        connection.execute(f"DROP TABLE {table}")
+        connection.execute(f"ALTER TABLE {table}_migrating RENAME TO {table}")
+        for sql in indexes:
+            connection.execute(sql)
+    step.__name__ = f"rebuild_{table}_without_rowid"
+    return step
+
+# Versioned schema migrations, tracked in PRAGMA user_version. Each step is
+# idempotent and runs in its own IMMEDIATE transaction, so other workers keep
+# reading (WAL) and writers wait at most one step; the version is bumped with
+# the last step. Append new versions, never edit shipped ones.
+_DATA_STORE_MIGRATIONS = (
+    (1, 'base schema', (_create_base_schema,)),
+    (2, 'typed dates, WITHOUT ROWID tables and covering indexes', (
+        _add_typed_transaction_dates,
+        # Time-window bounds (first/last transaction) without table lookups.
+        _create_index_step('idx_transaction_cache_epoch', 'transaction_cache', 'tx_epoch, tx_date'),
+        # Incremental sync: one stream from its cutoff on.
+        _create_index_step(
+            'idx_transaction_cache_account_source_epoch', 'transaction_cache', 'account_id, source, tx_epoch',
+        ),
+        # Merchant ranking over a window (covering).
+        _create_index_step(
+            'idx_transaction_cache_merchant_window', 'transaction_cache',
+            'tx_epoch, is_internal_transfer, account_id, merchant, amount_eur, amount, currency',
+        ),
+        _drop_text_date_indexes,
+        _rebuild_without_rowid('account_snapshots'),
+        _rebuild_without_rowid('fx_rates'),
+        _rebuild_without_rowid('transaction_sync_state'),
+    )),
+)
+DATA_STORE_SCHEMA_VERSION = _DATA_STORE_MIGRATIONS[-1][0]
+
+def get_data_store_version(connection):
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate_data_store(connection):
+    """Bring the history store up to DATA_STORE_SCHEMA_VERSION; returns the versions applied here."""
+    applied = []
+    for version, description, steps in _DATA_STORE_MIGRATIONS:
+        if get_data_store_version(connection) >= version:
+            continue
+        started = time.perf_counter()
+        for index, step in enumerate(steps):
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                # Another worker may have finished this version while we waited for the lock.
+                if get_data_store_version(connection) >= version:
+                    connection.rollback()
+                    break
+                step(connection)
+                if index == len(steps) - 1:
+                    connection.execute(f"PRAGMA user_version = {int(version)}")
+                    applied.append(version)
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+        if version in applied:
+            logger.info(
+                f"📦 Migrated history store to schema v{version} ({description}) "
+                f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+    return applied
+
+def explain_query_plan(connection, sql, params=()):
+    """EXPLAIN QUERY PLAN detail lines of one statement."""
+    return [row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+_PLAN_CHECKED_TABLES = (
+    'account_snapshots', 'transaction_cache', 'transaction_daily_rollup', 'fx_rates', 'transaction_sync_state',
+)
+
+def _query_plan_expectations():
+    """(name, sql, params, plan fragments that must appear) for the dashboard's hot statements."""
+    cutoff_iso = (datetime.now(timezone.utc) - timedelta(days=90)).isoformat()
+    cutoff_epoch = epoch_seconds(cutoff_iso)
+    window_source, window_params = rollup_window_source(cutoff_iso)
+    return (
+        (
+            'balance history series', _BALANCE_HISTORY_SERIES_SQL, (cutoff_iso[:10],),
+            ('SEARCH account_snapshots USING PRIMARY KEY (snapshot_date>?)',),
+        ),
+        (
+            'latest snapshot date', _LATEST_SNAPSHOT_DATE_SQL, (),
+            ('SEARCH account_snapshots USING PRIMARY KEY',),
+        ),
+        (
+            'balance breakdown', _BALANCE_BREAKDOWN_SQL, (cutoff_iso[:10],),
+            ('SEARCH account_snapshots USING PRIMARY KEY (snapshot_date=?)',),
+        ),
+        (
+            'data quality counters', _DATA_QUALITY_COUNTERS_SQL.format(source=window_source), window_params,
+            (
+                'SEARCH transaction_daily_rollup USING PRIMARY KEY (day>?)',
+                'SEARCH transaction_cache USING INDEX idx_transaction_cache_',
+                '(tx_epoch>? AND tx_epoch<?)',
+            ),
+        ),
+        (
+            'data quality bounds', _DATA_QUALITY_BOUNDS_SQL, (cutoff_epoch, cutoff_epoch),
+            ('SEARCH transaction_cache USING COVERING INDEX idx_transaction_cache_epoch (tx_epoch>?)',),
+        ),
+        (
+            'merchant ranking', _merchant_window_sql(['is_internal_transfer = 0']), (cutoff_epoch, 10),
+            ('SEARCH transaction_cache USING COVERING INDEX idx_transaction_cache_merchant_window (tx_epoch>?)',),
+        ),
+        (
+            'cached stream', _CACHED_STREAM_SQL, ('1', 'payment', cutoff_epoch),
+            (
+                'SEARCH transaction_cache USING INDEX idx_transaction_cache_account_source_epoch '
+                '(account_id=? AND source=? AND tx_epoch>?)',
+            ),
+        ),
+    )
+
+def _schema_only_copy(connection):
+    """In-memory database with the store's tables, indexes and triggers but no rows or statistics."""
+    scratch = sqlite3.connect(':memory:')
+    for row in connection.execute(
+        """
+        SELECT sql FROM sqlite_master
+        WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%'
+        ORDER BY CASE type WHEN 'table' THEN 0 WHEN 'index' THEN 1 ELSE 2 END
+        """
+    ):
+        scratch.execute(row[0])
+    return scratch
+
+def check_data_store_query_plans(connection):
+    """
+    Compare the query plans of the dashboard's hot statements with the indexes
+    they were written for. Returns [(name, problem, plan lines)] for regressions.
+    Plans come from a schema-only copy of the store: on a store with a few rows,
+    its statistics rightly favour table scans, which is not a regression.
+    """
+    problems = []
+    scratch = _schema_only_copy(connection)
+    try:
+        expectations = _query_plan_expectations()
+        plans = [explain_query_plan(scratch, sql, params) for _, sql, params, _ in expectations]
+    finally:
+        scratch.close()
+    for (name, _, _, fragments), plan in zip(expectations, plans):
+        text = '\n'.join(plan)
+        missing = [fragment for fragment in fragments if fragment not in text]
+        scans = [
+            line for line in plan
+            if any(line == f"SCAN {table}" or line.startswith(f"SCAN {table} ") for table in _PLAN_CHECKED_TABLES)
+        ]
+        if missing or scans:
+            problem = ', '.join([*(f"expected {fragment!r}" for fragment in missing), *(repr(line) for line in scans)])
+            problems.append((name, problem, plan))
+    return problems
+
 def init_data_store():
     if not DATA_DB_ENABLED:
         logger.info("📦 Historical data store disabled (DATA_DB_ENABLED=false)")
@@ -2287,89 +3291,266 @@ def init_data_store():
         return
 
     try:
-        with connection:
-            connection.execute("PRAGMA journal_mode=WAL")
-            connection.execute("PRAGMA synchronous=NORMAL")
+        migrate_data_store(connection)
+        if install_transaction_rollup(connection):
+            logger.info("📦 Built transaction_daily_rollup from transaction_cache")
+        for name, problem, plan in check_data_store_query_plans(connection):
+            logger.warning(f"⚠️ Query plan regression in {name}: {problem} (plan: {' | '.join(plan)})")
+        logger.info(f"📦 Historical data store initialized at {DATA_DB_PATH} (schema v{get_data_store_version(connection)})")
+    except Exception as exc:
+        logger.warning(f"⚠️ Failed to initialize historical data store: {exc}")
+    finally:
+        release_data_db_connection(connection)
 
-            connection.execute("""
-                CREATE TABLE IF NOT EXISTS account_snapshots (
-                    snapshot_date TEXT NOT NULL,
-                    account_id TEXT NOT NULL,
-                    description TEXT,
-                    account_type TEXT,
-                    account_class TEXT,
-                    status TEXT,
-                    balance_value REAL NOT NULL,
-                    balance_currency TEXT NOT NULL,
-                    balance_eur_value REAL,
-                    fx_rate_to_eur REAL,
-                    captured_at TEXT NOT NULL,
-                    PRIMARY KEY (snapshot_date, account_id)
-                )
-            """)
+class SQLiteResponseCache(BaseCache):
+    """
+    Response cache in a local SQLite file, shared by all gunicorn workers.
+    TTL is enforced on read; expired rows and rows beyond the size cap are pruned
+    periodically (oldest write first). Values larger than max_entry_bytes are not
+    stored (set returns False). Hit/miss counters are per process.
+    The file is opened (and created) on first use, not at import.
+    Any storage error is logged and treated as a cache miss.
+    """
+
+    _PRUNE_EVERY_SETS = 50
 
+    def __init__(
+        self, path, default_timeout=300, max_bytes=128 * 1024 * 1024, max_entries=2000,
+        max_entry_bytes=4 * 1024 * 1024,
+    ):
+        super().__init__(default_timeout=default_timeout)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_entry_bytes = max_entry_bytes
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._sets_since_prune = 0
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        self.counters = {'hits': 0, 'misses': 0, 'sets': 0, 'evictions': 0, 'errors': 0, 'oversized': 0}
+
+    def _create_schema(self, connection):
+        with connection:
             connection.execute("""
-                CREATE TABLE IF NOT EXISTS transaction_cache (
-                    tx_key TEXT PRIMARY KEY,
-                    tx_id TEXT,
-                    account_id TEXT NOT NULL,
-                    account_name TEXT,
-                    tx_date TEXT NOT NULL,
-                    amount REAL NOT NULL,
-                    currency TEXT,
-                    amount_eur REAL,
-                    description TEXT,
-                    counterparty TEXT,
-                    merchant TEXT,
-                    category TEXT,
-                    tx_type TEXT,
-                    is_internal_transfer INTEGER NOT NULL DEFAULT 0,
-                    captured_at TEXT NOT NULL
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    expires_at REAL NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    updated_at REAL NOT NULL
                 )
             """)
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_response_cache_updated ON response_cache(updated_at)"
+            )
 
-            connection.execute("""
-                CREATE TABLE IF NOT EXISTS fx_rates (
-                    base_currency TEXT NOT NULL,
-                    quote_currency TEXT NOT NULL,
-                    rate_date TEXT NOT NULL,
-                    rate REAL NOT NULL,
-                    source TEXT NOT NULL,
-                    fetched_at TEXT NOT NULL,
-                    PRIMARY KEY (base_currency, quote_currency, rate_date)
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5)
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                with self._schema_lock:
+                    if not self._schema_ready:
+                        self._create_schema(connection)
+                        self._schema_ready = True
+            except Exception:
+                connection.close()
+                raise
+            self._local.connection = connection
+        return connection
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self.counters[name] += amount
+
+    def _expires_at(self, timeout):
+        timeout = self._normalize_timeout(timeout)
+        return 0.0 if timeout == 0 else time.time() + timeout
+
+    def get(self, key):
+        try:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM response_cache WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+        except Exception as exc:
+            self._count('errors')
+            logger.warning(f"⚠️ Response cache read failed: {exc}")
+            return None
+        if row is None or (row[1] and row[1] <= time.time()):
+            self._count('misses')
+            return None
+        try:
+            value = pickle.loads(row[0])
+        except Exception:
+            self._count('misses')
+            return None
+        self._count('hits')
+        return value
+
+    def has(self, key):
+        try:
+            row = self._connection().execute(
+                "SELECT expires_at FROM response_cache WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+        except Exception:
+            return False
+        return bool(row) and not (row[0] and row[0] <= time.time())
+
+    def set(self, key, value, timeout=None):
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            if len(payload) > self.max_entry_bytes:
+                self._count('oversized')
+                return False
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    """
+                    INSERT INTO response_cache (cache_key, value, expires_at, size_bytes, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(cache_key) DO UPDATE SET
+                        value = excluded.value,
+                        expires_at = excluded.expires_at,
+                        size_bytes = excluded.size_bytes,
+                        updated_at = excluded.updated_at
+                    """,
+                    (key, sqlite3.Binary(payload), self._expires_at(timeout), len(payload), time.time()),
                 )
-            """)
+        except Exception as exc:
+            self._count('errors')
+            logger.warning(f"⚠️ Response cache write failed: {exc}")
+            return False
+        self._count('sets')
+        with self._stats_lock:
+            self._sets_since_prune += 1
+            should_prune = self._sets_since_prune >= self._PRUNE_EVERY_SETS
+            if should_prune:
+                self._sets_since_prune = 0
+        if should_prune or len(payload) > self.max_bytes // 4:
+            self.prune()
+        return True
 
-            connection.execute("""
-                CREATE INDEX IF NOT EXISTS idx_account_snapshots_date
-                ON account_snapshots(snapshot_date)
-            """)
+    def add(self, key, value, timeout=None):
+        if self.has(key):
+            return False
+        return self.set(key, value, timeout=timeout)
 
-            connection.execute("""
-                CREATE INDEX IF NOT EXISTS idx_transaction_cache_date
-                ON transaction_cache(tx_date)
-            """)
+    def delete(self, key):
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute("DELETE FROM response_cache WHERE cache_key = ?", (key,))
+            return True
+        except Exception as exc:
+            self._count('errors')
+            logger.warning(f"⚠️ Response cache delete failed: {exc}")
+            return False
 
-            connection.execute("""
-                CREATE INDEX IF NOT EXISTS idx_transaction_cache_account
-                ON transaction_cache(account_id)
-            """)
+    def clear(self):
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute("DELETE FROM response_cache")
+            return True
+        except Exception as exc:
+            self._count('errors')
+            logger.warning(f"⚠️ Response cache clear failed: {exc}")
+            return False
 
-            connection.execute("""
-                CREATE INDEX IF NOT EXISTS idx_fx_rates_date
-                ON fx_rates(rate_date)
-            """)
+    def prune(self):
+        """Drop expired rows, then the oldest rows until size and entry caps hold."""
+        try:
+            connection = self._connection()
+            with connection:
+                evicted = connection.execute(
+                    "DELETE FROM response_cache WHERE expires_at > 0 AND expires_at <= ?",
+                    (time.time(),),
+                ).rowcount
+                total_entries, total_bytes = connection.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM response_cache"
+                ).fetchone()
+                if total_entries > self.max_entries or total_bytes > self.max_bytes:
+                    rows = connection.execute(
+                        "SELECT cache_key, size_bytes FROM response_cache ORDER BY updated_at ASC"
+                    ).fetchall()
+                    doomed = []
+                    for cache_key, size_bytes in rows:
+                        if total_entries <= self.max_entries and total_bytes <= self.max_bytes:
+                            break
+                        doomed.append((cache_key,))
+                        total_entries -= 1
+                        total_bytes -= size_bytes
+                    connection.executemany("DELETE FROM response_cache WHERE cache_key = ?", doomed)
+                    evicted += len(doomed)
+            if evicted:
+                self._count('evictions', evicted)
+        except Exception as exc:
+            self._count('errors')
+            logger.warning(f"⚠️ Response cache prune failed: {exc}")
+
+    def stats(self):
+        """Counters for this process plus entry/byte totals of the shared store."""
+        with self._stats_lock:
+            result = dict(self.counters)
+        lookups = result['hits'] + result['misses']
+        result['hit_ratio'] = (result['hits'] / lookups) if lookups else None
+        result['backend'] = 'sqlite'
+        result['path'] = self.path
+        result['max_bytes'] = self.max_bytes
+        result['max_entries'] = self.max_entries
+        result['max_entry_bytes'] = self.max_entry_bytes
+        if getattr(self._local, 'connection', None) is None and not os.path.exists(self.path):
+            # Nothing cached yet; don't create the file just to report that.
+            result['entries'] = 0
+            result['size_bytes'] = 0
+            return result
+        try:
+            entries, size_bytes = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM response_cache"
+            ).fetchone()
+            result['entries'] = int(entries)
+            result['size_bytes'] = int(size_bytes)
+        except Exception:
+            result['entries'] = None
+            result['size_bytes'] = None
+        return result
+
+def create_response_cache():
+    """Pick the response cache backend (shared SQLite by default, per-process fallback)."""
+    if RESPONSE_CACHE_BACKEND == 'sqlite':
+        cache_path = os.getenv(
+            'RESPONSE_CACHE_PATH',
+            os.path.join(os.path.dirname(DATA_DB_PATH) or '.', 'response_cache.db'),
+        )
+        logger.info(f"🗄️ Shared response cache at {cache_path}")
+        return SQLiteResponseCache(
+            cache_path,
+            default_timeout=CACHE_TTL_SECONDS,
+            max_bytes=RESPONSE_CACHE_MAX_MB * 1024 * 1024,
+            max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+            max_entry_bytes=RESPONSE_CACHE_MAX_ENTRY_KB * 1024,
+        )
+    if RESPONSE_CACHE_BACKEND != 'simple':
+        logger.warning(f"⚠️ Unknown RESPONSE_CACHE_BACKEND '{RESPONSE_CACHE_BACKEND}', using per-process cache")
+    return Cache(app, config={
+        'CACHE_TYPE': 'SimpleCache',
+        'CACHE_DEFAULT_TIMEOUT': CACHE_TTL_SECONDS
+    })
 
-        logger.info(f"📦 Historical data store initialized at {DATA_DB_PATH}")
-    except Exception as exc:
-        logger.warning(f"⚠️ Failed to initialize historical data store: {exc}")
-    finally:
-        connection.close()
+def get_response_cache_stats():
+    if isinstance(cache, SQLiteResponseCache):
+        return cache.stats()
+    return {'backend': 'simple'}
 
-cache = Cache(app, config={
-    'CACHE_TYPE': 'SimpleCache',
-    'CACHE_DEFAULT_TIMEOUT': CACHE_TTL_SECONDS
-})
+cache = create_response_cache()
 
 # Session configuration - CRITICAL for security
 app.config['SECRET_KEY'] = get_config('FLASK_SECRET_KEY', secrets.token_hex(32), 'flask_secret_key')
@@ -2400,9 +3581,6 @@ CORS(app,
      allow_headers=['Content-Type', 'Authorization'],
      expose_headers=['Content-Type'])
 
-# Initialize optional local data store (non-fatal on failure).
-init_data_store()
-
 # ============================================
 # SECURITY: SESSION-BASED AUTHENTICATION
 # ============================================
@@ -2562,6 +3740,196 @@ def make_cache_key(prefix):
     )
     return f"{prefix}:{user}:{args}"
 
+def parse_account_filter():
+    """Return a sorted tuple of requested account ids, or None for all accounts."""
+    account_id = request.args.get('account_id')
+    account_ids_param = request.args.get('account_ids')
+    if account_id:
+        return (str(account_id).strip(),)
+    if account_ids_param:
+        parts = {part.strip() for part in account_ids_param.split(',') if part.strip()}
+        if parts:
+            return tuple(sorted(parts))
+    return None
+
+def make_result_set_key(prefix, days, account_ids, exclude_internal, user=None):
+    """
+    Cache key for a materialized result set.
+    Unlike make_cache_key this ignores pagination/sort, so all pages share one build.
+    Pass `user` when there is no request context (background pre-warming).
+    """
+    if user is None:
+        user = session.get('username', 'anon')
+    accounts_part = ','.join(account_ids) if account_ids else '*'
+    return f"{prefix}:{user}:days={days}&accounts={accounts_part}&exclude_internal={int(bool(exclude_internal))}"
+
+_REVALIDATING_KEYS = set()
+_REVALIDATING_LOCK = threading.Lock()
+
+def _store_revalidated(cache_key, value):
+    if CACHE_ENABLED:
+        cache.set(
+            cache_key,
+            {'swr_value': value, 'swr_created_at': time.time()},
+            timeout=CACHE_TTL_SECONDS + CACHE_MAX_STALE_SECONDS,
+        )
+
+def _revalidate_in_background(cache_key, build_fn):
+    """Refresh one cache entry in a daemon thread; at most one refresh per key per process."""
+    with _REVALIDATING_LOCK:
+        if cache_key in _REVALIDATING_KEYS:
+            return False
+        _REVALIDATING_KEYS.add(cache_key)
+
+    def _run():
+        try:
+            _store_revalidated(cache_key, _SINGLE_FLIGHT.do(cache_key, build_fn))
+        except Exception as exc:
+            logger.warning(f"⚠️ Background revalidation failed for {cache_key}: {exc}")
+        finally:
+            with _REVALIDATING_LOCK:
+                _REVALIDATING_KEYS.discard(cache_key)
+
+    threading.Thread(target=_run, name='cache-revalidate', daemon=True).start()
+    return True
+
+def get_with_revalidate(cache_key, build_fn):
+    """
+    Stale-while-revalidate cache read.
+
+    Fresh entries are returned as-is; entries past CACHE_TTL_SECONDS but within
+    CACHE_MAX_STALE_SECONDS are returned immediately while one background refresh
+    runs; anything older (or cache=false) is rebuilt on the request path.
+    build_fn must not depend on the request context.
+    Returns (value, data_age_seconds, is_stale).
+    """
+    if cache_allowed():
+        entry = cache.get(cache_key)
+        if isinstance(entry, dict) and 'swr_created_at' in entry:
+            age_seconds = max(time.time() - entry['swr_created_at'], 0.0)
+            if age_seconds <= CACHE_TTL_SECONDS:
+                return entry['swr_value'], age_seconds, False
+            if age_seconds <= CACHE_TTL_SECONDS + CACHE_MAX_STALE_SECONDS:
+                _revalidate_in_background(cache_key, build_fn)
+                return entry['swr_value'], age_seconds, True
+
+    value = _SINGLE_FLIGHT.do(cache_key, build_fn)
+    _store_revalidated(cache_key, value)
+    return value, 0.0, False
+
+def stream_json_response(envelope, rows_key, rows, chunk_rows=64):
+    """
+    Stream `envelope` with `rows` under rows_key as one JSON object.
+
+    The rows array comes first and every chunk_rows rows are encoded and yielded
+    as they go, so a big page is never materialized as one Python structure or
+    one string. The remaining envelope keys follow the array; parsed, the body is
+    identical to jsonify({**envelope, rows_key: rows}).
+    """
+    def dumps(value):
+        return app.json.dumps(value, separators=(',', ':'))
+
+    tail = dumps({key: value for key, value in envelope.items() if key != rows_key})
+
+    def generate():
+        yield f'{{{dumps(rows_key)}:['
+        for start in range(0, len(rows), chunk_rows):
+            chunk = ','.join(dumps(row) for row in rows[start:start + chunk_rows])
+            yield chunk if start == 0 else ',' + chunk
+        yield ']' + (',' + tail[1:] if tail != '{}' else '}')
+
+    return Response(generate(), mimetype=app.json.mimetype)
+
+def negotiate_content_encoding():
+    """Pick 'br' or 'gzip' from the request's Accept-Encoding (None: send identity)."""
+    accepted = set()
+    for part in (request.headers.get('Accept-Encoding') or '').split(','):
+        coding, _, params = part.partition(';')
+        quality = 1.0
+        if params.strip().lower().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if coding.strip() and quality > 0:
+            accepted.add(coding.strip().lower())
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+def compress_chunks(chunks, encoding):
+    """Incrementally compress an iterable of str/bytes chunks with 'br' or 'gzip'."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=5)
+        compress, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+        compress, finish = compressor.compress, compressor.flush
+    for chunk in chunks:
+        data = compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield finish()
+
+def encoded_response(chunks, mimetype, streamed=False):
+    """
+    Response for str/bytes chunks, compressed when the client accepts it.
+    streamed=False joins the body so it gets a Content-Length.
+    """
+    encoding = negotiate_content_encoding()
+    body = compress_chunks(chunks, encoding) if encoding else (
+        chunk.encode('utf-8') if isinstance(chunk, str) else chunk for chunk in chunks
+    )
+    response = Response(body if streamed else b''.join(body), mimetype=mimetype)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+def response_etag(*parts):
+    """
+    Strong ETag for this request's JSON response built from `parts`.
+
+    parts identify the payload (a cached content digest or the body itself); the
+    path, user, query (minus cache/snapshot_id) and negotiated encoding are mixed
+    in so every representation gets its own tag.
+    """
+    hasher = hashlib.sha256()
+    for part in (
+        request.path,
+        session.get('username', 'anon'),
+        sorted((k, v) for k, v in request.args.items(multi=True) if k not in ('cache', 'snapshot_id')),
+        negotiate_content_encoding() or 'identity',
+        *parts,
+    ):
+        hasher.update(part if isinstance(part, bytes) else repr(part).encode('utf-8'))
+        hasher.update(b'\0')
+    return hasher.hexdigest()[:32]
+
+def not_modified_response(etag):
+    """304 for an If-None-Match hit on `etag` (nothing gets serialized), else None."""
+    if not request.if_none_match.contains(etag):
+        return None
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+def payload_digest(value):
+    """Content digest of a JSON-serializable cached payload, computed when it is built."""
+    return hashlib.sha256(app.json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()
+
+def transaction_set_digest(transactions, truncated_accounts, amount_eur_missing_count):
+    """Content digest of a transaction result set; equal rows give equal digests across snapshots."""
+    hasher = hashlib.sha256()
+    for tx in transactions:
+        hasher.update(repr(tuple(tx.values())).encode('utf-8'))
+    hasher.update(repr((truncated_accounts, amount_eur_missing_count)).encode('utf-8'))
+    return hasher.hexdigest()
+
 def parse_pagination():
     """Parse pagination parameters from query string."""
     def _safe_int_arg(name, default):
@@ -3093,7 +4461,7 @@ def get_cached_fx_rate(base_currency, quote_currency='EUR', rate_date=None):
         logger.warning(f"⚠️ Failed reading cached FX rate {base_currency}->{quote_currency}: {exc}")
         return None
     finally:
-        connection.close()
+        release_data_db_connection(connection)
 
 def cache_fx_rate(base_currency, quote_currency, rate, rate_date=None, source='unknown'):
     if not DATA_DB_ENABLED:
@@ -3126,7 +4494,24 @@ def cache_fx_rate(base_currency, quote_currency, rate, rate_date=None, source='u
     except Exception as exc:
         logger.warning(f"⚠️ Failed caching FX rate {base_currency}->{quote_currency}: {exc}")
     finally:
-        connection.close()
+        release_data_db_connection(connection)
+
+def _fx_runtime_rate(key, now_epoch):
+    """
+    (hit, rate) from _FX_RUNTIME_CACHE. A None rate is a failed lookup, kept for
+    FX_NEGATIVE_CACHE_SECONDS instead of FX_CACHE_HOURS.
+    """
+    entry = _FX_RUNTIME_CACHE.get(key)
+    if entry:
+        rate, cached_at_epoch = entry
+        max_age = FX_CACHE_HOURS * 3600 if rate is not None else FX_NEGATIVE_CACHE_SECONDS
+        if (now_epoch - cached_at_epoch) <= max_age:
+            return True, rate
+    return False, None
+
+def _remember_failed_fx_lookup(key, now_epoch):
+    if FX_NEGATIVE_CACHE_SECONDS:
+        _FX_RUNTIME_CACHE[key] = (None, now_epoch)
 
 def fetch_fx_rate(base_currency, quote_currency='EUR', rate_date=None):
     if base_currency.upper() == quote_currency.upper():
@@ -3139,11 +4524,9 @@ def fetch_fx_rate(base_currency, quote_currency='EUR', rate_date=None):
     date_key = rate_date or datetime.now(timezone.utc).date().isoformat()
     runtime_key = (base, quote, date_key)
 
-    runtime_entry = _FX_RUNTIME_CACHE.get(runtime_key)
-    if runtime_entry:
-        cached_rate, cached_at_epoch = runtime_entry
-        if (time.time() - cached_at_epoch) <= (FX_CACHE_HOURS * 3600):
-            return cached_rate
+    hit, cached_rate = _fx_runtime_rate(runtime_key, time.time())
+    if hit:
+        return cached_rate
 
     # Try cache first.
     cached = get_cached_fx_rate(base, quote, rate_date=date_key)
@@ -3165,19 +4548,204 @@ def fetch_fx_rate(base_currency, quote_currency='EUR', rate_date=None):
             rates = payload.get('rates', {})
             rate = rates.get(quote)
             if rate is None:
+                _remember_failed_fx_lookup(runtime_key, time.time())
                 return None
             cache_fx_rate(base, quote, float(rate), rate_date=date_key, source='frankfurter')
             _FX_RUNTIME_CACHE[runtime_key] = (float(rate), time.time())
             return float(rate)
     except Exception as exc:
         logger.warning(f"⚠️ FX lookup failed for {base}->{quote}: {exc}")
+        _remember_failed_fx_lookup(runtime_key, time.time())
 
     return None
 
-def convert_amount_to_eur(amount, currency, rate_date=None):
-    if amount is None:
-        return None, None, False
-    if not currency:
+def get_cached_fx_rates(pairs, quote_currency='EUR'):
+    """Bulk get_cached_fx_rate: one query for many (base_currency, rate_date) pairs."""
+    if not DATA_DB_ENABLED or not pairs:
+        return {}
+    connection = get_data_db_connection()
+    if connection is None:
+        return {}
+    bases = sorted({base for base, _ in pairs})
+    dates = [rate_date for _, rate_date in pairs]
+    placeholders = ','.join('?' for _ in bases)
+    found = {}
+    try:
+        rows = connection.execute(
+            f"""
+            SELECT base_currency, rate_date, rate, fetched_at
+            FROM fx_rates
+            WHERE quote_currency = ?
+              AND base_currency IN ({placeholders})
+              AND rate_date BETWEEN ? AND ?
+            """,
+            (quote_currency.upper(), *bases, min(dates), max(dates)),
+        ).fetchall()
+        now = datetime.now(timezone.utc)
+        for row in rows:
+            pair = (row['base_currency'], row['rate_date'])
+            if pair not in pairs:
+                continue
+            fetched_at = parse_bunq_datetime(row['fetched_at'], context='fx_rates.fetched_at')
+            if fetched_at is not None and (now - fetched_at).total_seconds() > FX_CACHE_HOURS * 3600:
+                continue
+            found[pair] = float(row['rate'])
+    except Exception as exc:
+        logger.warning(f"⚠️ Failed reading cached FX rates ->{quote_currency}: {exc}")
+    finally:
+        release_data_db_connection(connection)
+    return found
+
+def cache_fx_rates(rates, quote_currency, source='unknown'):
+    """Bulk cache_fx_rate for {(base_currency, rate_date): rate}."""
+    if not DATA_DB_ENABLED or not rates:
+        return
+    connection = get_data_db_connection()
+    if connection is None:
+        return
+    fetched_at = datetime.now(timezone.utc).isoformat()
+    try:
+        with connection:
+            connection.executemany(
+                """
+                INSERT INTO fx_rates (
+                    base_currency, quote_currency, rate_date, rate, source, fetched_at
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(base_currency, quote_currency, rate_date) DO UPDATE SET
+                    rate = excluded.rate,
+                    source = excluded.source,
+                    fetched_at = excluded.fetched_at
+                """,
+                [
+                    (base, quote_currency.upper(), rate_date, float(rate), source, fetched_at)
+                    for (base, rate_date), rate in rates.items()
+                ],
+            )
+    except Exception as exc:
+        logger.warning(f"⚠️ Failed caching FX rates ->{quote_currency}: {exc}")
+    finally:
+        release_data_db_connection(connection)
+
+# Longest date range requested from the FX time-series endpoint in one call.
+_FX_TIMESERIES_MAX_DAYS = 400
+
+def fetch_fx_timeseries(base_currency, quote_currency, start_date, end_date):
+    """
+    Return {rate_date: rate} for every publication day in [start_date, end_date].
+    Ranges longer than _FX_TIMESERIES_MAX_DAYS are split into consecutive requests.
+    """
+    series = {}
+    if FX_RATE_SOURCE != 'frankfurter':
+        return series
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(chunk_start + timedelta(days=_FX_TIMESERIES_MAX_DAYS - 1), end_date)
+        response = requests.get(
+            f"https://api.frankfurter.app/{chunk_start.isoformat()}..{chunk_end.isoformat()}",
+            params={'from': base_currency, 'to': quote_currency},
+            timeout=FX_REQUEST_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+        for rate_date, day_rates in (response.json().get('rates') or {}).items():
+            rate = (day_rates or {}).get(quote_currency)
+            if rate is not None:
+                series[rate_date] = float(rate)
+        chunk_start = chunk_end + timedelta(days=1)
+    return series
+
+def resolve_fx_rates(pairs, quote_currency='EUR'):
+    """
+    Resolve many (base_currency, rate_date) pairs at once.
+
+    Lookup order matches fetch_fx_rate (runtime cache, fx_rates table, network),
+    but each tier is hit once per batch: one SQLite query for all misses and one
+    time-series request per currency. Pairs the network could not resolve are
+    not asked for again within FX_NEGATIVE_CACHE_SECONDS. Days without a publication (weekends,
+    holidays) take the latest earlier rate, like the single-date endpoint does.
+    Returns {(base_currency, rate_date): rate or None}.
+    """
+    quote = quote_currency.upper()
+    resolved = {}
+    missing = set()
+    now_epoch = time.time()
+    for base, rate_date in {(str(base).upper(), rate_date) for base, rate_date in pairs}:
+        if base == quote:
+            resolved[(base, rate_date)] = 1.0
+            continue
+        if not FX_ENABLED:
+            resolved[(base, rate_date)] = None
+            continue
+        hit, rate = _fx_runtime_rate((base, quote, rate_date), now_epoch)
+        if hit:
+            resolved[(base, rate_date)] = rate
+        else:
+            missing.add((base, rate_date))
+
+    if missing:
+        for pair, rate in get_cached_fx_rates(missing, quote).items():
+            resolved[pair] = rate
+            _FX_RUNTIME_CACHE[(pair[0], quote, pair[1])] = (rate, now_epoch)
+        missing.difference_update(resolved)
+
+    dates_by_base = defaultdict(set)
+    for base, rate_date in missing:
+        dates_by_base[base].add(rate_date)
+    for base, rate_dates in dates_by_base.items():
+        fetched = {}
+        try:
+            ordered_dates = sorted(rate_dates)
+            # Start a week early so a range opening on a weekend still has a prior rate.
+            start = datetime.fromisoformat(ordered_dates[0]).date() - timedelta(days=7)
+            end = datetime.fromisoformat(ordered_dates[-1]).date()
+            series = fetch_fx_timeseries(base, quote, start, end)
+            series_dates = sorted(series)
+            for rate_date in ordered_dates:
+                position = bisect.bisect_right(series_dates, rate_date) - 1
+                if position >= 0:
+                    fetched[(base, rate_date)] = series[series_dates[position]]
+        except Exception as exc:
+            logger.warning(f"⚠️ FX time-series lookup failed for {base}->{quote}: {exc}")
+        cache_fx_rates(fetched, quote, source=FX_RATE_SOURCE)
+        for rate_date in rate_dates:
+            rate = fetched.get((base, rate_date))
+            resolved[(base, rate_date)] = rate
+            if rate is not None:
+                _FX_RUNTIME_CACHE[(base, quote, rate_date)] = (rate, now_epoch)
+            else:
+                _remember_failed_fx_lookup((base, quote, rate_date), now_epoch)
+    return resolved
+
+def apply_fx_conversions(transactions):
+    """
+    Fill amount_eur / fx_rate_to_eur / fx_converted for every transaction that has
+    no EUR amount yet, resolving all distinct (currency, day) pairs in one batch.
+    Returns the number of transactions converted.
+    """
+    pending = [
+        tx for tx in transactions
+        if tx.get('amount_eur') is None and tx.get('amount') is not None and tx.get('date')
+    ]
+    if not pending:
+        return 0
+    rates = resolve_fx_rates({
+        (str(tx.get('currency') or 'EUR').upper(), str(tx['date'])[:10])
+        for tx in pending
+    })
+    converted = 0
+    for tx in pending:
+        rate = rates.get((str(tx.get('currency') or 'EUR').upper(), str(tx['date'])[:10]))
+        if rate is None:
+            continue
+        tx['amount_eur'] = float(tx['amount']) * rate
+        tx['fx_rate_to_eur'] = rate
+        tx['fx_converted'] = True
+        converted += 1
+    return converted
+
+def convert_amount_to_eur(amount, currency, rate_date=None):
+    if amount is None:
+        return None, None, False
+    if not currency:
         return float(amount), 1.0, True
 
     currency_upper = str(currency).upper()
@@ -3190,136 +4758,1207 @@ def convert_amount_to_eur(amount, currency, rate_date=None):
         return None, None, False
     return numeric_amount * rate, rate, True
 
+_ACCOUNT_SNAPSHOT_UPSERT_SQL = """
+    INSERT INTO account_snapshots (
+        snapshot_date, account_id, description, account_type, account_class, status,
+        balance_value, balance_currency, balance_eur_value, fx_rate_to_eur, captured_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(snapshot_date, account_id) DO UPDATE SET
+        description = excluded.description,
+        account_type = excluded.account_type,
+        account_class = excluded.account_class,
+        status = excluded.status,
+        balance_value = excluded.balance_value,
+        balance_currency = excluded.balance_currency,
+        balance_eur_value = excluded.balance_eur_value,
+        fx_rate_to_eur = excluded.fx_rate_to_eur,
+        captured_at = excluded.captured_at
+"""
+
+def _write_account_snapshots(connection, rows):
+    connection.executemany(_ACCOUNT_SNAPSHOT_UPSERT_SQL, rows)
+
+_ACCOUNT_SNAPSHOT_WRITER = WriteBehindQueue('account_snapshots', _write_account_snapshots)
+# account_id -> (snapshot_date, snapshot values, monotonic time) of the last queued row.
+_ACCOUNT_SNAPSHOT_LAST_QUEUED = {}
+
 def persist_account_snapshots(accounts_data):
+    """
+    Queue today's balance snapshot per account for the write-behind writer.
+
+    The accounts refresh runs every minute; a snapshot identical to the one queued
+    for the same day less than ACCOUNT_SNAPSHOT_MIN_INTERVAL_SECONDS ago is skipped.
+    """
     if not DATA_DB_ENABLED or not accounts_data:
         return
 
-    snapshot_date = datetime.now(timezone.utc).date().isoformat()
+    now = datetime.now(timezone.utc)
+    snapshot_date = now.date().isoformat()
+    captured_at = now.isoformat()
+    queued_at = time.monotonic()
+    items = []
+    for account in accounts_data:
+        account_id = str(account.get('id'))
+        balance = account.get('balance', {})
+        balance_eur = account.get('balance_eur', {})
+        values = (
+            account.get('description'),
+            account.get('account_type'),
+            account.get('account_class'),
+            account.get('status'),
+            safe_float(balance.get('value'), default=0.0, context=f"account {account_id} snapshot balance"),
+            balance.get('currency') or 'EUR',
+            (
+                None if balance_eur.get('value') is None else
+                safe_float(balance_eur.get('value'), default=0.0, context=f"account {account_id} snapshot balance_eur")
+            ),
+            account.get('fx_rate_to_eur'),
+        )
+        previous = _ACCOUNT_SNAPSHOT_LAST_QUEUED.get(account_id)
+        if (
+            previous is not None
+            and previous[0] == snapshot_date
+            and previous[1] == values
+            and queued_at - previous[2] < ACCOUNT_SNAPSHOT_MIN_INTERVAL_SECONDS
+        ):
+            continue
+        _ACCOUNT_SNAPSHOT_LAST_QUEUED[account_id] = (snapshot_date, values, queued_at)
+        items.append(((snapshot_date, account_id), (snapshot_date, account_id, *values, captured_at)))
+    if not items:
+        return
+    try:
+        _ACCOUNT_SNAPSHOT_WRITER.submit_many(items)
+    except Exception as exc:
+        # The snapshot is a side effect of /api/accounts; never fail the response for it.
+        logger.warning(f"⚠️ Failed queueing account snapshots: {exc}")
+        for (_, account_id), _ in items:
+            _ACCOUNT_SNAPSHOT_LAST_QUEUED.pop(account_id, None)
+
+# Integer transaction_cache keys: (payment id, account id, source) packed into 63 bits.
+_TX_KEY_SOURCE_CODES = {None: 0, 'payment': 0, 'card_payment': 1}
+_TX_KEY_ACCOUNT_BITS = 25
+_TX_KEY_PAYMENT_BITS = 36
+_TX_KEY_PAYLOAD_FIELDS = ('id', 'account_id', 'source', 'date', 'amount', 'description')
+
+def build_transaction_cache_key(transaction):
+    """
+    Integer primary key of a transaction_cache row.
+
+    Bunq payments pack (payment id, account id, source) into a positive 63-bit
+    integer. Rows without numeric ids (or beyond the bit budget) fall back to a
+    negative 62-bit hash of their identifying fields, so the ranges never collide.
+    """
+    source_code = _TX_KEY_SOURCE_CODES.get(transaction.get('source'), -1)
+    try:
+        payment_id = int(transaction.get('id'))
+        account_id = int(transaction.get('account_id'))
+    except (TypeError, ValueError):
+        payment_id = account_id = -1
+    if (
+        source_code >= 0
+        and 0 <= payment_id < 1 << _TX_KEY_PAYMENT_BITS
+        and 0 <= account_id < 1 << _TX_KEY_ACCOUNT_BITS
+    ):
+        return (payment_id << (_TX_KEY_ACCOUNT_BITS + 2)) | (account_id << 2) | source_code
+    payload = "|".join(str(transaction.get(field)) for field in _TX_KEY_PAYLOAD_FIELDS)
+    digest = hashlib.blake2b(payload.encode('utf-8'), digest_size=8).digest()
+    return -(int.from_bytes(digest, 'big') >> 2) - 1
+
+_TRANSACTION_CACHE_UPSERT_SQL = """
+    INSERT INTO transaction_cache (
+        tx_key, tx_id, account_id, account_name, tx_date, amount, currency, amount_eur,
+        description, counterparty, merchant, category, tx_type, is_internal_transfer,
+        source, fx_rate_to_eur, counterparty_account_name, counterparty_account_id, counterparty_iban,
+        merchant_category_code, content_hash, captured_at, tx_epoch, tx_day
+    ) VALUES (
+        ?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11, ?12, ?13, ?14, ?15, ?16, ?17, ?18, ?19, ?20, ?21, ?22,
+        {epoch}, {day}
+    )
+    ON CONFLICT(tx_key) DO UPDATE SET
+        account_name = excluded.account_name,
+        amount = excluded.amount,
+        currency = excluded.currency,
+        amount_eur = excluded.amount_eur,
+        description = excluded.description,
+        counterparty = excluded.counterparty,
+        merchant = excluded.merchant,
+        category = excluded.category,
+        tx_type = excluded.tx_type,
+        is_internal_transfer = excluded.is_internal_transfer,
+        captured_at = excluded.captured_at,
+        source = COALESCE(excluded.source, transaction_cache.source),
+        fx_rate_to_eur = excluded.fx_rate_to_eur,
+        counterparty_account_name = excluded.counterparty_account_name,
+        counterparty_account_id = excluded.counterparty_account_id,
+        counterparty_iban = excluded.counterparty_iban,
+        merchant_category_code = COALESCE(
+            excluded.merchant_category_code,
+            transaction_cache.merchant_category_code
+        ),
+        content_hash = excluded.content_hash
+""".format(epoch=_TX_EPOCH_SQL.format(date='?5'), day=_TX_DAY_SQL.format(date='?5'))
+# Positions in a transaction_cache row tuple (column order of the upsert above).
+_TX_ROW_DATE, _TX_ROW_AMOUNT, _TX_ROW_CURRENCY, _TX_ROW_AMOUNT_EUR = 4, 5, 6, 7
+_TX_ROW_SOURCE = 14
+_TRANSACTION_CACHE_LOOKUP_CHUNK = 500
+
+# tx_key -> content fingerprint known to be stored. Refreshes re-fetch the whole
+# window; rows whose fingerprint is known are not even queued.
+_TRANSACTION_CACHE_FINGERPRINTS = {}
+_TRANSACTION_CACHE_COUNTERS = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+_TRANSACTION_CACHE_LAST = {'sync': None, 'batch': None}
+
+def _transaction_cache_content(transaction):
+    """Row values (without content_hash and captured_at) in upsert column order."""
+    amount_eur = transaction.get('amount_eur')
+    return (
+        build_transaction_cache_key(transaction),
+        transaction.get('id'),
+        str(transaction.get('account_id')),
+        transaction.get('account_name'),
+        transaction.get('date'),
+        safe_float(transaction.get('amount'), default=0.0, context='transaction amount'),
+        (transaction.get('currency') or 'EUR').upper(),
+        None if amount_eur is None else safe_float(amount_eur, default=None, context='transaction amount_eur'),
+        transaction.get('description'),
+        transaction.get('counterparty'),
+        transaction.get('merchant'),
+        transaction.get('category'),
+        transaction.get('type'),
+        1 if transaction.get('is_internal_transfer') else 0,
+        transaction.get('source'),
+        transaction.get('fx_rate_to_eur'),
+        transaction.get('counterparty_account_name'),
+        transaction.get('counterparty_account_id'),
+        transaction.get('counterparty_iban'),
+        transaction.get('merchant_category_code'),
+    )
+
+def transaction_content_fingerprint(content):
+    """Stable signed 64-bit fingerprint of a row's content (fits an SQLite INTEGER)."""
+    digest = hashlib.blake2b(repr(content[1:]).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+def _stored_transaction_fingerprints(connection, tx_keys):
+    stored = {}
+    for start in range(0, len(tx_keys), _TRANSACTION_CACHE_LOOKUP_CHUNK):
+        chunk = tx_keys[start:start + _TRANSACTION_CACHE_LOOKUP_CHUNK]
+        rows = connection.execute(
+            f"SELECT tx_key, content_hash FROM transaction_cache WHERE tx_key IN ({','.join('?' for _ in chunk)})",
+            chunk,
+        ).fetchall()
+        stored.update((row['tx_key'], row['content_hash']) for row in rows)
+    return stored
+
+def _prepare_transaction_cache_batch(entries):
+    """
+    Classify queued rows against the store (insert / update / unchanged) and fill
+    missing EUR amounts of the rows that will be written with one batched FX lookup.
+    """
+    connection = get_data_db_connection()
+    try:
+        stored = _stored_transaction_fingerprints(
+            connection, [row[0] for kind, row, _ in entries if kind == 'row']
+        )
+    finally:
+        release_data_db_connection(connection)
+
+    classified = []
+    missing_pairs = set()
+    for kind, row, fingerprint in entries:
+        if kind == 'row':
+            if row[0] not in stored:
+                kind = 'insert'
+            elif stored[row[0]] == fingerprint:
+                kind = 'unchanged'
+            else:
+                kind = 'update'
+            if kind != 'unchanged' and row[_TX_ROW_AMOUNT_EUR] is None:
+                tx_date = parse_bunq_datetime(row[_TX_ROW_DATE], context='transaction date')
+                if tx_date:
+                    missing_pairs.add((row[_TX_ROW_CURRENCY], tx_date.date().isoformat()))
+        classified.append((kind, row, fingerprint))
+    fx_rates = resolve_fx_rates(missing_pairs) if missing_pairs else {}
+
+    prepared = []
+    for kind, row, fingerprint in classified:
+        if kind in ('insert', 'update'):
+            amount_eur = row[_TX_ROW_AMOUNT_EUR]
+            if amount_eur is None:
+                amount, currency = row[_TX_ROW_AMOUNT], row[_TX_ROW_CURRENCY]
+                tx_date = parse_bunq_datetime(row[_TX_ROW_DATE], context='transaction date')
+                if tx_date:
+                    rate = fx_rates.get((currency, tx_date.date().isoformat()))
+                    amount_eur = amount * rate if rate is not None else None
+                else:
+                    amount_eur, _, _ = convert_amount_to_eur(amount, currency)
+            # Without an EUR amount the fingerprint stays NULL, so a later refresh retries FX.
+            row = (
+                row[:_TX_ROW_AMOUNT_EUR] + (amount_eur,) + row[_TX_ROW_AMOUNT_EUR + 1:-1]
+                + (fingerprint if amount_eur is not None else None, row[-1])
+            )
+        prepared.append((kind, row, fingerprint))
+    return prepared
+
+def _legacy_card_payment_rows(entries):
+    """
+    (payment-source key, tx_date) of newly inserted card payments. Stores from
+    before the source column keep card payments without a source, which the
+    integer key maps to the payment code; those rows are replaced, not kept
+    next to the card_payment row.
+    """
+    return [
+        (row[0] - _TX_KEY_SOURCE_CODES['card_payment'] + _TX_KEY_SOURCE_CODES['payment'], row[_TX_ROW_DATE])
+        for kind, row, _ in entries
+        if kind == 'insert' and row[_TX_ROW_SOURCE] == 'card_payment' and row[0] >= 0
+    ]
+
+def _write_transaction_cache_batch(connection, entries):
+    """Upsert new and changed rows, then advance the sync marks they belong to (same transaction)."""
+    rows = [row for kind, row, _ in entries if kind in ('insert', 'update')]
+    if rows:
+        legacy = _legacy_card_payment_rows(entries)
+        if legacy:
+            connection.executemany(
+                "DELETE FROM transaction_cache WHERE tx_key = ? AND source IS NULL AND tx_date = ?",
+                legacy,
+            )
+        connection.executemany(_TRANSACTION_CACHE_UPSERT_SQL, rows)
+    apply_transaction_sync_states(connection, [update for kind, update, _ in entries if kind == 'sync'])
+
+def _record_transaction_cache_batch(entries):
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+    for kind, row, fingerprint in entries:
+        if kind == 'sync':
+            continue
+        counts[{'insert': 'inserted', 'update': 'updated', 'unchanged': 'unchanged'}[kind]] += 1
+        if kind == 'unchanged' or row[-2] is not None:
+            _TRANSACTION_CACHE_FINGERPRINTS[row[0]] = fingerprint
+    for name, count in counts.items():
+        _TRANSACTION_CACHE_COUNTERS[name] += count
+    _TRANSACTION_CACHE_LAST['batch'] = counts
+    if counts['inserted'] or counts['updated']:
+        logger.info(
+            f"💾 transaction_cache: {counts['inserted']} inserted, {counts['updated']} updated, "
+            f"{counts['unchanged']} unchanged"
+        )
+
+_TRANSACTION_CACHE_WRITER = WriteBehindQueue(
+    'transaction_cache',
+    _write_transaction_cache_batch,
+    prepare_batch=_prepare_transaction_cache_batch,
+    after_write=_record_transaction_cache_batch,
+)
+
+def persist_transactions(transactions, sync_updates=None):
+    """
+    Queue normalized transactions for transaction_cache; returns True when queued.
+
+    Rows whose fingerprint is known to be stored are skipped here; the writer
+    checks the rest against the stored content_hash and only upserts new or
+    changed rows. sync_updates are queued behind the rows, so a high-water mark
+    only advances in the transaction that stores the rows it covers.
+    """
+    if not DATA_DB_ENABLED or (not transactions and not sync_updates):
+        return False
+
     captured_at = datetime.now(timezone.utc).isoformat()
+    try:
+        items = []
+        skipped = 0
+        for transaction in transactions:
+            content = _transaction_cache_content(transaction)
+            fingerprint = transaction_content_fingerprint(content)
+            if _TRANSACTION_CACHE_FINGERPRINTS.get(content[0]) == fingerprint:
+                skipped += 1
+                continue
+            items.append((content[0], ('row', content + (captured_at,), fingerprint)))
+        for update in sync_updates or ():
+            items.append((('sync', update['account_id'], update['source']), ('sync', update, None)))
+        _TRANSACTION_CACHE_COUNTERS['unchanged'] += skipped
+        _TRANSACTION_CACHE_LAST['sync'] = {
+            'rows': len(transactions),
+            'queued': len(transactions) - skipped,
+            'unchanged': skipped,
+        }
+        if items:
+            _TRANSACTION_CACHE_WRITER.submit_many(items)
+        return True
+    except Exception as exc:
+        logger.warning(f"⚠️ Failed persisting transactions: {exc}")
+        return False
+
+def get_write_behind_stats():
+    return {
+        'account_snapshots': _ACCOUNT_SNAPSHOT_WRITER.stats(),
+        'transaction_cache': {
+            **_TRANSACTION_CACHE_WRITER.stats(),
+            'rows': dict(_TRANSACTION_CACHE_COUNTERS),
+            'last_sync': _TRANSACTION_CACHE_LAST['sync'],
+            'last_batch': _TRANSACTION_CACHE_LAST['batch'],
+        },
+    }
+
+# ============================================
+# COMPACT TRANSACTION RECORDS
+# ============================================
+
+TRANSACTION_FIELDS = (
+    'id', 'date', 'amount', 'currency', 'amount_eur', 'fx_rate_to_eur', 'fx_converted',
+    'description', 'counterparty', 'counterparty_account_name', 'counterparty_account_id',
+    'counterparty_iban', 'merchant', 'category', 'merchant_category_code', 'type', 'source',
+    'account_id', 'account_name', 'is_internal_transfer',
+)
+# Low-cardinality text repeated on every row: one shared string object per value.
+_INTERNED_TRANSACTION_FIELDS = frozenset((
+    'currency', 'merchant', 'category', 'merchant_category_code', 'type', 'source', 'account_name',
+))
+
+def _intern_field(value):
+    return sys.intern(value) if type(value) is str else value
+
+class CompactTransaction:
+    """
+    One normalized transaction as a __slots__ record instead of a 20-key dict.
+
+    Supports the dict operations the pipeline uses (tx['x'], tx.get('x'),
+    tx['x'] = v, 'x' in tx), pickles as a bare value tuple for the response
+    cache and serializes to the exact JSON shape of the old dict via to_dict().
+    """
+
+    __slots__ = TRANSACTION_FIELDS
+
+    def __init__(self, **fields):
+        for name in TRANSACTION_FIELDS:
+            value = fields.get(name)
+            setattr(self, name, _intern_field(value) if name in _INTERNED_TRANSACTION_FIELDS else value)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in _TRANSACTION_FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, _intern_field(value) if key in _INTERNED_TRANSACTION_FIELDS else value)
+
+    def __contains__(self, key):
+        return key in _TRANSACTION_FIELD_SET
+
+    def __iter__(self):
+        return iter(TRANSACTION_FIELDS)
+
+    def __len__(self):
+        return len(TRANSACTION_FIELDS)
+
+    def __eq__(self, other):
+        if isinstance(other, CompactTransaction):
+            return self.values() == other.values()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"CompactTransaction({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return (_compact_transaction_from_values, (self.values(),))
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in _TRANSACTION_FIELD_SET else default
+
+    def keys(self):
+        return TRANSACTION_FIELDS
+
+    def values(self):
+        return tuple(getattr(self, name) for name in TRANSACTION_FIELDS)
+
+    def items(self):
+        return zip(TRANSACTION_FIELDS, self.values())
+
+    def to_dict(self):
+        return dict(zip(TRANSACTION_FIELDS, self.values()))
+
+_TRANSACTION_FIELD_SET = frozenset(TRANSACTION_FIELDS)
+
+def _compact_transaction_from_values(values):
+    record = CompactTransaction.__new__(CompactTransaction)
+    for name, value in zip(TRANSACTION_FIELDS, values):
+        setattr(record, name, _intern_field(value) if name in _INTERNED_TRANSACTION_FIELDS else value)
+    return record
+
+class DashboardJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that also serializes CompactTransaction records."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, CompactTransaction):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
+
+app.json = DashboardJSONProvider(app)
+
+# ============================================
+# INCREMENTAL TRANSACTION SYNC
+# ============================================
+
+_SYNC_COMPLETE_STOP_REASONS = ('high_water_reached', 'cutoff_reached', 'short_page', 'empty_page')
+
+def floor_sync_cutoff(cutoff_date):
+    """Floor a fetch cutoff to the minute so overlapping refreshes share one stream fetch."""
+    if cutoff_date is None:
+        return None
+    return cutoff_date.replace(second=0, microsecond=0)
+
+def transaction_sync_enabled():
+    return DATA_DB_ENABLED and TRANSACTION_SYNC_ENABLED
+
+def load_transaction_sync_state(account_id, source):
+    """Return {'high_water_id', 'synced_from', 'last_synced_at'} for one stream, or None."""
+    if not transaction_sync_enabled():
+        return None
     connection = get_data_db_connection()
     if connection is None:
-        return
-
+        return None
     try:
-        with connection:
-            for account in accounts_data:
-                account_id = str(account.get('id'))
-                balance = account.get('balance', {})
-                balance_eur = account.get('balance_eur', {})
-                connection.execute(
-                    """
-                    INSERT INTO account_snapshots (
-                        snapshot_date, account_id, description, account_type, account_class, status,
-                        balance_value, balance_currency, balance_eur_value, fx_rate_to_eur, captured_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(snapshot_date, account_id) DO UPDATE SET
-                        description = excluded.description,
-                        account_type = excluded.account_type,
-                        account_class = excluded.account_class,
-                        status = excluded.status,
-                        balance_value = excluded.balance_value,
-                        balance_currency = excluded.balance_currency,
-                        balance_eur_value = excluded.balance_eur_value,
-                        fx_rate_to_eur = excluded.fx_rate_to_eur,
-                        captured_at = excluded.captured_at
-                    """,
-                    (
-                        snapshot_date,
-                        account_id,
-                        account.get('description'),
-                        account.get('account_type'),
-                        account.get('account_class'),
-                        account.get('status'),
-                        safe_float(balance.get('value'), default=0.0, context=f"account {account_id} snapshot balance"),
-                        balance.get('currency') or 'EUR',
-                        (
-                            None if balance_eur.get('value') is None else
-                            safe_float(balance_eur.get('value'), default=0.0, context=f"account {account_id} snapshot balance_eur")
-                        ),
-                        account.get('fx_rate_to_eur'),
-                        captured_at,
-                    ),
-                )
+        row = connection.execute(
+            """
+            SELECT high_water_id, synced_from, last_synced_at
+            FROM transaction_sync_state
+            WHERE account_id = ? AND source = ?
+            """,
+            (str(account_id), source),
+        ).fetchone()
+        return dict(row) if row else None
     except Exception as exc:
-        logger.warning(f"⚠️ Failed persisting account snapshots: {exc}")
+        logger.warning(f"⚠️ Failed reading sync state for account {account_id} ({source}): {exc}")
+        return None
     finally:
-        connection.close()
+        release_data_db_connection(connection)
 
-def build_transaction_cache_key(transaction):
-    payload = "|".join([
-        str(transaction.get('id')),
-        str(transaction.get('account_id')),
-        str(transaction.get('date')),
-        str(transaction.get('amount')),
-        str(transaction.get('description')),
-    ])
-    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
-
-def persist_transactions(transactions):
-    if not DATA_DB_ENABLED or not transactions:
+def apply_transaction_sync_states(connection, updates):
+    """
+    Apply planned sync-state updates inside the caller's transaction. Only apply them
+    together with (or after) the fetched rows, otherwise the high-water mark could
+    skip payments that never reached SQLite.
+    """
+    if not transaction_sync_enabled() or not updates:
         return
+    now_iso = datetime.now(timezone.utc).isoformat()
+    for update in updates:
+        if update.get('reset'):
+            connection.execute(
+                "DELETE FROM transaction_sync_state WHERE account_id = ? AND source = ?",
+                (update['account_id'], update['source']),
+            )
+            continue
+        connection.execute(
+            """
+            INSERT INTO transaction_sync_state (
+                account_id, source, high_water_id, synced_from, last_synced_at
+            ) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(account_id, source) DO UPDATE SET
+                high_water_id = excluded.high_water_id,
+                synced_from = excluded.synced_from,
+                last_synced_at = excluded.last_synced_at
+            """,
+            (
+                update['account_id'],
+                update['source'],
+                update['high_water_id'],
+                update['synced_from'],
+                now_iso,
+            ),
+        )
+
+def persist_synced_transactions(transactions, sync_updates):
+    """Queue fetched rows; their sync marks advance in the same write-behind transaction."""
+    persist_transactions(transactions, sync_updates if transaction_sync_enabled() else None)
 
+def plan_transaction_sync_update(account_id, source, payments, meta, state, cutoff_date):
+    """Derive the next sync state for one stream from a finished fetch (or None to keep it)."""
+    if not transaction_sync_enabled() or not meta or not cutoff_date:
+        return None
+    if source == 'card_payment' and not meta.get('available', True):
+        return None
+
+    stop_reason = meta.get('stop_reason')
+    if stop_reason not in _SYNC_COMPLETE_STOP_REASONS:
+        # Truncated or ambiguous walk: a gap may exist between fetched pages and the
+        # stored mark, so fall back to a full walk next time.
+        return {'account_id': str(account_id), 'source': source, 'reset': True} if state else None
+
+    fetched_ids = [
+        payment_id for payment_id in (_extract_payment_numeric_id(payment) for payment in payments)
+        if payment_id is not None
+    ]
+    previous_high_water = (state or {}).get('high_water_id')
+    high_water_candidates = fetched_ids + ([previous_high_water] if previous_high_water is not None else [])
+    # Stream fetches run with the floored cutoff, so that is what the walk covered.
+    cutoff_iso = floor_sync_cutoff(cutoff_date).isoformat()
+    if meta.get('sync_mode') == 'incremental' and state:
+        synced_from = min(state['synced_from'], cutoff_iso)
+    else:
+        synced_from = cutoff_iso
+    return {
+        'account_id': str(account_id),
+        'source': source,
+        'high_water_id': max(high_water_candidates) if high_water_candidates else None,
+        'synced_from': synced_from,
+    }
+
+def get_transaction_sync_freshness():
+    """
+    Summarize payment-stream sync state across accounts.
+    Returns {'accounts', 'synced_from', 'last_synced_at', 'age_seconds'} or None.
+    """
+    if not transaction_sync_enabled():
+        return None
     connection = get_data_db_connection()
     if connection is None:
-        return
-    captured_at = datetime.now(timezone.utc).isoformat()
+        return None
+    try:
+        row = connection.execute(
+            """
+            SELECT COUNT(*) AS accounts,
+                   MAX(synced_from) AS synced_from,
+                   MIN(last_synced_at) AS last_synced_at
+            FROM transaction_sync_state
+            WHERE source = 'payment'
+            """
+        ).fetchone()
+        if not row or not row['accounts']:
+            return None
+        last_synced_dt = parse_bunq_datetime(row['last_synced_at'], context='transaction_sync_state.last_synced_at')
+        age_seconds = None
+        if last_synced_dt is not None:
+            age_seconds = max((datetime.now(timezone.utc) - last_synced_dt).total_seconds(), 0.0)
+        return {
+            'accounts': int(row['accounts']),
+            'synced_from': row['synced_from'],
+            'last_synced_at': row['last_synced_at'],
+            'age_seconds': age_seconds,
+        }
+    except Exception as exc:
+        logger.warning(f"⚠️ Failed reading transaction sync freshness: {exc}")
+        return None
+    finally:
+        release_data_db_connection(connection)
+
+def _transaction_from_cache_row(row, account_id, account_name):
+    tx_id = row['tx_id']
+    if isinstance(tx_id, str) and tx_id.isdigit():
+        tx_id = int(tx_id)
+    amount_eur = row['amount_eur']
+    return CompactTransaction(
+        id=tx_id,
+        date=row['tx_date'],
+        amount=float(row['amount']),
+        currency=row['currency'],
+        amount_eur=amount_eur,
+        fx_rate_to_eur=row['fx_rate_to_eur'],
+        fx_converted=amount_eur is not None,
+        description=row['description'] or '',
+        counterparty=row['counterparty'],
+        counterparty_account_name=row['counterparty_account_name'],
+        counterparty_account_id=row['counterparty_account_id'],
+        counterparty_iban=row['counterparty_iban'],
+        merchant=row['merchant'],
+        category=row['category'],
+        merchant_category_code=row['merchant_category_code'],
+        type=row['tx_type'],
+        source=row['source'],
+        account_id=account_id,
+        account_name=account_name if account_name is not None else row['account_name'],
+        is_internal_transfer=bool(row['is_internal_transfer']),
+    )
 
+_CACHED_STREAM_SQL = """
+    SELECT tx_id, account_name, tx_date, amount, currency, amount_eur, fx_rate_to_eur,
+           description, counterparty, counterparty_account_name, counterparty_account_id,
+           counterparty_iban, merchant, category, merchant_category_code, tx_type, source,
+           is_internal_transfer
+    FROM transaction_cache
+    WHERE account_id = ? AND source = ? AND tx_epoch >= ?
+"""
+
+def load_cached_account_transactions(account_id, source, cutoff_date, account_name=None):
+    """Load previously synced transactions of one stream from transaction_cache."""
+    if not transaction_sync_enabled():
+        return []
+    connection = get_data_db_connection()
+    if connection is None:
+        return []
     try:
-        rows = []
-        for transaction in transactions:
-            tx_key = build_transaction_cache_key(transaction)
-            amount = safe_float(transaction.get('amount'), default=0.0, context='transaction amount')
-            currency = (transaction.get('currency') or 'EUR').upper()
-            amount_eur = transaction.get('amount_eur')
-            if amount_eur is None:
-                tx_date = parse_bunq_datetime(transaction.get('date'), context='transaction date')
-                rate_date = tx_date.date().isoformat() if tx_date else None
-                amount_eur, _, _ = convert_amount_to_eur(amount, currency, rate_date=rate_date)
-            else:
-                amount_eur = safe_float(amount_eur, default=None, context='transaction amount_eur')
-            rows.append((
-                tx_key,
-                transaction.get('id'),
-                str(transaction.get('account_id')),
-                transaction.get('account_name'),
-                transaction.get('date'),
-                amount,
-                currency,
-                amount_eur,
-                transaction.get('description'),
-                transaction.get('counterparty'),
-                transaction.get('merchant'),
-                transaction.get('category'),
-                transaction.get('type'),
-                1 if transaction.get('is_internal_transfer') else 0,
-                captured_at,
-            ))
-        with connection:
-            connection.executemany(
-                """
-                INSERT INTO transaction_cache (
-                    tx_key, tx_id, account_id, account_name, tx_date, amount, currency, amount_eur,
-                    description, counterparty, merchant, category, tx_type, is_internal_transfer, captured_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(tx_key) DO UPDATE SET
-                    account_name = excluded.account_name,
-                    amount = excluded.amount,
-                    currency = excluded.currency,
-                    amount_eur = excluded.amount_eur,
-                    description = excluded.description,
-                    counterparty = excluded.counterparty,
-                    merchant = excluded.merchant,
-                    category = excluded.category,
-                    tx_type = excluded.tx_type,
-                    is_internal_transfer = excluded.is_internal_transfer,
-                    captured_at = excluded.captured_at
-                """,
-                rows,
+        rows = connection.execute(
+            _CACHED_STREAM_SQL,
+            (str(account_id), source, epoch_seconds(cutoff_date.isoformat())),
+        ).fetchall()
+        return [_transaction_from_cache_row(row, account_id, account_name) for row in rows]
+    except Exception as exc:
+        logger.warning(f"⚠️ Failed loading cached transactions for account {account_id} ({source}): {exc}")
+        return []
+    finally:
+        release_data_db_connection(connection)
+
+# ============================================
+# VECTORIZED ANALYTICS
+# ============================================
+
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+def _day_index(date_key):
+    return datetime.fromisoformat(date_key).toordinal() - _EPOCH_ORDINAL
+
+def _day_key(day_index):
+    return datetime.fromordinal(int(day_index) + _EPOCH_ORDINAL).date().isoformat()
+
+def _dictionary_codes(values):
+    """Encode values as first-seen integer codes; returns (codes, names)."""
+    index = {value: code for code, value in enumerate(dict.fromkeys(values))}
+    return list(map(index.__getitem__, values)), list(index)
+
+def _group_sum(codes, size, weights=None):
+    """Per-code sums of weights (or counts) as a list of length `size`."""
+    if np is not None:
+        return np.bincount(codes, weights=weights, minlength=size).tolist()
+    totals = [0.0 if weights is not None else 0] * size
+    if weights is None:
+        for code in codes:
+            totals[code] += 1
+    else:
+        for code, weight in zip(codes, weights):
+            totals[code] += weight
+    return totals
+
+def _percentiles(values, percents):
+    """Linear-interpolated percentiles (NumPy's default method)."""
+    if np is not None:
+        return [float(value) for value in np.percentile(np.asarray(values, dtype=np.float64), percents)]
+    ordered = sorted(values)
+    results = []
+    for percent in percents:
+        position = (len(ordered) - 1) * percent / 100
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        results.append(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower))
+    return results
+
+_FRAME_FIELDS = (
+    'amount_eur', 'amount', 'currency', 'date', 'category', 'merchant', 'account_id', 'is_internal_transfer',
+)
+_FRAME_FIELD_GETTER = operator.attrgetter(*_FRAME_FIELDS)
+
+class TransactionFrame:
+    """
+    One transaction window as typed columns: EUR stats amount (float64), UTC
+    day index since 1970-01-01 (int32), category/merchant/account codes into
+    the name lists (int32/int32/int16) and the internal-transfer flag.
+
+    Sums and group-bys run as NumPy array operations when NumPy is installed;
+    without it the same methods loop in Python and return the same numbers.
+    """
+
+    __slots__ = (
+        'amount', 'day', 'category', 'merchant', 'account', 'internal',
+        'categories', 'merchants', 'accounts',
+    )
+
+    def __init__(self, amounts, date_keys, categories, merchants, accounts, internal):
+        day_by_key = {key: _day_index(key) for key in set(date_keys)}
+        days = list(map(day_by_key.__getitem__, date_keys))
+        category_codes, self.categories = _dictionary_codes(categories)
+        merchant_codes, self.merchants = _dictionary_codes(merchants)
+        account_codes, self.accounts = _dictionary_codes(accounts)
+        if np is not None:
+            self.amount = np.asarray(amounts, dtype=np.float64)
+            self.day = np.asarray(days, dtype=np.int32)
+            self.category = np.asarray(category_codes, dtype=np.int32)
+            self.merchant = np.asarray(merchant_codes, dtype=np.int32)
+            self.account = np.asarray(account_codes, dtype=np.int16)
+            self.internal = np.asarray(internal, dtype=bool)
+        else:
+            self.amount = [float(value) for value in amounts]
+            self.day = days
+            self.category = category_codes
+            self.merchant = merchant_codes
+            self.account = account_codes
+            self.internal = [bool(value) for value in internal]
+
+    @classmethod
+    def from_transactions(cls, transactions):
+        """Frame normalized transactions with the statistics amount rules (EUR, else 0)."""
+        if all(type(tx) is CompactTransaction for tx in transactions):
+            rows = list(map(_FRAME_FIELD_GETTER, transactions))
+        else:
+            rows = [tuple(tx.get(field) for field in _FRAME_FIELDS) for tx in transactions]
+        if not rows:
+            return cls([], [], [], [], [], [])
+        amounts_eur, amounts, currencies, dates, categories, merchants, accounts, internal = zip(*rows)
+        return cls(
+            [
+                safe_float(amount_eur, default=0.0, context='statistics amount_eur') if amount_eur is not None
+                else safe_float(amount, default=0.0, context='statistics amount') if (currency or 'EUR').upper() == 'EUR'
+                else 0.0
+                for amount_eur, amount, currency in zip(amounts_eur, amounts, currencies)
+            ],
+            [str(date)[:10] for date in dates],
+            [(category.strip() if isinstance(category, str) else '') or 'Overig' for category in categories],
+            [(merchant.strip() if isinstance(merchant, str) else '') or 'Onbekend' for merchant in merchants],
+            [str(account_id) for account_id in accounts],
+            internal,
+        )
+
+    def __len__(self):
+        return len(self.amount)
+
+    def totals(self):
+        """Return (income, expenses, count); expenses are positive."""
+        if np is not None:
+            return (
+                float(self.amount[self.amount > 0].sum()),
+                0.0 - float(self.amount[self.amount < 0].sum()),
+                len(self),
             )
+        return (
+            sum(value for value in self.amount if value > 0),
+            -sum(value for value in self.amount if value < 0),
+            len(self),
+        )
+
+    def expense_by_category(self):
+        """{category: positive expense total} for categories with expenses."""
+        if np is not None:
+            mask = self.amount < 0
+            totals = _group_sum(self.category[mask], len(self.categories), -self.amount[mask])
+            counts = _group_sum(self.category[mask], len(self.categories))
+        else:
+            pairs = [(code, -value) for code, value in zip(self.category, self.amount) if value < 0]
+            totals = _group_sum([code for code, _ in pairs], len(self.categories), [value for _, value in pairs])
+            counts = _group_sum([code for code, _ in pairs], len(self.categories))
+        return {name: totals[code] for code, name in enumerate(self.categories) if counts[code]}
+
+    def period_starts(self, period):
+        """Period start day index per row for 'day', 'week' (Monday) or 'month'."""
+        if np is not None:
+            if period == 'week':
+                # 1970-01-01 was a Thursday: (day + 3) % 7 is the weekday, Monday = 0.
+                return self.day - (self.day + 3) % 7
+            if period == 'month':
+                return self.day.astype('datetime64[D]').astype('datetime64[M]').astype('datetime64[D]').astype(np.int32)
+            return self.day
+        if period == 'day':
+            return self.day
+        start_by_day = {}
+        for day in set(self.day):
+            start_by_day[day] = _day_index(aggregate_period_start(_day_key(day), period))
+        return [start_by_day[day] for day in self.day]
+
+    def group_by_period(self, period):
+        """Return (period keys, row codes into them), keys sorted ascending."""
+        starts = self.period_starts(period)
+        if np is not None:
+            unique_starts, codes = np.unique(starts, return_inverse=True)
+            return [_day_key(start) for start in unique_starts.tolist()], codes
+        unique_starts = sorted(set(starts))
+        position = {start: index for index, start in enumerate(unique_starts)}
+        return [_day_key(start) for start in unique_starts], [position[start] for start in starts]
+
+    def daily_expenses(self):
+        """(date_key, positive expense total) per day that has transactions."""
+        day_keys, codes = self.group_by_period('day')
+        if np is not None:
+            weights = np.where(self.amount < 0, -self.amount, 0.0)
+        else:
+            weights = [-value if value < 0 else 0.0 for value in self.amount]
+        return list(zip(day_keys, _group_sum(codes, len(day_keys), weights)))
+
+def rolling_sums(values, window):
+    """Trailing `window`-length sums (shorter at the start of the series)."""
+    if np is not None:
+        cumulative = np.cumsum(np.concatenate(([0.0], np.asarray(values, dtype=np.float64))))
+        lagged = np.concatenate((np.zeros(min(window, len(values))), cumulative[1:max(len(values) - window + 1, 1)]))
+        return (cumulative[1:] - lagged).tolist()
+    sums, running = [], 0.0
+    for index, value in enumerate(values):
+        running += value
+        if index >= window:
+            running -= values[index - window]
+        sums.append(running)
+    return sums
+
+def daily_expense_profile(day_rows, rolling_window=7):
+    """
+    Distribution of daily expenses from (date_key, expense) rows, gap-filled
+    between the first and last day like the dashboard's volatility widget:
+    mean, population std, coefficient of variation, p50/p90/p95, max and the
+    highest `rolling_window`-day total.
+    """
+    if not day_rows:
+        return None
+    by_day = {_day_index(key): float(expense or 0.0) for key, expense in day_rows}
+    first, last = min(by_day), max(by_day)
+    values = [by_day.get(day, 0.0) for day in range(first, last + 1)]
+    if np is not None:
+        array = np.asarray(values, dtype=np.float64)
+        mean, std = float(array.mean()), float(array.std())
+    else:
+        mean = sum(values) / len(values)
+        std = (sum((value - mean) ** 2 for value in values) / len(values)) ** 0.5
+    p50, p90, p95 = _percentiles(values, (50, 90, 95))
+    return {
+        'days': len(values),
+        'mean': round(mean, 2),
+        'std': round(std, 2),
+        'cv': round(std / mean, 4) if mean > 0.01 else 0.0,
+        'p50': round(p50, 2),
+        'p90': round(p90, 2),
+        'p95': round(p95, 2),
+        'max': round(max(values), 2),
+        f'rolling_{rolling_window}d_max': round(max(rolling_sums(values, rolling_window)), 2),
+    }
+
+# ============================================
+# STATISTICS ENGINE (SQLite)
+# ============================================
+
+_STATS_AMOUNT_SQL = """
+    CASE
+        WHEN amount_eur IS NOT NULL THEN amount_eur
+        WHEN UPPER(COALESCE(currency, 'EUR')) = 'EUR' THEN amount
+        ELSE 0
+    END
+"""
+
+_BACKGROUND_REFRESH_LOCK = threading.Lock()
+
+def get_store_window_freshness(days):
+    """
+    Sync freshness plus 'covers_window': True when transaction_cache holds the
+    last `days` and was synced within STATISTICS_MAX_STALENESS_SECONDS.
+    """
+    freshness = get_transaction_sync_freshness()
+    if freshness is None:
+        return None
+    cutoff_iso = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    covers_window = bool(
+        freshness['synced_from']
+        and freshness['synced_from'] <= cutoff_iso
+        and freshness['age_seconds'] is not None
+        and freshness['age_seconds'] <= STATISTICS_MAX_STALENESS_SECONDS
+    )
+    return {**freshness, 'covers_window': covers_window}
+
+def compute_statistics_from_store(days, exclude_internal=False):
+    """
+    Aggregate /api/statistics figures in SQL over transaction_cache.
+    Returns (data, freshness) when the synced window covers `days` and is fresh
+    enough, otherwise (None, freshness) so the caller can use the live Bunq path.
+    """
+    freshness = get_store_window_freshness(days)
+    if freshness is None or not freshness['covers_window']:
+        return None, freshness
+    cutoff_iso = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+    connection = get_data_db_connection()
+    if connection is None:
+        return None, freshness
+    internal_filter = "WHERE is_internal_transfer = 0" if exclude_internal else ""
+    # Whole days come from transaction_daily_rollup, only the cutoff day from raw rows.
+    source, params = rollup_window_source(cutoff_iso)
+    try:
+        totals_row = connection.execute(
+            f"""
+            SELECT SUM(tx_count) AS total_transactions,
+                   SUM(income_eur) AS income,
+                   SUM(expense_eur) AS expenses
+            FROM ({source})
+            {internal_filter}
+            """,
+            params,
+        ).fetchone()
+        category_rows = connection.execute(
+            f"""
+            SELECT category, SUM(expense_eur) AS total
+            FROM ({source})
+            {internal_filter}
+            GROUP BY category
+            HAVING SUM(expense_eur) > 0
+            """,
+            params,
+        ).fetchall()
     except Exception as exc:
-        logger.warning(f"⚠️ Failed persisting transactions: {exc}")
+        logger.warning(f"⚠️ Failed computing statistics from history store: {exc}")
+        return None, freshness
     finally:
-        connection.close()
+        release_data_db_connection(connection)
+
+    income = float(totals_row['income'] or 0.0)
+    expenses = abs(float(totals_row['expenses'] or 0.0))
+    net_savings = income - expenses
+    return {
+        'period_days': days,
+        'total_transactions': int(totals_row['total_transactions'] or 0),
+        'income': income,
+        'expenses': expenses,
+        'net_savings': net_savings,
+        'savings_rate': (net_savings / income * 100) if income > 0 else 0,
+        'categories': {row['category']: float(row['total'] or 0.0) for row in category_rows},
+        'avg_daily_expenses': expenses / days if days > 0 else 0,
+    }, freshness
+
+AGGREGATE_PERIODS = ('day', 'week', 'month')
+# Period start (YYYY-MM-DD, UTC) of a rollup day; weeks start on Monday.
+_AGGREGATE_PERIOD_SQL = {
+    'day': "day",
+    'week': "date(day, 'weekday 0', '-6 days')",
+    'month': "substr(day, 1, 7) || '-01'",
+}
+
+def aggregate_period_start(date_key, period):
+    """Python twin of _AGGREGATE_PERIOD_SQL for a YYYY-MM-DD key."""
+    if period == 'day':
+        return date_key
+    if period == 'month':
+        return date_key[:8] + '01'
+    day = datetime.fromisoformat(date_key).date()
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+def _next_period_start(date_key, period):
+    day = datetime.fromisoformat(date_key).date()
+    if period == 'day':
+        return (day + timedelta(days=1)).isoformat()
+    if period == 'week':
+        return (day + timedelta(days=7)).isoformat()
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1).isoformat()
+
+def shape_transaction_aggregates(period_rows, category_rows, merchant_rows, period):
+    """
+    Build the /api/aggregates payload from grouped rows:
+    period_rows (period, income, expenses, count), category_rows
+    (period, category, expense) and merchant_rows (merchant, expense, count),
+    already ordered by expense descending. Periods without transactions between
+    the first and last one are filled with zeros, like the dashboard charts do.
+    """
+    by_period = {row[0]: row for row in period_rows}
+    periods = []
+    if by_period:
+        current, last = min(by_period), max(by_period)
+        while current <= last:
+            periods.append(current)
+            current = _next_period_start(current, period)
+    period_index = {key: index for index, key in enumerate(periods)}
+
+    income = [round(float(by_period[key][1] or 0.0), 2) if key in by_period else 0.0 for key in periods]
+    expenses = [round(float(by_period[key][2] or 0.0), 2) if key in by_period else 0.0 for key in periods]
+    counts = [int(by_period[key][3] or 0) if key in by_period else 0 for key in periods]
+
+    category_totals = defaultdict(float)
+    for _, category, expense in category_rows:
+        category_totals[category] += float(expense or 0.0)
+    categories = sorted(category_totals, key=lambda name: (-category_totals[name], name))
+    matrix = {category: [0.0] * len(periods) for category in categories}
+    for period_key, category, expense in category_rows:
+        matrix[category][period_index[period_key]] = round(float(expense or 0.0), 2)
+
+    total_income = sum(float(row[1] or 0.0) for row in period_rows)
+    total_expenses = sum(float(row[2] or 0.0) for row in period_rows)
+    return {
+        'period': period,
+        'periods': periods,
+        'totals': {
+            'income': income,
+            'expenses': expenses,
+            'net': [round(value_in - value_out, 2) for value_in, value_out in zip(income, expenses)],
+            'count': counts,
+        },
+        'summary': {
+            'income': round(total_income, 2),
+            'expenses': round(total_expenses, 2),
+            'net': round(total_income - total_expenses, 2),
+            'count': sum(counts),
+        },
+        'categories': categories,
+        'category_matrix': [matrix[category] for category in categories],
+        'expense_by_category': {category: round(category_totals[category], 2) for category in categories},
+        'top_merchants': [
+            {'merchant': merchant, 'total': round(float(expense or 0.0), 2), 'count': int(count or 0)}
+            for merchant, expense, count in merchant_rows
+        ],
+    }
+
+def _merchant_window_sql(filters):
+    """Top merchants over raw rows with tx_epoch >= ?; params: cutoff epoch, filter values, limit."""
+    return f"""
+        SELECT COALESCE(NULLIF(TRIM(merchant), ''), 'Onbekend') AS merchant,
+               SUM(-{_STATS_AMOUNT_SQL}) AS total, COUNT(*)
+        FROM transaction_cache
+        WHERE tx_epoch >= ? {' '.join(f'AND {condition}' for condition in filters)}
+          AND {_STATS_AMOUNT_SQL} < 0
+        GROUP BY 1
+        ORDER BY total DESC, merchant
+        LIMIT ?
+    """
+
+def compute_aggregates_from_store(days, period, account_ids=None, exclude_internal=False, top_merchants=10):
+    """
+    GROUP BY aggregation of transaction_cache for /api/aggregates.
+    Returns the shaped payload, or None when the store cannot answer.
+    """
+    connection = get_data_db_connection()
+    if connection is None:
+        return None
+    cutoff_iso = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    filters = []
+    filter_params = []
+    if exclude_internal:
+        filters.append("is_internal_transfer = 0")
+    if account_ids:
+        filters.append(f"account_id IN ({', '.join('?' for _ in account_ids)})")
+        filter_params.extend(account_ids)
+    where = f"WHERE {' AND '.join(filters)}" if filters else ""
+    # Period and category figures come from the daily rollup (plus the partial
+    # cutoff day); only the merchant ranking needs raw rows.
+    rollup_source, rollup_params = rollup_window_source(cutoff_iso)
+    rollup_params = [*rollup_params, *filter_params]
+    try:
+        period_rows = connection.execute(
+            f"""
+            SELECT {_AGGREGATE_PERIOD_SQL[period]} AS period_start,
+                   SUM(income_eur), SUM(expense_eur), SUM(tx_count)
+            FROM ({rollup_source})
+            {where}
+            GROUP BY period_start
+            """,
+            rollup_params,
+        ).fetchall()
+        category_rows = connection.execute(
+            f"""
+            SELECT {_AGGREGATE_PERIOD_SQL[period]} AS period_start, category, SUM(expense_eur) AS total
+            FROM ({rollup_source})
+            {where}
+            GROUP BY period_start, category
+            HAVING total > 0
+            """,
+            rollup_params,
+        ).fetchall()
+        merchant_rows = connection.execute(
+            _merchant_window_sql(filters),
+            [epoch_seconds(cutoff_iso), *filter_params, top_merchants],
+        ).fetchall()
+        day_rows = connection.execute(
+            f"""
+            SELECT day, SUM(expense_eur)
+            FROM ({rollup_source})
+            {where}
+            GROUP BY day
+            """,
+            rollup_params,
+        ).fetchall()
+    except Exception as exc:
+        logger.warning(f"⚠️ Failed computing aggregates from history store: {exc}")
+        return None
+    finally:
+        release_data_db_connection(connection)
+    data = shape_transaction_aggregates(
+        [tuple(row) for row in period_rows],
+        [tuple(row) for row in category_rows],
+        [tuple(row) for row in merchant_rows],
+        period,
+    )
+    data['daily_expenses'] = daily_expense_profile([tuple(row) for row in day_rows])
+    return data
+
+def compute_aggregates_from_frame(frame, period, top_merchants=10):
+    """Same aggregation as compute_aggregates_from_store, as group-bys over a TransactionFrame."""
+    period_keys, codes = frame.group_by_period(period)
+    size = len(period_keys)
+    n_categories = len(frame.categories)
+    if np is not None:
+        income_weights = np.where(frame.amount > 0, frame.amount, 0.0)
+        expense_weights = np.where(frame.amount < 0, -frame.amount, 0.0)
+        expense_mask = frame.amount < 0
+        cell_codes = codes[expense_mask] * n_categories + frame.category[expense_mask]
+        cell_weights = expense_weights[expense_mask]
+        merchant_codes = frame.merchant[expense_mask]
+    else:
+        income_weights = [value if value > 0 else 0.0 for value in frame.amount]
+        expense_weights = [-value if value < 0 else 0.0 for value in frame.amount]
+        expense_rows = [index for index, value in enumerate(frame.amount) if value < 0]
+        cell_codes = [codes[index] * n_categories + frame.category[index] for index in expense_rows]
+        cell_weights = [expense_weights[index] for index in expense_rows]
+        merchant_codes = [frame.merchant[index] for index in expense_rows]
+
+    income = _group_sum(codes, size, income_weights)
+    expenses = _group_sum(codes, size, expense_weights)
+    counts = _group_sum(codes, size)
+    cell_totals = _group_sum(cell_codes, size * n_categories, cell_weights)
+    cell_counts = _group_sum(cell_codes, size * n_categories)
+    merchant_totals = _group_sum(merchant_codes, len(frame.merchants), cell_weights)
+    merchant_counts = _group_sum(merchant_codes, len(frame.merchants))
+
+    top = sorted(
+        (code for code in range(len(frame.merchants)) if merchant_counts[code]),
+        key=lambda code: (-merchant_totals[code], frame.merchants[code]),
+    )[:top_merchants]
+    return shape_transaction_aggregates(
+        [(period_keys[index], income[index], expenses[index], counts[index]) for index in range(size)],
+        [
+            (period_keys[cell // n_categories], frame.categories[cell % n_categories], cell_totals[cell])
+            for cell in range(size * n_categories)
+            if cell_counts[cell]
+        ],
+        [(frame.merchants[code], merchant_totals[code], merchant_counts[code]) for code in top],
+        period,
+    )
+
+def compute_aggregates_from_transactions(transactions, period, top_merchants=10):
+    """Aggregates plus the daily expense profile for normalized transactions."""
+    frame = TransactionFrame.from_transactions(transactions)
+    data = compute_aggregates_from_frame(frame, period, top_merchants)
+    data['daily_expenses'] = daily_expense_profile(frame.daily_expenses())
+    return data
+
+def refresh_transaction_store(days):
+    """
+    Sync transaction_cache with Bunq for the last `days` (incremental when possible).
+    Needs no request context, so it can run from background threads.
+    Returns the number of transactions in the refreshed window.
+    """
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+    accounts = list_monetary_accounts()
+    own_account_ids = extract_own_account_ids(accounts)
+    own_ibans = extract_own_ibans(accounts)
+    all_transactions, _, sync_updates = fetch_transactions_for_accounts(
+        accounts,
+        cutoff_date,
+        own_account_ids,
+        own_ibans,
+    )
+    reconcile_internal_transfers(all_transactions, own_account_ids)
+    persist_synced_transactions(all_transactions, sync_updates)
+    # Not on a request path: write the queued rows now instead of at the next interval.
+    _TRANSACTION_CACHE_WRITER.flush()
+    return len(all_transactions)
+
+def trigger_background_transaction_refresh(days):
+    """Start one background Bunq refresh per process; returns False when one is already running."""
+    if not _BACKGROUND_REFRESH_LOCK.acquire(blocking=False):
+        return False
+
+    def _run():
+        try:
+            count = refresh_transaction_store(days)
+            logger.info(f"🔄 Background transaction refresh stored {count} transaction(s) ({days} days)")
+        except Exception as exc:
+            logger.warning(f"⚠️ Background transaction refresh failed: {exc}")
+        finally:
+            _BACKGROUND_REFRESH_LOCK.release()
+
+    threading.Thread(target=_run, name='bunq-background-refresh', daemon=True).start()
+    return True
 
 # ============================================
 # AUTHENTICATION ENDPOINTS
@@ -3838,6 +6477,43 @@ def _safe_ratio(numerator, denominator, default=None):
     except (TypeError, ValueError, ZeroDivisionError):
         return default
 
+# {source}: a rollup_window_source() subquery.
+_DATA_QUALITY_COUNTERS_SQL = """
+    SELECT
+        SUM(tx_count) AS total_transactions,
+        SUM(native_expense_count) AS expense_transactions,
+        SUM(native_income_count) AS income_transactions,
+        SUM(CASE WHEN is_internal_transfer = 1 THEN tx_count ELSE 0 END) AS internal_transactions,
+        COUNT(DISTINCT day) AS active_transaction_days,
+        SUM(native_expense_amount) AS expense_amount_total,
+        SUM(
+            CASE
+                WHEN LOWER(category) NOT IN ('overig', 'unknown', 'onbekend')
+                THEN native_expense_count
+                ELSE 0
+            END
+        ) AS categorized_expenses,
+        SUM(
+            CASE
+                WHEN LOWER(category) NOT IN ('overig', 'unknown', 'onbekend')
+                THEN native_expense_amount
+                ELSE 0
+            END
+        ) AS categorized_expense_amount,
+        SUM(CASE WHEN has_merchant = 1 THEN native_expense_count ELSE 0 END) AS merchant_named_expenses,
+        SUM(CASE WHEN has_merchant = 1 THEN native_expense_amount ELSE 0 END) AS merchant_named_expense_amount,
+        SUM(eur_known_count) AS amount_eur_known,
+        MAX(last_captured_at) AS latest_capture_at
+    FROM ({source})
+"""
+# First/last transaction in the window: one seek each on idx_transaction_cache_epoch.
+_DATA_QUALITY_BOUNDS_SQL = """
+    SELECT
+        (SELECT tx_date FROM transaction_cache WHERE tx_epoch >= ? ORDER BY tx_epoch LIMIT 1) AS earliest_transaction_at,
+        (SELECT tx_date FROM transaction_cache WHERE tx_epoch >= ? ORDER BY tx_epoch DESC LIMIT 1) AS latest_transaction_at,
+        (SELECT MAX(last_synced_at) FROM transaction_sync_state) AS latest_sync_at
+"""
+
 def build_data_quality_summary(days=90):
     """
     Build diagnostics summary for real-data quality in current dashboard runtime.
@@ -3901,64 +6577,12 @@ def build_data_quality_summary(days=90):
     cutoff_iso = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
 
     try:
-        tx_row = connection.execute(
-            """
-            SELECT
-                COUNT(*) AS total_transactions,
-                SUM(CASE WHEN amount < 0 THEN 1 ELSE 0 END) AS expense_transactions,
-                SUM(CASE WHEN amount > 0 THEN 1 ELSE 0 END) AS income_transactions,
-                SUM(CASE WHEN is_internal_transfer = 1 THEN 1 ELSE 0 END) AS internal_transactions,
-                COUNT(DISTINCT SUBSTR(tx_date, 1, 10)) AS active_transaction_days,
-                SUM(CASE WHEN amount < 0 THEN ABS(amount) ELSE 0 END) AS expense_amount_total,
-                SUM(
-                    CASE
-                        WHEN amount < 0
-                             AND category IS NOT NULL
-                             AND TRIM(category) != ''
-                             AND LOWER(TRIM(category)) NOT IN ('overig', 'unknown', 'onbekend')
-                        THEN 1
-                        ELSE 0
-                    END
-                ) AS categorized_expenses,
-                SUM(
-                    CASE
-                        WHEN amount < 0
-                             AND category IS NOT NULL
-                             AND TRIM(category) != ''
-                             AND LOWER(TRIM(category)) NOT IN ('overig', 'unknown', 'onbekend')
-                        THEN ABS(amount)
-                        ELSE 0
-                    END
-                ) AS categorized_expense_amount,
-                SUM(
-                    CASE
-                        WHEN amount < 0
-                             AND merchant IS NOT NULL
-                             AND TRIM(merchant) != ''
-                             AND LOWER(TRIM(merchant)) NOT IN ('unknown', 'onbekend')
-                        THEN 1
-                        ELSE 0
-                    END
-                ) AS merchant_named_expenses,
-                SUM(
-                    CASE
-                        WHEN amount < 0
-                             AND merchant IS NOT NULL
-                             AND TRIM(merchant) != ''
-                             AND LOWER(TRIM(merchant)) NOT IN ('unknown', 'onbekend')
-                        THEN ABS(amount)
-                        ELSE 0
-                    END
-                ) AS merchant_named_expense_amount,
-                SUM(CASE WHEN amount_eur IS NOT NULL THEN 1 ELSE 0 END) AS amount_eur_known,
-                MIN(tx_date) AS earliest_transaction_at,
-                MAX(tx_date) AS latest_transaction_at,
-                MAX(captured_at) AS latest_capture_at
-            FROM transaction_cache
-            WHERE tx_date >= ?
-            """,
-            (cutoff_iso,),
-        ).fetchone()
+        # Counters come from the daily rollup (plus raw rows of the partial cutoff
+        # day); first/last transaction time is an index lookup on tx_epoch.
+        source, params = rollup_window_source(cutoff_iso)
+        tx_row = connection.execute(_DATA_QUALITY_COUNTERS_SQL.format(source=source), params).fetchone()
+        cutoff_epoch = epoch_seconds(cutoff_iso)
+        bounds_row = connection.execute(_DATA_QUALITY_BOUNDS_SQL, (cutoff_epoch, cutoff_epoch)).fetchone()
 
         latest_snapshot_row = connection.execute(
             "SELECT MAX(snapshot_date) AS latest_snapshot_date FROM account_snapshots"
@@ -4013,12 +6637,12 @@ def build_data_quality_summary(days=90):
         merchant_named_expense_amount = float(tx_row['merchant_named_expense_amount'] or 0.0)
         amount_eur_known = int(tx_row['amount_eur_known'] or 0)
 
-        earliest_transaction_raw = tx_row['earliest_transaction_at']
+        earliest_transaction_raw = bounds_row['earliest_transaction_at']
         earliest_transaction_dt = parse_bunq_datetime(
             earliest_transaction_raw,
             context='transaction_cache.earliest_transaction_at'
         )
-        latest_transaction_raw = tx_row['latest_transaction_at']
+        latest_transaction_raw = bounds_row['latest_transaction_at']
         latest_transaction_dt = parse_bunq_datetime(
             latest_transaction_raw,
             context='transaction_cache.latest_transaction_at'
@@ -4031,7 +6655,11 @@ def build_data_quality_summary(days=90):
             )
 
         capture_freshness_hours = None
-        latest_capture_raw = tx_row['latest_capture_at']
+        # Unchanged rows are not rewritten on refresh; a committed sync counts as a capture too.
+        latest_capture_raw = max(
+            (value for value in (tx_row['latest_capture_at'], bounds_row['latest_sync_at']) if value),
+            default=None,
+        )
         latest_capture_dt = parse_bunq_datetime(latest_capture_raw, context='transaction_cache.latest_capture_at')
         if latest_capture_dt is not None:
             capture_freshness_hours = round(
@@ -4159,7 +6787,7 @@ def build_data_quality_summary(days=90):
         logger.warning(f"⚠️ Failed building data quality summary: {exc}")
         return summary
     finally:
-        connection.close()
+        release_data_db_connection(connection)
 
 # ============================================
 # CONFIGURATION
@@ -4338,7 +6966,9 @@ def ensure_bunq_session_active():
         api_context = BunqContext.api_context()
         if api_context is None:
             return False
-        session_was_reset = api_context.ensure_session_active()
+        # Serialize: concurrent fetch threads must not reset the session in parallel.
+        with _BUNQ_SESSION_LOCK:
+            session_was_reset = api_context.ensure_session_active()
         if session_was_reset:
             # Persist the newly obtained session token.
             try:
@@ -4366,6 +6996,147 @@ def ensure_bunq_context_for_api_requests():
         return
     ensure_bunq_initialized(force=False, refresh_key=False, run_auto_whitelist=False)
 
+@app.after_request
+def finalize_api_json_response(response):
+    """
+    Conditional GET and compression for successful JSON API GETs.
+
+    Endpoints with a cached payload digest set their own ETag (and answer 304
+    before building the body); other bodies are tagged by their content here.
+    Bodies from COMPRESS_MIN_BYTES up, and all streamed bodies, are compressed.
+    """
+    if (
+        request.method != 'GET'
+        or not request.path.startswith('/api/')
+        or response.status_code != 200
+        or response.mimetype != app.json.mimetype
+        or 'Content-Encoding' in response.headers
+    ):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    etag, _ = response.get_etag()
+    if etag is None and not response.is_streamed:
+        etag = response_etag(response.get_data())
+        response.set_etag(etag)
+    if etag is not None:
+        response.headers.setdefault('Cache-Control', 'private, no-cache')
+        not_modified = not_modified_response(etag)
+        if not_modified is not None:
+            return not_modified
+
+    encoding = negotiate_content_encoding()
+    if encoding and response.is_streamed:
+        response.response = compress_chunks(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+        response.headers['Content-Encoding'] = encoding
+    elif encoding and response.content_length is not None and response.content_length >= COMPRESS_MIN_BYTES:
+        response.set_data(b''.join(compress_chunks([response.get_data()], encoding)))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+# ============================================
+# STATIC ASSETS
+# ============================================
+
+# Fingerprinted copies (app.<hash>.js) are linked from index.html and never change.
+_STATIC_FINGERPRINTED_FILES = ('app.js', 'styles.css')
+_STATIC_MIMETYPES = {'.html': 'text/html', '.css': 'text/css', '.js': 'text/javascript'}
+_STATIC_IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+_STATIC_ASSETS_LOCK = threading.Lock()
+# (source mtimes, {url: asset}); replaced as a whole on reload.
+_STATIC_ASSETS = (None, {})
+
+def _static_file_mtimes():
+    mtimes = {}
+    for filename in sorted(STATIC_FILES):
+        try:
+            mtimes[filename] = os.stat(os.path.join(STATIC_DIR, filename)).st_mtime_ns
+        except OSError:
+            mtimes[filename] = None
+    return mtimes
+
+def _build_static_asset(body, filename, cache_control):
+    variants = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(body, quality=11)
+    return {
+        'body': body,
+        # Only keep variants that actually save bytes.
+        'variants': {encoding: data for encoding, data in variants.items() if len(data) < len(body)},
+        'etag': hashlib.sha256(body).hexdigest()[:16],
+        'mimetype': _STATIC_MIMETYPES.get(os.path.splitext(filename)[1], 'application/octet-stream'),
+        'cache_control': cache_control,
+    }
+
+def load_static_assets():
+    """
+    Read the dashboard's static files into memory with precompressed variants.
+
+    app.js and styles.css are published under their plain name and under a
+    content-hash name that index.html is rewritten to reference; only the
+    hashed names are cacheable as immutable, the rest revalidate via ETag.
+    """
+    global _STATIC_ASSETS
+    mtimes = _static_file_mtimes()
+    assets = {}
+    fingerprinted_urls = {}
+    for filename in _STATIC_FINGERPRINTED_FILES:
+        if filename not in STATIC_FILES or mtimes.get(filename) is None:
+            continue
+        with open(os.path.join(STATIC_DIR, filename), 'rb') as handle:
+            body = handle.read()
+        asset = _build_static_asset(body, filename, 'no-cache')
+        stem, extension = os.path.splitext(filename)
+        fingerprinted_url = f"{stem}.{hashlib.sha256(body).hexdigest()[:12]}{extension}"
+        assets[filename] = asset
+        assets[fingerprinted_url] = {**asset, 'cache_control': _STATIC_IMMUTABLE_CACHE_CONTROL}
+        fingerprinted_urls[filename] = fingerprinted_url
+
+    if mtimes.get('index.html') is not None:
+        with open(os.path.join(STATIC_DIR, 'index.html'), 'rb') as handle:
+            index_html = handle.read().decode('utf-8')
+        index_html = re.sub(
+            r'(\b(?:src|href)=")(' + '|'.join(re.escape(name) for name in fingerprinted_urls) + r')(")',
+            lambda match: match.group(1) + fingerprinted_urls[match.group(2)] + match.group(3),
+            index_html,
+        ) if fingerprinted_urls else index_html
+        assets['index.html'] = _build_static_asset(index_html.encode('utf-8'), 'index.html', 'no-cache')
+
+    _STATIC_ASSETS = (mtimes, assets)
+    logger.info(f"🗂️ Loaded static assets: {', '.join(sorted(fingerprinted_urls.values())) or 'none fingerprinted'}")
+    return assets
+
+def get_static_asset(url):
+    """Return the in-memory asset for `url`, reloading when a source file changed on disk."""
+    mtimes = _static_file_mtimes()
+    if _STATIC_ASSETS[0] != mtimes:
+        with _STATIC_ASSETS_LOCK:
+            if _STATIC_ASSETS[0] != mtimes:
+                load_static_assets()
+    return _STATIC_ASSETS[1].get(url)
+
+def static_asset_response(url):
+    """Serve one in-memory asset with its precompressed variant, ETag and cache policy."""
+    asset = get_static_asset(url)
+    if asset is None:
+        return abort(404)
+    encoding = negotiate_content_encoding()
+    if encoding not in asset['variants']:
+        encoding = None
+    etag = f"{asset['etag']}-{encoding}" if encoding else asset['etag']
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(asset['variants'][encoding] if encoding else asset['body'], mimetype=asset['mimetype'])
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = asset['cache_control']
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
 # ============================================
 # API ENDPOINTS (PROTECTED)
 # ============================================
@@ -4373,14 +7144,12 @@ def ensure_bunq_context_for_api_requests():
 @app.route('/', methods=['GET'])
 def serve_index():
     """Serve the dashboard frontend"""
-    return send_from_directory(STATIC_DIR, 'index.html')
+    return static_asset_response('index.html')
 
 @app.route('/<path:filename>', methods=['GET'])
 def serve_static(filename):
-    """Serve static assets for the dashboard"""
-    if filename in STATIC_FILES:
-        return send_from_directory(STATIC_DIR, filename)
-    return abort(404)
+    """Serve static assets for the dashboard (plain and fingerprinted names)"""
+    return static_asset_response(filename)
 
 @app.route('/api/live', methods=['GET'])
 def liveness_check():
@@ -4445,6 +7214,10 @@ def get_admin_status():
             'history_store_enabled': DATA_DB_ENABLED,
             'history_db_path': DATA_DB_PATH,
             'history_db_exists': db_exists,
+            'response_cache': get_response_cache_stats(),
+            'single_flight': _SINGLE_FLIGHT.stats(),
+            'scheduler': get_scheduler_status(),
+            'write_behind': get_write_behind_stats(),
             'session_cookie_secure': app.config['SESSION_COOKIE_SECURE'],
             'allowed_origins': ALLOWED_ORIGINS,
             'auto_set_bunq_whitelist_ip': AUTO_SET_BUNQ_WHITELIST_IP,
@@ -4669,24 +7442,203 @@ def run_admin_maintenance():
 
     return jsonify({
         'success': True,
-        'message': 'Admin maintenance completed',
-        'data': {
-            'steps': maintenance_steps,
-            'api_initialized': True,
-            'context_file': CONFIG_FILE,
-            'context_exists': os.path.exists(CONFIG_FILE),
-            'egress_ip': get_public_egress_ip(),
-            'resolved_target_ip': resolved_target_ip,
-            'whitelist': whitelist_result,
-            'options': {
-                'auto_target_ip': auto_target_ip,
-                'deactivate_others': deactivate_others,
-                'refresh_key': refresh_key,
-                'force_recreate': force_recreate,
-                'clear_runtime_cache': clear_runtime_cache
-            }
-        }
-    })
+        'message': 'Admin maintenance completed',
+        'data': {
+            'steps': maintenance_steps,
+            'api_initialized': True,
+            'context_file': CONFIG_FILE,
+            'context_exists': os.path.exists(CONFIG_FILE),
+            'egress_ip': get_public_egress_ip(),
+            'resolved_target_ip': resolved_target_ip,
+            'whitelist': whitelist_result,
+            'options': {
+                'auto_target_ip': auto_target_ip,
+                'deactivate_others': deactivate_others,
+                'refresh_key': refresh_key,
+                'force_recreate': force_recreate,
+                'clear_runtime_cache': clear_runtime_cache
+            }
+        }
+    })
+
+def _category_rules_unavailable():
+    return jsonify({
+        'success': False,
+        'error': 'Category rules need the historical data store (DATA_DB_ENABLED=true)'
+    }), 503
+
+def _category_rules_changed_response(payload, status_code=200, **data):
+    """Shared tail of rule edits: optional re-categorization, then the current rule list."""
+    recategorized = None
+    if parse_bool(payload.get('recategorize'), default=False):
+        recategorized = recategorize_transaction_cache()
+        cache.clear()
+    version, rules = list_category_rules()
+    return jsonify({
+        'success': True,
+        'data': {
+            **data,
+            'version': version,
+            'rules': rules,
+            'recategorized': recategorized,
+        }
+    }), status_code
+
+@app.route('/api/admin/category-rules', methods=['GET'])
+@requires_auth
+@rate_limit('general')
+def get_category_rules():
+    """List user-defined category rules in evaluation order."""
+    if not DATA_DB_ENABLED:
+        return _category_rules_unavailable()
+    version, rules = list_category_rules()
+    return jsonify({
+        'success': True,
+        'data': {
+            'version': version,
+            'rules': rules,
+            'fields': CATEGORY_RULE_FIELDS,
+            'amount_signs': CATEGORY_RULE_AMOUNT_SIGNS,
+        }
+    })
+
+@app.route('/api/admin/category-rules', methods=['POST'])
+@requires_auth
+@rate_limit('general')
+def create_category_rule():
+    """
+    Add a rule: pattern (substring, case-insensitive) in field, and/or mcc,
+    optional amount_sign, priority (higher first) -> category.
+    Pass recategorize=true to apply it to transaction_cache right away.
+    """
+    if not DATA_DB_ENABLED:
+        return _category_rules_unavailable()
+    payload = request.get_json(silent=True) or {}
+    rule, error = validate_category_rule(payload)
+    if error:
+        return jsonify({'success': False, 'error': error}), 400
+    rule_id = save_category_rule(rule)
+    return _category_rules_changed_response(payload, 201, rule_id=rule_id)
+
+@app.route('/api/admin/category-rules/<int:rule_id>', methods=['PUT'])
+@requires_auth
+@rate_limit('general')
+def update_category_rule(rule_id):
+    """Update fields of one rule (omitted fields keep their value)."""
+    if not DATA_DB_ENABLED:
+        return _category_rules_unavailable()
+    payload = request.get_json(silent=True) or {}
+    _, rules = list_category_rules()
+    existing = next((rule for rule in rules if rule['id'] == rule_id), None)
+    if existing is None:
+        return jsonify({'success': False, 'error': 'Category rule not found'}), 404
+    rule, error = validate_category_rule(payload, existing=existing)
+    if error:
+        return jsonify({'success': False, 'error': error}), 400
+    if save_category_rule(rule, rule_id=rule_id) is None:
+        return jsonify({'success': False, 'error': 'Category rule not found'}), 404
+    return _category_rules_changed_response(payload, rule_id=rule_id)
+
+@app.route('/api/admin/category-rules/<int:rule_id>', methods=['DELETE'])
+@requires_auth
+@rate_limit('general')
+def remove_category_rule(rule_id):
+    """Delete one rule (recategorize=true as query arg or JSON applies the change)."""
+    if not DATA_DB_ENABLED:
+        return _category_rules_unavailable()
+    payload = {**request.args, **(request.get_json(silent=True) or {})}
+    if not delete_category_rule(rule_id):
+        return jsonify({'success': False, 'error': 'Category rule not found'}), 404
+    return _category_rules_changed_response(payload, rule_id=rule_id)
+
+@app.route('/api/admin/category-rules/recategorize', methods=['POST'])
+@requires_auth
+@rate_limit('general')
+def run_recategorization():
+    """Re-categorize all stored transactions with the current rules (no Bunq download)."""
+    if not DATA_DB_ENABLED:
+        return _category_rules_unavailable()
+    return _category_rules_changed_response({'recategorize': True})
+
+def build_accounts_response(username=None):
+    """Fetch accounts from Bunq, convert balances to EUR and store a daily snapshot."""
+    logger.info(f"📊 Fetching accounts for {username}")
+    accounts = list_monetary_accounts()
+    # Derive type hints from the accounts we just fetched — no extra API calls needed.
+    account_type_hints = derive_account_type_hints_from_accounts(accounts)
+    
+    accounts_data = []
+    for account in accounts:
+        account_id = get_obj_field(account, 'id_', 'id')
+        balance_value, balance_currency = parse_monetary_value(
+            get_obj_field(account, 'balance'),
+            context=f"account {account_id} balance"
+        )
+        account_type = account_type_hints.get(str(account_id)) or classify_account_type(account)
+        monetary_account_type = (
+            get_obj_field(
+                account,
+                'sub_type',
+                'subtype',
+                'type_',
+                'type',
+                'monetary_account_type',
+                'account_type',
+                default=''
+            ) or ''
+        )
+        sub_status = get_obj_field(account, 'sub_status', 'substatus', default='') or ''
+        balance_eur_value = None
+        fx_rate_to_eur = None
+        fx_converted = False
+
+        # Prefer Bunq-provided converted balance when available.
+        converted_obj = get_obj_field(account, 'balance_converted')
+        if converted_obj is not None:
+            converted_value, converted_currency = parse_monetary_value(
+                converted_obj,
+                context=f"account {account_id} balance_converted"
+            )
+            if converted_currency.upper() == 'EUR':
+                balance_eur_value = converted_value
+                fx_converted = balance_currency.upper() != 'EUR'
+                if abs(balance_value) > 1e-9:
+                    fx_rate_to_eur = balance_eur_value / balance_value
+
+        if balance_eur_value is None:
+            balance_eur_value, fx_rate_to_eur, fx_converted = convert_amount_to_eur(
+                balance_value,
+                balance_currency,
+            )
+        accounts_data.append({
+            'id': account_id,
+            'description': get_obj_field(account, 'description', 'display_name') or f"Account {account_id}",
+            'ibans': sorted(extract_account_ibans(account)),
+            'balance': {
+                'value': balance_value,
+                'currency': balance_currency
+            },
+            'balance_eur': {
+                'value': balance_eur_value,
+                'currency': 'EUR'
+            },
+            'fx_rate_to_eur': fx_rate_to_eur,
+            'fx_converted': fx_converted,
+            'status': get_obj_field(account, 'status', 'status_') or 'UNKNOWN',
+            'sub_status': sub_status,
+            'monetary_account_type': monetary_account_type,
+            'account_type': account_type,
+            'account_class': get_obj_field(account, '_raw_type', default=account.__class__.__name__)
+        })
+    
+    logger.info(f"✅ Retrieved {len(accounts_data)} accounts")
+    persist_account_snapshots(accounts_data)
+    return {
+        'success': True,
+        'data': accounts_data,
+        'count': len(accounts_data),
+        'content_hash': payload_digest(accounts_data),
+    }
 
 @app.route('/api/accounts', methods=['GET'])
 @requires_auth
@@ -4708,92 +7660,23 @@ def get_accounts():
     
     try:
         cache_key = make_cache_key('accounts')
-        if cache_allowed():
-            cached = cache.get(cache_key)
-            if cached:
-                return jsonify(cached)
-        
-        logger.info(f"📊 Fetching accounts for {session.get('username')}")
-        accounts = list_monetary_accounts()
-        # Derive type hints from the accounts we just fetched — no extra API calls needed.
-        account_type_hints = derive_account_type_hints_from_accounts(accounts)
-        
-        accounts_data = []
-        for account in accounts:
-            account_id = get_obj_field(account, 'id_', 'id')
-            balance_value, balance_currency = parse_monetary_value(
-                get_obj_field(account, 'balance'),
-                context=f"account {account_id} balance"
-            )
-            account_type = account_type_hints.get(str(account_id)) or classify_account_type(account)
-            monetary_account_type = (
-                get_obj_field(
-                    account,
-                    'sub_type',
-                    'subtype',
-                    'type_',
-                    'type',
-                    'monetary_account_type',
-                    'account_type',
-                    default=''
-                ) or ''
-            )
-            sub_status = get_obj_field(account, 'sub_status', 'substatus', default='') or ''
-            balance_eur_value = None
-            fx_rate_to_eur = None
-            fx_converted = False
-
-            # Prefer Bunq-provided converted balance when available.
-            converted_obj = get_obj_field(account, 'balance_converted')
-            if converted_obj is not None:
-                converted_value, converted_currency = parse_monetary_value(
-                    converted_obj,
-                    context=f"account {account_id} balance_converted"
-                )
-                if converted_currency.upper() == 'EUR':
-                    balance_eur_value = converted_value
-                    fx_converted = balance_currency.upper() != 'EUR'
-                    if abs(balance_value) > 1e-9:
-                        fx_rate_to_eur = balance_eur_value / balance_value
-
-            if balance_eur_value is None:
-                balance_eur_value, fx_rate_to_eur, fx_converted = convert_amount_to_eur(
-                    balance_value,
-                    balance_currency,
-                )
-            accounts_data.append({
-                'id': account_id,
-                'description': get_obj_field(account, 'description', 'display_name') or f"Account {account_id}",
-                'ibans': sorted(extract_account_ibans(account)),
-                'balance': {
-                    'value': balance_value,
-                    'currency': balance_currency
-                },
-                'balance_eur': {
-                    'value': balance_eur_value,
-                    'currency': 'EUR'
-                },
-                'fx_rate_to_eur': fx_rate_to_eur,
-                'fx_converted': fx_converted,
-                'status': get_obj_field(account, 'status', 'status_') or 'UNKNOWN',
-                'sub_status': sub_status,
-                'monetary_account_type': monetary_account_type,
-                'account_type': account_type,
-                'account_class': get_obj_field(account, '_raw_type', default=account.__class__.__name__)
-            })
-        
-        logger.info(f"✅ Retrieved {len(accounts_data)} accounts")
-        persist_account_snapshots(accounts_data)
-        response = {
-            'success': True,
-            'data': accounts_data,
-            'count': len(accounts_data)
-        }
-        
-        if cache_allowed():
-            cache.set(cache_key, response, timeout=CACHE_TTL_SECONDS)
-        
-        return jsonify(response)
+        username = session.get('username')
+        response, data_age_seconds, is_stale = get_with_revalidate(
+            cache_key,
+            lambda: build_accounts_response(username),
+        )
+        # Data age/staleness are metadata, not payload: they do not change the tag.
+        etag = response_etag(response.get('content_hash') or payload_digest(response['data']))
+        not_modified = not_modified_response(etag)
+        if not_modified is not None:
+            return not_modified
+        result = jsonify({
+            **{key: value for key, value in response.items() if key != 'content_hash'},
+            'data_age_seconds': round(data_age_seconds, 1),
+            'stale': is_stale,
+        })
+        result.set_etag(etag)
+        return result
         
     except UnauthorizedException as e:
         # The Bunq session token has been rejected by the API.
@@ -4812,6 +7695,312 @@ def get_accounts():
             'error': str(e)
         }), 500
 
+def _transaction_snapshot_cache_key(snapshot_id):
+    return f"transactions_snapshot:{snapshot_id}"
+
+def _transaction_snapshot_rows_cache_key(snapshot_id, index):
+    return f"transactions_snapshot_rows:{snapshot_id}:{index}"
+
+# snapshot_id -> (memoized_at, snapshot), least recently used first. Snapshot ids
+# are derived from the content, so a memoized snapshot never goes stale.
+_TRANSACTION_SNAPSHOT_MEMO = OrderedDict()
+_TRANSACTION_SNAPSHOT_MEMO_LOCK = threading.Lock()
+
+def _memoize_transaction_snapshot(snapshot):
+    if TRANSACTION_SNAPSHOT_MEMO_ENTRIES <= 0:
+        return
+    with _TRANSACTION_SNAPSHOT_MEMO_LOCK:
+        _TRANSACTION_SNAPSHOT_MEMO[snapshot['snapshot_id']] = (time.time(), snapshot)
+        _TRANSACTION_SNAPSHOT_MEMO.move_to_end(snapshot['snapshot_id'])
+        while len(_TRANSACTION_SNAPSHOT_MEMO) > TRANSACTION_SNAPSHOT_MEMO_ENTRIES:
+            _TRANSACTION_SNAPSHOT_MEMO.popitem(last=False)
+
+def _memoized_transaction_snapshot(snapshot_id):
+    with _TRANSACTION_SNAPSHOT_MEMO_LOCK:
+        entry = _TRANSACTION_SNAPSHOT_MEMO.get(snapshot_id)
+        if entry is None:
+            return None
+        if time.time() - entry[0] > TRANSACTION_SNAPSHOT_TTL_SECONDS:
+            del _TRANSACTION_SNAPSHOT_MEMO[snapshot_id]
+            return None
+        _TRANSACTION_SNAPSHOT_MEMO.move_to_end(snapshot_id)
+        return entry[1]
+
+def cache_transaction_snapshot(snapshot):
+    """
+    Store a result set and return its id. The header (everything but the rows)
+    and the rows live under separate keys, so a conditional request can be
+    answered from the header alone; the rows are stored in slices of
+    TRANSACTION_SNAPSHOT_SLICE_ROWS so no cache entry grows with the window.
+    The header is only written once every slice is; this worker also keeps
+    the set in memory.
+    """
+    snapshot_id = snapshot['snapshot_id']
+    transactions = snapshot['transactions']
+    starts = range(0, len(transactions), TRANSACTION_SNAPSHOT_SLICE_ROWS)
+    stored = all(
+        cache.set(
+            _transaction_snapshot_rows_cache_key(snapshot_id, index),
+            transactions[start:start + TRANSACTION_SNAPSHOT_SLICE_ROWS],
+            timeout=TRANSACTION_SNAPSHOT_TTL_SECONDS,
+        )
+        for index, start in enumerate(starts)
+    )
+    if stored:
+        cache.set(
+            _transaction_snapshot_cache_key(snapshot_id),
+            {
+                **{key: value for key, value in snapshot.items() if key != 'transactions'},
+                'row_slices': len(starts),
+            },
+            timeout=TRANSACTION_SNAPSHOT_TTL_SECONDS,
+        )
+    _memoize_transaction_snapshot(snapshot)
+    return snapshot_id
+
+def transaction_snapshot_id(user, days, account_ids, exclude_internal, content_hash):
+    """
+    Snapshot id derived from the filter and the content: a rebuilt but identical
+    result set (no shared cache, another worker's per-process cache, an evicted
+    entry) keeps its id, so a pagination walk over it stays consistent.
+    """
+    payload = repr((user, days, list(account_ids) if account_ids else None, bool(exclude_internal), content_hash))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+def load_transaction_snapshot(snapshot_id, user, days, account_ids, exclude_internal, with_rows=True):
+    """
+    Return a stored transaction result set owned by `user` for exactly this
+    filter, or None. With with_rows=False a set that is not in this worker's
+    memory comes back as its header only; load_transaction_snapshot_rows()
+    completes it.
+    """
+    if not CACHE_ENABLED or not snapshot_id:
+        return None
+    snapshot = (
+        _memoized_transaction_snapshot(snapshot_id)
+        or cache.get(_transaction_snapshot_cache_key(snapshot_id))
+    )
+    if (
+        not snapshot
+        or snapshot.get('user') != user
+        or snapshot.get('days') != days
+        or snapshot.get('account_ids') != (list(account_ids) if account_ids else None)
+        or snapshot.get('exclude_internal') != bool(exclude_internal)
+    ):
+        return None
+    if with_rows:
+        return load_transaction_snapshot_rows(snapshot)
+    return snapshot
+
+def load_transaction_snapshot_rows(snapshot):
+    """Complete a snapshot header with its rows, or None when they were evicted."""
+    if 'transactions' in snapshot:
+        return snapshot
+    transactions = []
+    for index in range(snapshot.get('row_slices', 0)):
+        rows = cache.get(_transaction_snapshot_rows_cache_key(snapshot['snapshot_id'], index))
+        if rows is None:
+            return None
+        transactions.extend(rows)
+    snapshot = {**snapshot, 'transactions': transactions}
+    _memoize_transaction_snapshot(snapshot)
+    return snapshot
+
+def build_transaction_result_set(days, account_ids, exclude_internal, user):
+    """
+    Run the full Bunq fetch -> reconcile -> persist pipeline once and return a
+    materialized result set (sorted newest first) that pages can be sliced from.
+    """
+    logger.info(f"📊 Fetching transactions (last {days} days) for {user}")
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+
+    accounts = list_monetary_accounts()
+    accounts_by_id = {}
+    for acc in accounts:
+        acc_id = get_obj_field(acc, 'id_', 'id')
+        if acc_id is not None:
+            accounts_by_id[str(acc_id)] = acc
+    own_account_ids = extract_own_account_ids(accounts)
+    own_ibans = extract_own_ibans(accounts)
+
+    if account_ids:
+        selected_accounts = [accounts_by_id[acc_id] for acc_id in account_ids if acc_id in accounts_by_id]
+    else:
+        selected_accounts = accounts
+
+    all_transactions, truncated_accounts, sync_updates = fetch_transactions_for_accounts(
+        selected_accounts,
+        cutoff_date,
+        own_account_ids,
+        own_ibans,
+    )
+
+    reconciled_count = reconcile_internal_transfers(all_transactions, own_account_ids)
+    if reconciled_count > 0:
+        logger.info("🔁 Reconciled %d internal-transfer transaction(s) in cross-account pass", reconciled_count)
+
+    # Persist before the exclude_internal filter: the cache must stay complete for
+    # incremental sync, whatever filter the current caller uses.
+    persist_synced_transactions(all_transactions, sync_updates)
+
+    if exclude_internal:
+        all_transactions = [t for t in all_transactions if not t.get('is_internal_transfer')]
+
+    all_transactions.sort(key=lambda t: t['date'], reverse=True)
+    amount_eur_missing_count = sum(
+        1
+        for tx in all_transactions
+        if str(tx.get('currency') or 'EUR').upper() != 'EUR' and tx.get('amount_eur') is None
+    )
+
+    content_hash = transaction_set_digest(all_transactions, truncated_accounts, amount_eur_missing_count)
+    return {
+        'snapshot_id': transaction_snapshot_id(user, days, account_ids, exclude_internal, content_hash),
+        'user': user,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'days': days,
+        'account_ids': list(account_ids) if account_ids else None,
+        'exclude_internal': bool(exclude_internal),
+        'transactions': all_transactions,
+        'truncated_accounts': truncated_accounts,
+        'amount_eur_missing_count': amount_eur_missing_count,
+        'content_hash': content_hash,
+    }
+
+# (user, account_ids) -> when this process last recorded the filter for warming.
+_WARM_ACCOUNT_FILTERS_RECORDED = {}
+_WARM_ACCOUNT_FILTERS_LOCK = threading.Lock()
+
+def _warm_account_filters_key(user):
+    return f"warm_account_filters:{user}"
+
+def remember_warm_account_filter(user, account_ids):
+    """
+    Put an account filter at the front of `user`'s warm list (at most
+    SCHEDULER_WARM_ACCOUNT_FILTERS). The list lives in the response cache so the
+    worker holding the scheduler lease sees filters served by other workers; each
+    process rewrites it at most once per scheduler interval per filter.
+    """
+    if not account_ids or not SCHEDULER_ENABLED or not SCHEDULER_WARM_ACCOUNT_FILTERS or not CACHE_ENABLED:
+        return
+    now = time.time()
+    with _WARM_ACCOUNT_FILTERS_LOCK:
+        recorded_at = _WARM_ACCOUNT_FILTERS_RECORDED.get((user, account_ids))
+        if recorded_at is not None and now - recorded_at < SCHEDULER_INTERVAL_SECONDS:
+            return
+        _WARM_ACCOUNT_FILTERS_RECORDED[(user, account_ids)] = now
+    key = _warm_account_filters_key(user)
+    filters = [tuple(account_ids)] + [
+        tuple(existing) for existing in cache.get(key) or [] if tuple(existing) != tuple(account_ids)
+    ]
+    # A filter nobody asked for in a day drops out with the whole list.
+    cache.set(key, filters[:SCHEDULER_WARM_ACCOUNT_FILTERS], timeout=24 * 3600)
+
+def recent_warm_account_filters(user):
+    """Account filters remember_warm_account_filter recorded for `user`, most recent first."""
+    if not SCHEDULER_WARM_ACCOUNT_FILTERS or not CACHE_ENABLED:
+        return []
+    return [tuple(account_ids) for account_ids in cache.get(_warm_account_filters_key(user)) or []][
+        :SCHEDULER_WARM_ACCOUNT_FILTERS
+    ]
+
+def get_transaction_result_set(days, account_ids, exclude_internal, snapshot_id=None, with_rows=True):
+    """
+    Return (snapshot, is_stale) for (user, days, accounts, exclude_internal).
+
+    An explicit snapshot_id pins a pagination walk to one build (a rebuild with
+    the same content answers with the same id). Otherwise the latest snapshot
+    for the filter is served stale-while-revalidate: the cache entry only holds
+    the snapshot id, the snapshot itself lives under its own key. With
+    with_rows=False the snapshot may be a header only (see
+    load_transaction_snapshot); complete_transaction_result_set() adds the rows.
+    """
+    user = session.get('username', 'anon')
+    snapshot = load_transaction_snapshot(snapshot_id, user, days, account_ids, exclude_internal, with_rows)
+    if snapshot is not None:
+        return snapshot, False
+    remember_warm_account_filter(user, account_ids)
+    if not CACHE_ENABLED:
+        return build_transaction_result_set(days, account_ids, exclude_internal, user), False
+
+    result_set_key = make_result_set_key('transactions_result_set', days, account_ids, exclude_internal, user)
+
+    def _build_and_store():
+        return cache_transaction_snapshot(build_transaction_result_set(days, account_ids, exclude_internal, user))
+
+    # Overlapping page requests / tabs share one in-flight build.
+    latest_snapshot_id, _, is_stale = get_with_revalidate(result_set_key, _build_and_store)
+    snapshot = load_transaction_snapshot(latest_snapshot_id, user, days, account_ids, exclude_internal, with_rows)
+    if snapshot is None:
+        # Snapshot evicted before its pointer: rebuild on the request path.
+        latest_snapshot_id = _SINGLE_FLIGHT.do(result_set_key, _build_and_store)
+        _store_revalidated(result_set_key, latest_snapshot_id)
+        snapshot = load_transaction_snapshot(latest_snapshot_id, user, days, account_ids, exclude_internal)
+        is_stale = False
+    if snapshot is None:
+        # Response cache refused the write; still answer this request.
+        snapshot = build_transaction_result_set(days, account_ids, exclude_internal, user)
+    return snapshot, is_stale
+
+def complete_transaction_result_set(snapshot, days, account_ids, exclude_internal):
+    """
+    Rows for a result set from get_transaction_result_set(with_rows=False).
+    Rows evicted after their header was read are rebuilt like any other miss,
+    which may answer with a newer snapshot.
+    """
+    completed = load_transaction_snapshot_rows(snapshot)
+    if completed is not None:
+        return completed
+    return get_transaction_result_set(days, account_ids, exclude_internal)[0]
+
+def derive_transaction_result_set(snapshot, days):
+    """
+    Narrow a result set to the last `days` without another Bunq sweep.
+
+    An account truncated in the wider window only stays truncated when its oldest
+    fetched transaction is still newer than the narrower cutoff.
+    """
+    cutoff_iso = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    transactions = [tx for tx in snapshot['transactions'] if tx['date'] >= cutoff_iso]
+
+    oldest_by_account = {}
+    for tx in snapshot['transactions']:
+        account_key = str(tx.get('account_id'))
+        if account_key not in oldest_by_account or tx['date'] < oldest_by_account[account_key]:
+            oldest_by_account[account_key] = tx['date']
+    truncated_accounts = [
+        entry
+        for entry in snapshot.get('truncated_accounts') or []
+        if oldest_by_account.get(str(entry.get('account_id')), '') > cutoff_iso
+    ]
+
+    amount_eur_missing_count = sum(
+        1
+        for tx in transactions
+        if str(tx.get('currency') or 'EUR').upper() != 'EUR' and tx.get('amount_eur') is None
+    )
+    content_hash = transaction_set_digest(transactions, truncated_accounts, amount_eur_missing_count)
+    return {
+        **snapshot,
+        'snapshot_id': transaction_snapshot_id(
+            snapshot['user'], days, snapshot['account_ids'], snapshot['exclude_internal'], content_hash,
+        ),
+        'days': days,
+        'transactions': transactions,
+        'truncated_accounts': truncated_accounts,
+        'amount_eur_missing_count': amount_eur_missing_count,
+        'content_hash': content_hash,
+    }
+
+def slice_transaction_result_set(transactions, offset, limit, sort_desc):
+    """Slice one page from a newest-first result set without copying the full list."""
+    if sort_desc:
+        return transactions[offset:offset + limit]
+    total = len(transactions)
+    end = max(total - offset, 0)
+    start = max(end - limit, 0)
+    return transactions[start:end][::-1]
+
 @app.route('/api/transactions', methods=['GET'])
 @requires_auth
 @rate_limit('general')
@@ -4831,82 +8020,39 @@ def get_transactions():
             }), 503
     
     try:
-        account_id = request.args.get('account_id')
-        account_ids_param = request.args.get('account_ids')
+        account_ids = parse_account_filter()
         days = clamp_days(request.args.get('days', 90))
         limit, offset, page, sort = parse_pagination()
         sort_desc = sort == 'desc'
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
         exclude_internal = parse_bool(request.args.get('exclude_internal'), default=False)
-        
-        cache_key = make_cache_key('transactions')
-        if cache_allowed():
-            cached = cache.get(cache_key)
-            if cached:
-                return jsonify(cached)
-        
-        logger.info(f"📊 Fetching transactions (last {days} days) for {session.get('username')}")
-        
-        accounts = list_monetary_accounts()
-        accounts_by_id = {}
-        for acc in accounts:
-            acc_id = get_obj_field(acc, 'id_', 'id')
-            if acc_id is not None:
-                accounts_by_id[str(acc_id)] = acc
-        own_account_ids = extract_own_account_ids(accounts)
-        own_ibans = extract_own_ibans(accounts)
-        
-        target_ids = None
-        if account_id:
-            target_ids = [str(account_id)]
-        elif account_ids_param:
-            target_ids = [part.strip() for part in account_ids_param.split(',') if part.strip()]
-        
-        if target_ids:
-            selected_accounts = [accounts_by_id[acc_id] for acc_id in target_ids if acc_id in accounts_by_id]
-        else:
-            selected_accounts = accounts
-        
-        all_transactions = []
-        truncated_accounts = []
-        for account in selected_accounts:
-            account_id_value = get_obj_field(account, 'id_', 'id')
-            transactions, tx_meta = get_account_transactions(
-                account_id=account_id_value,
-                cutoff_date=cutoff_date,
-                sort_desc=sort_desc,
-                own_account_ids=own_account_ids,
-                own_ibans=own_ibans,
-                account_name=get_obj_field(account, 'description', 'display_name'),
-                return_meta=True
-            )
-            all_transactions.extend(transactions)
-            if tx_meta.get('truncated'):
-                truncated_accounts.append({
-                    'account_id': account_id_value,
-                    'account_name': get_obj_field(account, 'description', 'display_name') or f"Account {account_id_value}",
-                    'payment': tx_meta.get('payment'),
-                    'card_payment': tx_meta.get('card_payment'),
-                })
-
-        reconciled_count = reconcile_internal_transfers(all_transactions, own_account_ids)
-        if reconciled_count > 0:
-            logger.info("🔁 Reconciled %d internal-transfer transaction(s) in cross-account pass", reconciled_count)
-        
-        if exclude_internal:
-            all_transactions = [t for t in all_transactions if not t.get('is_internal_transfer')]
+        requested_snapshot_id = (request.args.get('snapshot_id') or '').strip() or None
+
+        snapshot, is_stale = get_transaction_result_set(
+            days,
+            account_ids,
+            exclude_internal,
+            snapshot_id=requested_snapshot_id,
+            with_rows=False,
+        )
+        # Tagged by content, not snapshot id: a rebuilt but identical set still
+        # answers the dashboard's auto-refresh with 304 (before any rows are loaded).
+        not_modified = not_modified_response(response_etag(snapshot.get('content_hash') or snapshot['snapshot_id']))
+        if not_modified is not None:
+            return not_modified
+        snapshot = complete_transaction_result_set(snapshot, days, account_ids, exclude_internal)
+        etag = response_etag(snapshot.get('content_hash') or snapshot['snapshot_id'])
+        snapshot_created_dt = parse_bunq_datetime(snapshot['created_at'], context='snapshot created_at')
+        data_age_seconds = (
+            max((datetime.now(timezone.utc) - snapshot_created_dt).total_seconds(), 0.0)
+            if snapshot_created_dt else None
+        )
 
-        persist_transactions(all_transactions)
-        all_transactions.sort(key=lambda t: t['date'], reverse=sort_desc)
+        all_transactions = snapshot['transactions']
+        truncated_accounts = snapshot['truncated_accounts']
         total_count = len(all_transactions)
-        amount_eur_missing_count = sum(
-            1
-            for tx in all_transactions
-            if str(tx.get('currency') or 'EUR').upper() != 'EUR' and tx.get('amount_eur') is None
-        )
-        paged = all_transactions[offset:offset + limit]
+        paged = slice_transaction_result_set(all_transactions, offset, limit, sort_desc)
         
-        logger.info(f"✅ Retrieved {total_count} transactions (page {page})")
+        logger.info(f"✅ Retrieved {total_count} transactions (page {page}, snapshot {snapshot['snapshot_id']})")
         response = {
             'success': True,
             'data': paged,
@@ -4914,15 +8060,21 @@ def get_transactions():
             'page': page,
             'page_size': limit,
             'sort': sort,
+            'snapshot_id': snapshot['snapshot_id'],
+            'snapshot_created_at': snapshot['created_at'],
+            'data_age_seconds': round(data_age_seconds, 1) if data_age_seconds is not None else None,
+            'stale': is_stale,
             'truncated': bool(truncated_accounts),
             'truncated_accounts': truncated_accounts,
-            'amount_eur_missing_count': amount_eur_missing_count,
+            'amount_eur_missing_count': snapshot['amount_eur_missing_count'],
         }
         
-        if cache_allowed():
-            cache.set(cache_key, response, timeout=CACHE_TTL_SECONDS)
-        
-        return jsonify(response)
+        if len(paged) >= STREAM_JSON_MIN_ROWS:
+            result = stream_json_response(response, 'data', paged)
+        else:
+            result = jsonify(response)
+        result.set_etag(etag)
+        return result
             
     except UnauthorizedException as e:
         logger.warning(f"⚠️ Bunq UnauthorizedException fetching transactions — resetting context: {e}")
@@ -4939,19 +8091,136 @@ def get_transactions():
             'error': str(e)
         }), 500
 
-def get_account_transactions(
-    account_id,
-    cutoff_date=None,
-    sort_desc=True,
-    own_account_ids=None,
-    own_ibans=None,
-    account_name=None,
-    return_meta=False
-):
-    """Get transactions for specific account."""
-    payments, payment_meta = list_payments_for_account(account_id, cutoff_date=cutoff_date, return_meta=True)
+def build_columnar_transactions(transactions):
+    """
+    Column-oriented form of a transaction list: one array per field, with the
+    low-cardinality text fields dictionary-encoded (value -> index into
+    `dictionaries[field]`, None stays None).
+    """
+    columns = {}
+    dictionaries = {}
+    for field in TRANSACTION_FIELDS:
+        values = [tx.get(field) for tx in transactions]
+        if field in _INTERNED_TRANSACTION_FIELDS:
+            index_by_value = {}
+            for value in values:
+                if value is not None and value not in index_by_value:
+                    index_by_value[value] = len(index_by_value)
+            dictionaries[field] = list(index_by_value)
+            values = [None if value is None else index_by_value[value] for value in values]
+        columns[field] = values
+    return {
+        'fields': list(TRANSACTION_FIELDS),
+        'columns': columns,
+        'dictionaries': dictionaries,
+    }
+
+@app.route('/api/transactions/export', methods=['GET'])
+@requires_auth
+@rate_limit('general')
+def export_transactions():
+    """
+    Whole filtered transaction set in one response - SESSION AUTH REQUIRED.
+
+    format=columnar (default): JSON with per-field arrays and dictionary-encoded
+    text columns. format=ndjson: a first line {"meta": {...}} followed by one
+    transaction object per line, streamed. Both are gzip/brotli compressed when
+    the client accepts it. Takes the same filters as /api/transactions.
+    """
+    global _BUNQ_CONTEXT_INITIALIZED
+    if not API_KEY:
+        return jsonify({
+            'success': False,
+            'error': 'Demo mode - configure API key'
+        }), 503
+    if not _BUNQ_CONTEXT_INITIALIZED:
+        if not ensure_bunq_initialized(force=True, refresh_key=True, run_auto_whitelist=False):
+            return jsonify({
+                'success': False,
+                'error': _BUNQ_INIT_LAST_ERROR or 'Bunq API context not initialized'
+            }), 503
+
+    export_format = (request.args.get('format') or 'columnar').strip().lower()
+    if export_format not in ('columnar', 'ndjson'):
+        return jsonify({
+            'success': False,
+            'error': 'format must be columnar or ndjson'
+        }), 400
+
+    try:
+        days = clamp_days(request.args.get('days', 90))
+        account_ids = parse_account_filter()
+        exclude_internal = parse_bool(request.args.get('exclude_internal'), default=False)
+        snapshot, is_stale = get_transaction_result_set(
+            days,
+            account_ids,
+            exclude_internal,
+            snapshot_id=(request.args.get('snapshot_id') or '').strip() or None,
+            with_rows=False,
+        )
+        not_modified = not_modified_response(
+            response_etag(export_format, snapshot.get('content_hash') or snapshot['snapshot_id'])
+        )
+        if not_modified is not None:
+            return not_modified
+        snapshot = complete_transaction_result_set(snapshot, days, account_ids, exclude_internal)
+        etag = response_etag(export_format, snapshot.get('content_hash') or snapshot['snapshot_id'])
+        snapshot_created_dt = parse_bunq_datetime(snapshot['created_at'], context='snapshot created_at')
+        data_age_seconds = (
+            max((datetime.now(timezone.utc) - snapshot_created_dt).total_seconds(), 0.0)
+            if snapshot_created_dt else None
+        )
+        transactions = snapshot['transactions']
+        meta = {
+            'success': True,
+            'format': export_format,
+            'count': len(transactions),
+            'days': snapshot['days'],
+            'snapshot_id': snapshot['snapshot_id'],
+            'snapshot_created_at': snapshot['created_at'],
+            'data_age_seconds': round(data_age_seconds, 1) if data_age_seconds is not None else None,
+            'stale': is_stale,
+            'truncated': bool(snapshot['truncated_accounts']),
+            'truncated_accounts': snapshot['truncated_accounts'],
+            'amount_eur_missing_count': snapshot['amount_eur_missing_count'],
+        }
+        logger.info(f"📦 Exporting {len(transactions)} transactions as {export_format} (snapshot {snapshot['snapshot_id']})")
+
+        def dumps(value):
+            return app.json.dumps(value, separators=(',', ':'))
+
+        if export_format == 'ndjson':
+            def ndjson_lines():
+                yield dumps({'meta': meta}) + '\n'
+                for start in range(0, len(transactions), 256):
+                    yield ''.join(dumps(tx) + '\n' for tx in transactions[start:start + 256])
+            result = encoded_response(ndjson_lines(), 'application/x-ndjson', streamed=True)
+        else:
+            result = encoded_response(
+                [dumps({**meta, **build_columnar_transactions(transactions)})],
+                app.json.mimetype,
+            )
+        result.set_etag(etag)
+        result.headers['Cache-Control'] = 'private, no-cache'
+        return result
+
+    except UnauthorizedException as e:
+        logger.warning(f"⚠️ Bunq UnauthorizedException exporting transactions — resetting context: {e}")
+        _BUNQ_CONTEXT_INITIALIZED = False
+        return jsonify({
+            'success': False,
+            'error': 'Bunq API session expired. Please retry — context will be re-initialized automatically.',
+            'bunq_unauthorized': True
+        }), 401
+    except Exception as e:
+        logger.exception(f"❌ Error exporting transactions: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
 
-    card_payments = []
+def fetch_account_card_payments(account_id, cutoff_date=None, stop_at_id=None):
+    """Fetch card payments for one account; never raises (endpoint is optional)."""
     card_meta = {
         'source': 'card_payment',
         'available': False,
@@ -4963,9 +8232,10 @@ def get_account_transactions(
         card_payments, raw_card_meta = list_card_payments_for_account(
             account_id,
             cutoff_date=cutoff_date,
-            return_meta=True
+            return_meta=True,
+            stop_at_id=stop_at_id
         )
-        card_meta = {
+        return card_payments, {
             **raw_card_meta,
             'available': True,
             'error': None,
@@ -4973,7 +8243,175 @@ def get_account_transactions(
     except Exception as exc:
         # Optional endpoint; keep core payment flow working even when unsupported.
         card_meta['error'] = str(exc)
+        return [], card_meta
+
+def fetch_account_payment_stream(account_id, source, cutoff_date):
+    """
+    Fetch one payment stream ('payment' or 'card_payment') of an account.
+
+    When the stored sync state already covers cutoff_date only payments newer than
+    its high-water mark are requested. Concurrent fetches of the same stream are
+    coalesced: the cutoff is floored to the minute (a superset; callers re-apply
+    their own cutoff) and used as single-flight key. Returns (payments, meta, sync_state).
+    """
+    cutoff_date = floor_sync_cutoff(cutoff_date)
+    flight_key = ('payment_stream', str(account_id), source, cutoff_date.isoformat() if cutoff_date else None)
+    payments, meta, state = _SINGLE_FLIGHT.do(
+        flight_key,
+        lambda: _fetch_account_payment_stream(account_id, source, cutoff_date),
+    )
+    # Callers annotate meta; never share the dict between coalesced requests.
+    return payments, dict(meta), state
+
+def _fetch_account_payment_stream(account_id, source, cutoff_date):
+    state = load_transaction_sync_state(account_id, source) if cutoff_date else None
+    stop_at_id = None
+    if (
+        state
+        and state.get('high_water_id') is not None
+        and state.get('synced_from')
+        and state['synced_from'] <= cutoff_date.isoformat()
+    ):
+        stop_at_id = int(state['high_water_id'])
+
+    if source == 'payment':
+        payments, meta = list_payments_for_account(
+            account_id,
+            cutoff_date=cutoff_date,
+            return_meta=True,
+            stop_at_id=stop_at_id
+        )
+    else:
+        payments, meta = fetch_account_card_payments(account_id, cutoff_date=cutoff_date, stop_at_id=stop_at_id)
+    meta = {**meta, 'sync_mode': 'incremental' if stop_at_id is not None else 'full'}
+    return payments, meta, state
+
+def fetch_transactions_for_accounts(accounts, cutoff_date, own_account_ids, own_ibans):
+    """
+    Fetch and normalize transactions for many accounts.
+
+    Payment and card-payment streams of every account are fetched concurrently on
+    the bounded Bunq fetch pool (all threads share one GET token bucket). Streams in
+    incremental sync mode are completed with older rows from transaction_cache.
+
+    Returns (transactions in account order, truncated_accounts metadata, sync_updates).
+    Pass sync_updates to persist_synced_transactions() together with the rows.
+    """
+    accounts = list(accounts or [])
+    if BUNQ_FETCH_WORKERS > 1 and accounts:
+        ensure_bunq_session_active()
+        executor = get_bunq_fetch_executor()
+        stream_futures = []
+        for account in accounts:
+            account_id_value = get_obj_field(account, 'id_', 'id')
+            stream_futures.append((
+                executor.submit(fetch_account_payment_stream, account_id_value, 'payment', cutoff_date),
+                executor.submit(fetch_account_payment_stream, account_id_value, 'card_payment', cutoff_date),
+            ))
+        streams = [
+            (payment_future.result(), card_future.result())
+            for payment_future, card_future in stream_futures
+        ]
+    else:
+        streams = []
+        for account in accounts:
+            account_id_value = get_obj_field(account, 'id_', 'id')
+            streams.append((
+                fetch_account_payment_stream(account_id_value, 'payment', cutoff_date),
+                fetch_account_payment_stream(account_id_value, 'card_payment', cutoff_date),
+            ))
+
+    all_transactions = []
+    truncated_accounts = []
+    sync_updates = []
+    for account, (payment_stream, card_stream) in zip(accounts, streams):
+        account_id_value = get_obj_field(account, 'id_', 'id')
+        account_name = get_obj_field(account, 'description', 'display_name')
+        payments, payment_meta, payment_state = payment_stream
+        card_payments, card_meta, card_state = card_stream
+        transactions, tx_meta = normalize_account_transactions(
+            account_id_value,
+            payments,
+            payment_meta,
+            card_payments,
+            card_meta,
+            cutoff_date=cutoff_date,
+            own_account_ids=own_account_ids,
+            own_ibans=own_ibans,
+            account_name=account_name,
+            return_meta=True,
+            resolve_fx=False
+        )
+
+        fresh_keys = {(str(tx.get('id')), tx.get('source')) for tx in transactions}
+        for source_name, raw_items, meta, state in (
+            ('payment', payments, payment_meta, payment_state),
+            ('card_payment', card_payments, card_meta, card_state),
+        ):
+            if meta.get('sync_mode') == 'incremental':
+                cached_rows = load_cached_account_transactions(account_id_value, source_name, cutoff_date, account_name)
+                cached_rows = [row for row in cached_rows if (str(row.get('id')), source_name) not in fresh_keys]
+                transactions.extend(cached_rows)
+                meta['cached_count'] = len(cached_rows)
+            update = plan_transaction_sync_update(account_id_value, source_name, raw_items, meta, state, cutoff_date)
+            if update:
+                sync_updates.append(update)
+
+        all_transactions.extend(transactions)
+        if tx_meta.get('truncated'):
+            truncated_accounts.append({
+                'account_id': account_id_value,
+                'account_name': account_name or f"Account {account_id_value}",
+                'payment': tx_meta.get('payment'),
+                'card_payment': tx_meta.get('card_payment'),
+            })
+    # One FX batch for all accounts: a (currency, day) pair is resolved once.
+    apply_fx_conversions(all_transactions)
+    return all_transactions, truncated_accounts, sync_updates
+
+def get_account_transactions(
+    account_id,
+    cutoff_date=None,
+    sort_desc=True,
+    own_account_ids=None,
+    own_ibans=None,
+    account_name=None,
+    return_meta=False
+):
+    """Get transactions for specific account."""
+    payments, payment_meta = list_payments_for_account(account_id, cutoff_date=cutoff_date, return_meta=True)
+    card_payments, card_meta = fetch_account_card_payments(account_id, cutoff_date=cutoff_date)
+    return normalize_account_transactions(
+        account_id,
+        payments,
+        payment_meta,
+        card_payments,
+        card_meta,
+        cutoff_date=cutoff_date,
+        own_account_ids=own_account_ids,
+        own_ibans=own_ibans,
+        account_name=account_name,
+        return_meta=return_meta
+    )
 
+def normalize_account_transactions(
+    account_id,
+    payments,
+    payment_meta,
+    card_payments,
+    card_meta,
+    cutoff_date=None,
+    own_account_ids=None,
+    own_ibans=None,
+    account_name=None,
+    return_meta=False,
+    resolve_fx=True
+):
+    """
+    Normalize raw payment + card-payment objects of one account into transaction dicts.
+    With resolve_fx=False foreign-currency rows keep amount_eur=None so the caller
+    can convert several accounts with one apply_fx_conversions() batch.
+    """
     entries = [('payment', item) for item in payments] + [('card_payment', item) for item in card_payments]
 
     transactions = []
@@ -5044,12 +8482,11 @@ def get_account_transactions(
             continue
         seen_transaction_keys.add(dedupe_key)
 
-        rate_date = created.date().isoformat()
-        amount_eur_value, fx_rate_to_eur, fx_converted = convert_amount_to_eur(
-            amount_value,
-            amount_currency,
-            rate_date=rate_date,
-        )
+        if not amount_currency or str(amount_currency).upper() == 'EUR':
+            amount_eur_value, fx_rate_to_eur, fx_converted = convert_amount_to_eur(amount_value, amount_currency)
+        else:
+            # Foreign currency: converted below in one batch for the whole account.
+            amount_eur_value, fx_rate_to_eur, fx_converted = None, None, False
         merchant_category_code = (
             extract_alias_merchant_category_code(counterparty_alias)
             or get_obj_field(payment, 'merchant_category_code', 'mcc')
@@ -5076,27 +8513,31 @@ def get_account_transactions(
                 'Onbekend'
             )
 
-        transactions.append({
-            'id': payment_id,
-            'date': created.isoformat(),
-            'amount': amount_value,
-            'currency': amount_currency,
-            'amount_eur': amount_eur_value,
-            'fx_rate_to_eur': fx_rate_to_eur,
-            'fx_converted': fx_converted,
-            'description': description,
-            'counterparty': counterparty_account_name or counterparty_name,
-            'counterparty_account_name': counterparty_account_name,
-            'counterparty_account_id': counterparty_account_id,
-            'counterparty_iban': next(iter(counterparty_account_ibans), None),
-            'merchant': merchant_label,
-            'category': category,
-            'type': get_obj_field(payment, 'type_', 'type'),
-            'source': source_name,
-            'account_id': account_id,
-            'account_name': account_name,
-            'is_internal_transfer': is_internal_transfer
-        })
+        transactions.append(CompactTransaction(
+            id=payment_id,
+            date=created.isoformat(),
+            amount=amount_value,
+            currency=amount_currency,
+            amount_eur=amount_eur_value,
+            fx_rate_to_eur=fx_rate_to_eur,
+            fx_converted=fx_converted,
+            description=description,
+            counterparty=counterparty_account_name or counterparty_name,
+            counterparty_account_name=counterparty_account_name,
+            counterparty_account_id=counterparty_account_id,
+            counterparty_iban=next(iter(counterparty_account_ibans), None),
+            merchant=merchant_label,
+            category=category,
+            merchant_category_code=str(merchant_category_code or '').strip(),
+            type=get_obj_field(payment, 'type_', 'type'),
+            source=source_name,
+            account_id=account_id,
+            account_name=account_name,
+            is_internal_transfer=is_internal_transfer
+        ))
+
+    if resolve_fx:
+        apply_fx_conversions(transactions)
 
     if return_meta:
         return transactions, {
@@ -5106,112 +8547,518 @@ def get_account_transactions(
         }
     return transactions
 
-def categorize_transaction(description, counterparty_name, is_internal=False, merchant_category_code=None, amount=None):
-    """Rule-based categorization with MCC fallback."""
-    if is_internal:
-        return 'Internal Transfer'
+# Category rules in precedence order: the first MCC set / keyword table that
+# matches wins. Keywords are substrings of "<description> <counterparty>" (lowercase).
+_CATEGORY_MCC_RULES = (
+    ('Boodschappen', {'5411', '5422', '5441', '5451', '5462', '5499'}),
+    ('Horeca', {'5812', '5813', '5814'}),
+    ('Vervoer', {'4111', '4121', '4789', '5541', '5542'}),
+    ('Utilities', {'4900', '4814'}),
+    ('Verzekering', {'5960', '5966', '6300'}),
+    ('Belastingen', {'9211', '9311', '9399'}),
+    ('Zorg', {'5912', '8011', '8021', '8099'}),
+    ('Entertainment', {'7832', '7922', '7997', '7999'}),
+    ('Abonnementen', {'4899', '5815', '5968', '5734'}),
+    ('Shopping', {'5311', '5331', '5399', '5651', '5732'}),
+)
 
-    desc_lower = description.lower() if description else ''
-    counter_lower = counterparty_name.lower() if counterparty_name else ''
-    combined = f"{desc_lower} {counter_lower}".strip()
-    try:
-        amount_value = 0.0 if amount is None else float(amount)
-    except (TypeError, ValueError):
-        amount_value = 0.0
+# Only consulted for incoming amounts, before the general keyword rules.
+_CATEGORY_INCOME_KEYWORD_RULES = (
+    ('Refund', ('refund', 'terugbetaling', 'chargeback', 'retour', 'reversal')),
+    ('Rente', ('rente', 'interest')),
+    ('Salaris', ('salaris', 'salary', 'loon', 'wage')),
+)
 
-    mcc = str(merchant_category_code or '').strip()
-    if mcc:
-        if mcc in {'5411', '5422', '5441', '5451', '5462', '5499'}:
-            return 'Boodschappen'
-        if mcc in {'5812', '5813', '5814'}:
-            return 'Horeca'
-        if mcc in {'4111', '4121', '4789', '5541', '5542'}:
-            return 'Vervoer'
-        if mcc in {'4900', '4814'}:
-            return 'Utilities'
-        if mcc in {'5960', '5966', '6300'}:
-            return 'Verzekering'
-        if mcc in {'9211', '9311', '9399'}:
-            return 'Belastingen'
-        if mcc in {'5912', '8011', '8021', '8099'}:
-            return 'Zorg'
-        if mcc in {'7832', '7922', '7997', '7999'}:
-            return 'Entertainment'
-        if mcc in {'4899', '5815', '5968', '5734'}:
-            return 'Abonnementen'
-        if mcc in {'5311', '5331', '5399', '5651', '5732'}:
-            return 'Shopping'
-
-    if amount_value > 0:
-        if any(word in combined for word in ['refund', 'terugbetaling', 'chargeback', 'retour', 'reversal']):
-            return 'Refund'
-        if any(word in combined for word in ['rente', 'interest']):
-            return 'Rente'
-        if any(word in combined for word in ['salaris', 'salary', 'loon', 'wage']):
-            return 'Salaris'
-
-    if any(word in combined for word in [
+_CATEGORY_KEYWORD_RULES = (
+    ('Boodschappen', (
         'albert heijn', ' ah ', 'jumbo', 'lidl', 'aldi', 'plus', 'dirk',
         'picnic', 'ekoplaza', 'spar ', 'coop', 'supermarkt', 'carrefour',
         'dekamarkt', 'hoogvliet', 'vomar', 'poiesz', 'jan linders', 'appie',
         'flink', 'gorillas', 'getir', 'hellofresh'
-    ]):
-        return 'Boodschappen'
-    elif any(word in combined for word in [
+    )),
+    ('Horeca', (
         'restaurant', 'cafe', 'bar', 'pizza', 'burger', 'starbucks',
         'thuisbezorgd', 'ubereats', 'deliveroo', 'mcdonald', 'kfc', 'subway'
-    ]):
-        return 'Horeca'
-    elif any(word in combined for word in [
+    )),
+    ('Vervoer', (
         'ns ', 'train', 'bus', 'taxi', 'uber', 'ov ', 'parking',
         'q-park', 'shell', 'texaco', 'esso', 'total', 'benzine',
         'bp ', 'tinq', 'avia', 'ok tank', 'yellowbrick', 'anwb',
         'ov-chip', 'ovchip', 'arriva', 'connexxion', 'ret ', 'gvb', 'qbuzz'
-    ]):
-        return 'Vervoer'
-    elif any(word in combined for word in ['huur', 'rent', 'hypotheek', 'mortgage', 'vve']):
-        return 'Wonen'
-    elif any(word in combined for word in [
+    )),
+    ('Wonen', ('huur', 'rent', 'hypotheek', 'mortgage', 'vve')),
+    ('Verzekering', (
         'verzekering', 'insur', 'aegon', 'allianz', 'ohra', 'unive',
         'zilveren kruis', 'interpolis', 'vgz', 'cz ', 'menzis', 'fbto', 'asr '
-    ]):
-        return 'Verzekering'
-    elif any(word in combined for word in [
+    )),
+    ('Belastingen', (
         'belasting', 'belastingdienst', 'tax', 'gemeente', 'waterschap',
         'cjib', 'rdw', 'duo '
-    ]):
-        return 'Belastingen'
-    elif any(word in combined for word in [
+    )),
+    ('Utilities', (
         'eneco', 'essent', 'energie', 'gas', 'water', 'ziggo', 'kpn', 'telecom',
         'odido', 'vodafone', 't-mobile', 'tele2', 'youfone', 'hollandsnieuwe',
         'delta fiber', 'caiway', 'budget energie', 'greenchoice', 'enexis', 'liander',
         'stedin', 'waternet', 'vitens'
-    ]):
-        return 'Utilities'
-    elif any(word in combined for word in [
+    )),
+    ('Abonnementen', (
         'netflix', 'spotify', 'disney+', 'videoland', 'amazon prime', 'youtube premium',
         'adobe', 'microsoft 365', 'office 365', 'icloud', 'google one'
-    ]):
-        return 'Abonnementen'
-    elif any(word in combined for word in [
+    )),
+    ('Shopping', (
         'bol.com', 'coolblue', 'mediamarkt', 'amazon', 'zara', 'h&m', 'shop',
         'hema', 'action', 'ikea', 'primark', 'kruidvat', 'etos', 'zalando'
-    ]):
-        return 'Shopping'
-    elif any(word in combined for word in [
+    )),
+    ('Entertainment', (
         'youtube', 'cinema', 'pathé', 'concert', 'steam',
         'nintendo', 'playstation', 'xbox'
-    ]):
-        return 'Entertainment'
-    elif any(word in combined for word in [
+    )),
+    ('Zorg', (
         'apotheek', 'pharmacy', 'dokter', 'doctor', 'tandarts', 'dentist',
         'huisarts', 'ziekenhuis', 'hospital', 'zorgverzekeraar'
-    ]):
-        return 'Zorg'
-    elif any(word in combined for word in ['salaris', 'salary', 'loon', 'wage']):
-        return 'Salaris'
-    else:
-        return 'Overig'
+    )),
+    ('Salaris', ('salaris', 'salary', 'loon', 'wage')),
+)
+
+def build_keyword_trie_pattern(keywords):
+    """
+    Regex alternation of literal keywords, folded into a trie so a position is
+    rejected or followed on its first character instead of testing every keyword.
+    Greedy: at one position the deepest (longest) keyword matches.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def render(node):
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # A keyword ends here: longer keywords are optional.
+        return f"(?:{body})?" if '' in node else body
+
+    return render(trie)
+
+class KeywordCategoryMatcher:
+    """
+    All keyword rules of one table compiled into a single trie regex.
+
+    The pattern sits in a lookahead: matches never consume text and overlapping
+    keywords are all seen. At one position the deepest keyword wins and every
+    shorter keyword matching there is its prefix, so each keyword carries the best
+    rule rank of itself and its keyword prefixes. The lowest rank over all
+    positions is the answer, exactly like testing each rule's keywords in turn.
+    """
+
+    def __init__(self, rules):
+        self.categories = [category for category, _ in rules]
+        rank_by_keyword = {}
+        for rank, (_, keywords) in enumerate(rules):
+            for keyword in keywords:
+                rank_by_keyword.setdefault(keyword, rank)
+        self.keyword_rank = {
+            keyword: min(
+                other_rank
+                for other, other_rank in rank_by_keyword.items()
+                if keyword.startswith(other)
+            )
+            for keyword in rank_by_keyword
+        }
+        self.pattern = re.compile(f"(?=({build_keyword_trie_pattern(rank_by_keyword)}))")
+
+    def match(self, text):
+        best_rank = None
+        for found in self.pattern.finditer(text):
+            rank = self.keyword_rank[found.group(1)]
+            if best_rank is None or rank < best_rank:
+                best_rank = rank
+                if rank == 0:
+                    break
+        return None if best_rank is None else self.categories[best_rank]
+
+# Built in reverse so an MCC listed twice keeps its first (highest-precedence) rule.
+_CATEGORY_BY_MCC = {
+    code: category
+    for category, codes in reversed(_CATEGORY_MCC_RULES)
+    for code in codes
+}
+_INCOME_KEYWORD_MATCHER = KeywordCategoryMatcher(_CATEGORY_INCOME_KEYWORD_RULES)
+_KEYWORD_MATCHER = KeywordCategoryMatcher(_CATEGORY_KEYWORD_RULES)
+
+def categorize_transaction(description, counterparty_name, is_internal=False, merchant_category_code=None, amount=None):
+    """Rule-based categorization with MCC fallback."""
+    if is_internal:
+        return 'Internal Transfer'
+    try:
+        is_income = (0.0 if amount is None else float(amount)) > 0
+    except (TypeError, ValueError):
+        is_income = False
+    mcc = str(merchant_category_code or '').strip()
+    return _categorize_memoized(
+        description or '',
+        counterparty_name or '',
+        mcc,
+        is_income,
+        get_category_rule_matcher(),
+    )
+
+@lru_cache(maxsize=65536)
+def _categorize_memoized(description, counterparty_name, mcc, is_income, rule_matcher):
+    # Recurring payments repeat the same (text, mcc, sign) over and over; the
+    # matcher is part of the key, so a rules reload never serves old results.
+    if rule_matcher is not None:
+        category = rule_matcher.match(description, counterparty_name, mcc, is_income)
+        if category:
+            return category
+
+    if mcc:
+        category = _CATEGORY_BY_MCC.get(mcc)
+        if category:
+            return category
+
+    combined = f"{description.lower()} {counterparty_name.lower()}".strip()
+    if is_income:
+        category = _INCOME_KEYWORD_MATCHER.match(combined)
+        if category:
+            return category
+    return _KEYWORD_MATCHER.match(combined) or 'Overig'
+
+# ============================================
+# USER-DEFINED CATEGORY RULES
+# ============================================
+
+CATEGORY_RULE_FIELDS = ('any', 'description', 'counterparty')
+CATEGORY_RULE_AMOUNT_SIGNS = ('any', 'in', 'out')
+_CATEGORY_RULES_LOCK = threading.Lock()
+_CATEGORY_RULES_STATE = {'version': None, 'matcher': None, 'checked_at': 0.0}
+
+class CategoryRuleMatcher:
+    """
+    Compiled user rules, evaluated before the built-in tables.
+
+    Rules are ordered by priority (high first, then oldest first); the first rule
+    whose conditions all hold wins. All patterns are found with one trie regex
+    pass per field, so the per-rule checks are set lookups.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        patterns = {rule['pattern'] for rule in rules if rule['pattern']}
+        self.pattern = (
+            re.compile(f"(?=({build_keyword_trie_pattern(patterns)}))")
+            if patterns else None
+        )
+        # The regex reports the longest pattern at a position; shorter ones there are its prefixes.
+        self.prefixes = {
+            pattern: frozenset(other for other in patterns if pattern.startswith(other))
+            for pattern in patterns
+        }
+
+    def _patterns_in(self, text):
+        found = set()
+        if self.pattern is not None and text:
+            for match in self.pattern.finditer(text.lower()):
+                found.update(self.prefixes[match.group(1)])
+        return found
+
+    def match(self, description, counterparty_name, mcc, is_income):
+        """mcc=None means unknown: rules with an MCC condition are skipped."""
+        in_description = self._patterns_in(description)
+        in_counterparty = self._patterns_in(counterparty_name)
+        for rule in self.rules:
+            if rule['mcc'] and rule['mcc'] != mcc:
+                continue
+            if rule['amount_sign'] == 'in' and not is_income:
+                continue
+            if rule['amount_sign'] == 'out' and is_income:
+                continue
+            pattern = rule['pattern']
+            if pattern:
+                if rule['field'] == 'description':
+                    matched = pattern in in_description
+                elif rule['field'] == 'counterparty':
+                    matched = pattern in in_counterparty
+                else:
+                    matched = pattern in in_description or pattern in in_counterparty
+                if not matched:
+                    continue
+            return rule['category']
+        return None
+
+def _category_rule_from_row(row):
+    return {
+        'id': row['id'],
+        'pattern': row['pattern'],
+        'field': row['field'],
+        'mcc': row['mcc'],
+        'amount_sign': row['amount_sign'],
+        'priority': row['priority'],
+        'category': row['category'],
+        'enabled': bool(row['enabled']),
+        'created_at': row['created_at'],
+        'updated_at': row['updated_at'],
+    }
+
+def _read_category_rules_version(connection):
+    row = connection.execute("SELECT version FROM category_rules_state WHERE id = 1").fetchone()
+    return row['version'] if row else 0
+
+def list_category_rules(connection=None):
+    """Return (version, rules) with rules in evaluation order."""
+    owns_connection = connection is None
+    if owns_connection:
+        connection = get_data_db_connection()
+    if connection is None:
+        return 0, []
+    try:
+        rows = connection.execute("""
+            SELECT id, pattern, field, mcc, amount_sign, priority, category, enabled, created_at, updated_at
+            FROM category_rules
+            ORDER BY priority DESC, id ASC
+        """).fetchall()
+        return _read_category_rules_version(connection), [_category_rule_from_row(row) for row in rows]
+    finally:
+        if owns_connection:
+            release_data_db_connection(connection)
+
+def get_category_rule_matcher():
+    """
+    Return the compiled matcher for the current rules version (None without rules).
+    Another worker's edits are noticed within CATEGORY_RULES_RELOAD_SECONDS; the
+    rules are only reloaded and recompiled when the version counter moved.
+    """
+    if not DATA_DB_ENABLED:
+        return None
+    now = time.time()
+    if now - _CATEGORY_RULES_STATE['checked_at'] < CATEGORY_RULES_RELOAD_SECONDS:
+        return _CATEGORY_RULES_STATE['matcher']
+    with _CATEGORY_RULES_LOCK:
+        if now - _CATEGORY_RULES_STATE['checked_at'] < CATEGORY_RULES_RELOAD_SECONDS:
+            return _CATEGORY_RULES_STATE['matcher']
+        connection = get_data_db_connection()
+        try:
+            version = _read_category_rules_version(connection)
+            if version != _CATEGORY_RULES_STATE['version']:
+                _, rules = list_category_rules(connection)
+                enabled_rules = [rule for rule in rules if rule['enabled']]
+                _CATEGORY_RULES_STATE['matcher'] = CategoryRuleMatcher(enabled_rules) if enabled_rules else None
+                _CATEGORY_RULES_STATE['version'] = version
+                _categorize_memoized.cache_clear()
+                logger.info(f"🏷️ Loaded {len(enabled_rules)} category rule(s) (version {version})")
+        except Exception as exc:
+            logger.warning(f"⚠️ Failed loading category rules: {exc}")
+        finally:
+            release_data_db_connection(connection)
+        _CATEGORY_RULES_STATE['checked_at'] = now
+        return _CATEGORY_RULES_STATE['matcher']
+
+def invalidate_category_rule_matcher():
+    """Force the next categorization to re-check the rules version."""
+    _CATEGORY_RULES_STATE['checked_at'] = 0.0
+
+def validate_category_rule(payload, existing=None):
+    """Return (rule fields, error message) for a create/update payload."""
+    rule = dict(existing or {'field': 'any', 'amount_sign': 'any', 'priority': 100, 'enabled': True})
+    for key in ('pattern', 'field', 'mcc', 'amount_sign', 'priority', 'category', 'enabled'):
+        if key in payload:
+            rule[key] = payload[key]
+
+    pattern = str(rule.get('pattern') or '').strip().lower()
+    mcc = str(rule.get('mcc') or '').strip()
+    category = str(rule.get('category') or '').strip()
+    field = str(rule.get('field') or 'any').strip().lower()
+    amount_sign = str(rule.get('amount_sign') or 'any').strip().lower()
+    if not category:
+        return None, 'category is required'
+    if not pattern and not mcc:
+        return None, 'pattern or mcc is required'
+    if field not in CATEGORY_RULE_FIELDS:
+        return None, f"field must be one of {', '.join(CATEGORY_RULE_FIELDS)}"
+    if amount_sign not in CATEGORY_RULE_AMOUNT_SIGNS:
+        return None, f"amount_sign must be one of {', '.join(CATEGORY_RULE_AMOUNT_SIGNS)}"
+    if mcc and not mcc.isdigit():
+        return None, 'mcc must be numeric'
+    try:
+        priority = int(rule.get('priority', 100))
+    except (TypeError, ValueError):
+        return None, 'priority must be an integer'
+    return {
+        'pattern': pattern or None,
+        'field': field,
+        'mcc': mcc or None,
+        'amount_sign': amount_sign,
+        'priority': priority,
+        'category': category[:64],
+        'enabled': parse_bool(rule.get('enabled'), default=True),
+    }, None
+
+def _bump_category_rules_version(connection):
+    connection.execute("UPDATE category_rules_state SET version = version + 1 WHERE id = 1")
+
+def save_category_rule(rule, rule_id=None):
+    """Insert (rule_id=None) or update a rule and bump the rules version; returns the rule id or None."""
+    connection = get_data_db_connection()
+    now_iso = datetime.now(timezone.utc).isoformat()
+    values = (
+        rule['pattern'], rule['field'], rule['mcc'], rule['amount_sign'],
+        rule['priority'], rule['category'], 1 if rule['enabled'] else 0, now_iso,
+    )
+    try:
+        with connection:
+            if rule_id is None:
+                cursor = connection.execute("""
+                    INSERT INTO category_rules (
+                        pattern, field, mcc, amount_sign, priority, category, enabled, updated_at, created_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (*values, now_iso))
+                rule_id = cursor.lastrowid
+            else:
+                cursor = connection.execute("""
+                    UPDATE category_rules
+                    SET pattern = ?, field = ?, mcc = ?, amount_sign = ?, priority = ?,
+                        category = ?, enabled = ?, updated_at = ?
+                    WHERE id = ?
+                """, (*values, rule_id))
+                if cursor.rowcount == 0:
+                    return None
+            _bump_category_rules_version(connection)
+    finally:
+        release_data_db_connection(connection)
+    invalidate_category_rule_matcher()
+    return rule_id
+
+def delete_category_rule(rule_id):
+    connection = get_data_db_connection()
+    try:
+        with connection:
+            cursor = connection.execute("DELETE FROM category_rules WHERE id = ?", (rule_id,))
+            if cursor.rowcount == 0:
+                return False
+            _bump_category_rules_version(connection)
+    finally:
+        release_data_db_connection(connection)
+    invalidate_category_rule_matcher()
+    return True
+
+def recategorize_transaction_cache(batch_size=1000):
+    """
+    Re-run categorization over transaction_cache in place (no Bunq download).
+
+    Every row goes through categorize_transaction like a live fetch (user rules
+    first, then MCC and keyword tables; rows captured before MCCs were stored
+    match as if Bunq sent none). Rows are read in tx_key order and changed rows
+    are written back with one executemany UPDATE per batch, together with the
+    content_hash a refresh of the same row would compute, so the no-op check
+    keeps working.
+    """
+    invalidate_category_rule_matcher()
+    counts = {'scanned': 0, 'updated': 0, 'without_mcc': 0}
+    connection = get_data_db_connection()
+    if connection is None:
+        return counts
+    last_key = -(1 << 63)
+    fingerprints = {}
+    try:
+        while True:
+            rows = connection.execute("""
+                SELECT tx_key, tx_id, account_id, account_name, tx_date, amount, currency, amount_eur,
+                       fx_rate_to_eur, description, counterparty, counterparty_account_name,
+                       counterparty_account_id, counterparty_iban, merchant, category,
+                       merchant_category_code, tx_type, source, is_internal_transfer, content_hash
+                FROM transaction_cache
+                WHERE tx_key > ?
+                ORDER BY tx_key
+                LIMIT ?
+            """, (last_key, batch_size)).fetchall()
+            if not rows:
+                break
+            last_key = rows[-1]['tx_key']
+            updates = []
+            for row in rows:
+                if row['merchant_category_code'] is None:
+                    counts['without_mcc'] += 1
+                transaction = _transaction_from_cache_row(row, row['account_id'], None)
+                category = categorize_transaction(
+                    transaction['description'],
+                    transaction['counterparty'],
+                    transaction['is_internal_transfer'],
+                    merchant_category_code=transaction['merchant_category_code'],
+                    amount=transaction['amount'],
+                )
+                if category == row['category']:
+                    continue
+                transaction['category'] = category
+                fingerprint = None
+                if row['content_hash'] is not None:
+                    # NULL stays NULL: the row still waits for an EUR amount.
+                    content = (row['tx_key'],) + _transaction_cache_content(transaction)[1:]
+                    fingerprint = transaction_content_fingerprint(content)
+                    fingerprints[row['tx_key']] = fingerprint
+                updates.append((category, fingerprint, row['tx_key']))
+            if updates:
+                with connection:
+                    connection.executemany(
+                        "UPDATE transaction_cache SET category = ?, content_hash = ? WHERE tx_key = ?",
+                        updates,
+                    )
+            counts['scanned'] += len(rows)
+            counts['updated'] += len(updates)
+    finally:
+        release_data_db_connection(connection)
+    _TRANSACTION_CACHE_FINGERPRINTS.update(fingerprints)
+    logger.info(
+        f"🏷️ Re-categorized transaction_cache: {counts['updated']} of {counts['scanned']} row(s) changed"
+    )
+    return counts
+
+def build_live_statistics_response(days, exclude_internal=False):
+    """Compute /api/statistics from a live Bunq fetch (also refreshes the history store)."""
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+    accounts = list_monetary_accounts()
+    own_account_ids = extract_own_account_ids(accounts)
+    own_ibans = extract_own_ibans(accounts)
+    all_transactions, _, sync_updates = fetch_transactions_for_accounts(
+        accounts,
+        cutoff_date,
+        own_account_ids,
+        own_ibans,
+    )
+
+    reconciled_count = reconcile_internal_transfers(all_transactions, own_account_ids)
+    if reconciled_count > 0:
+        logger.info("🔁 Reconciled %d internal-transfer transaction(s) for statistics", reconciled_count)
+
+    persist_synced_transactions(all_transactions, sync_updates)
+    
+    if exclude_internal:
+        all_transactions = [t for t in all_transactions if not t.get('is_internal_transfer')]
+
+    # EUR-normalized amounts; non-EUR rows without a conversion count as 0.
+    frame = TransactionFrame.from_transactions(all_transactions)
+    income, expenses, _ = frame.totals()
+    net_savings = income - expenses
+    savings_rate = (net_savings / income * 100) if income > 0 else 0
+    category_totals = frame.expense_by_category()
+
+    return {
+        'success': True,
+        'data': {
+            'period_days': days,
+            'total_transactions': len(all_transactions),
+            'income': income,
+            'expenses': expenses,
+            'net_savings': net_savings,
+            'savings_rate': savings_rate,
+            'categories': category_totals,
+            'avg_daily_expenses': expenses / days if days > 0 else 0,
+            'data_source': 'bunq',
+            'last_synced_at': datetime.now(timezone.utc).isoformat(),
+        }
+    }
 
 @app.route('/api/statistics', methods=['GET'])
 @requires_auth
@@ -5232,7 +9079,6 @@ def get_statistics():
         
     try:
         days = clamp_days(request.args.get('days', 90))
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
         exclude_internal = parse_bool(request.args.get('exclude_internal'), default=False)
         
         cache_key = make_cache_key('statistics')
@@ -5240,84 +9086,142 @@ def get_statistics():
             cached = cache.get(cache_key)
             if cached:
                 return jsonify(cached)
-        
-        accounts = list_monetary_accounts()
-        own_account_ids = extract_own_account_ids(accounts)
-        own_ibans = extract_own_ibans(accounts)
-        all_transactions = []
-        
-        for account in accounts:
-            account_id_value = get_obj_field(account, 'id_', 'id')
-            transactions = get_account_transactions(
-                account_id=account_id_value,
-                cutoff_date=cutoff_date,
-                sort_desc=True,
-                own_account_ids=own_account_ids,
-                own_ibans=own_ibans,
-                account_name=get_obj_field(account, 'description', 'display_name')
-            )
-            all_transactions.extend(transactions)
 
-        reconciled_count = reconcile_internal_transfers(all_transactions, own_account_ids)
-        if reconciled_count > 0:
-            logger.info("🔁 Reconciled %d internal-transfer transaction(s) for statistics", reconciled_count)
-        
-        if exclude_internal:
-            all_transactions = [t for t in all_transactions if not t.get('is_internal_transfer')]
+        # Fast path: aggregate in SQLite and let Bunq refresh in the background.
+        if cache_allowed():
+            store_data, freshness = compute_statistics_from_store(days, exclude_internal=exclude_internal)
+            if store_data is not None:
+                if freshness['age_seconds'] > CACHE_TTL_SECONDS:
+                    trigger_background_transaction_refresh(days)
+                response = {
+                    'success': True,
+                    'data': {
+                        **store_data,
+                        'data_source': 'history_store',
+                        'last_synced_at': freshness['last_synced_at'],
+                    }
+                }
+                cache.set(cache_key, response, timeout=CACHE_TTL_SECONDS)
+                return jsonify(response)
 
-        def tx_amount_for_stats(tx):
-            """
-            Prefer EUR-normalized amount for aggregate stats.
-            Fall back to native amount only when currency is EUR.
-            """
-            amount_eur = tx.get('amount_eur')
-            if amount_eur is not None:
-                return safe_float(amount_eur, default=0.0, context='statistics amount_eur')
-
-            native_amount = safe_float(tx.get('amount'), default=0.0, context='statistics amount')
-            currency = (tx.get('currency') or 'EUR').upper()
-            if currency != 'EUR':
-                return 0.0
-            return native_amount
-
-        amounts = [(t, tx_amount_for_stats(t)) for t in all_transactions]
-        income = sum(amount for _, amount in amounts if amount > 0)
-        expenses = abs(sum(amount for _, amount in amounts if amount < 0))
-        net_savings = income - expenses
-        savings_rate = (net_savings / income * 100) if income > 0 else 0
+        response = _SINGLE_FLIGHT.do(
+            cache_key,
+            lambda: build_live_statistics_response(days, exclude_internal),
+        )
+        
+        if cache_allowed():
+            cache.set(cache_key, response, timeout=CACHE_TTL_SECONDS)
         
-        category_totals = {}
-        for t, tx_amount in amounts:
-            if tx_amount < 0:
-                cat = t['category']
-                category_totals[cat] = category_totals.get(cat, 0) + abs(tx_amount)
+        return jsonify(response)
         
+    except Exception as e:
+        logger.exception(f"❌ Error fetching statistics: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/aggregates', methods=['GET'])
+@requires_auth
+@rate_limit('general')
+def get_aggregates():
+    """
+    Chart-ready aggregates - SESSION AUTH REQUIRED.
+
+    Income/expenses/net/count per day, week or month (period=), a category x
+    period expense matrix, expense per category and the top merchants, so the
+    dashboard does not have to fold every raw row itself. Computed in SQL over
+    the history store when it covers the window, otherwise in one pass over the
+    /api/transactions result set. Takes days, account_id(s), exclude_internal,
+    period and top (merchants, max 100).
+    """
+    if not API_KEY:
+        return jsonify({
+            'success': False,
+            'error': 'Demo mode - configure API key'
+        }), 503
+    if not _BUNQ_CONTEXT_INITIALIZED:
+        if not ensure_bunq_initialized(force=True, refresh_key=True, run_auto_whitelist=False):
+            return jsonify({
+                'success': False,
+                'error': _BUNQ_INIT_LAST_ERROR or 'Bunq API context not initialized'
+            }), 503
+
+    period = (request.args.get('period') or 'day').strip().lower()
+    if period not in AGGREGATE_PERIODS:
+        return jsonify({
+            'success': False,
+            'error': f"period must be one of: {', '.join(AGGREGATE_PERIODS)}"
+        }), 400
+
+    try:
+        days = clamp_days(request.args.get('days', 90))
+        account_ids = parse_account_filter()
+        exclude_internal = parse_bool(request.args.get('exclude_internal'), default=False)
+        try:
+            top_merchants = min(max(int(request.args.get('top', 10)), 1), 100)
+        except (TypeError, ValueError):
+            top_merchants = 10
+
+        cache_key = make_cache_key('aggregates')
+        if cache_allowed():
+            cached = cache.get(cache_key)
+            if cached:
+                return jsonify(cached)
+
+        data = None
+        freshness = get_store_window_freshness(days) if cache_allowed() else None
+        if freshness is not None and freshness['covers_window']:
+            data = compute_aggregates_from_store(days, period, account_ids, exclude_internal, top_merchants)
+            if data is not None:
+                if freshness['age_seconds'] > CACHE_TTL_SECONDS:
+                    trigger_background_transaction_refresh(days)
+                data.update({'data_source': 'history_store', 'last_synced_at': freshness['last_synced_at']})
+        if data is None:
+            snapshot, _ = get_transaction_result_set(days, account_ids, exclude_internal)
+            data = compute_aggregates_from_transactions(snapshot['transactions'], period, top_merchants)
+            data.update({'data_source': 'live', 'last_synced_at': snapshot['created_at']})
+
         response = {
             'success': True,
-            'data': {
-                'period_days': days,
-                'total_transactions': len(all_transactions),
-                'income': income,
-                'expenses': expenses,
-                'net_savings': net_savings,
-                'savings_rate': savings_rate,
-                'categories': category_totals,
-                'avg_daily_expenses': expenses / days if days > 0 else 0
-            }
+            'data': {'days': days, **data},
         }
-        
         if cache_allowed():
             cache.set(cache_key, response, timeout=CACHE_TTL_SECONDS)
-        
         return jsonify(response)
-        
+
     except Exception as e:
-        logger.exception(f"❌ Error fetching statistics: {e}")
+        logger.exception(f"❌ Error computing aggregates: {e}")
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+# Served from account_snapshots' primary key (snapshot_date, account_id), which
+# clusters each day's rows together (WITHOUT ROWID).
+_BALANCE_HISTORY_SERIES_SQL = """
+    SELECT snapshot_date, account_type,
+           SUM(
+               CASE
+                   WHEN balance_eur_value IS NOT NULL THEN balance_eur_value
+                   WHEN balance_currency = 'EUR' THEN balance_value
+                   ELSE 0
+               END
+           ) AS total_eur
+    FROM account_snapshots
+    WHERE snapshot_date >= ?
+    GROUP BY snapshot_date, account_type
+    ORDER BY snapshot_date ASC
+"""
+_LATEST_SNAPSHOT_DATE_SQL = "SELECT MAX(snapshot_date) AS latest_date FROM account_snapshots"
+_BALANCE_BREAKDOWN_SQL = """
+    SELECT account_id, description, account_type, account_class, status,
+           balance_value, balance_currency, balance_eur_value, fx_rate_to_eur
+    FROM account_snapshots
+    WHERE snapshot_date = ?
+    ORDER BY account_type, description
+"""
+
 @app.route('/api/history/balances', methods=['GET'])
 @requires_auth
 @rate_limit('general')
@@ -5339,41 +9243,14 @@ def get_balance_history():
         }), 500
 
     try:
-        rows = connection.execute(
-            """
-            SELECT snapshot_date, account_type,
-                   SUM(
-                       CASE
-                           WHEN balance_eur_value IS NOT NULL THEN balance_eur_value
-                           WHEN balance_currency = 'EUR' THEN balance_value
-                           ELSE 0
-                       END
-                   ) AS total_eur
-            FROM account_snapshots
-            WHERE snapshot_date >= ?
-            GROUP BY snapshot_date, account_type
-            ORDER BY snapshot_date ASC
-            """,
-            (start_date,),
-        ).fetchall()
+        rows = connection.execute(_BALANCE_HISTORY_SERIES_SQL, (start_date,)).fetchall()
 
-        latest_row = connection.execute(
-            "SELECT MAX(snapshot_date) AS latest_date FROM account_snapshots"
-        ).fetchone()
+        latest_row = connection.execute(_LATEST_SNAPSHOT_DATE_SQL).fetchone()
         latest_date = latest_row['latest_date'] if latest_row else None
 
         breakdown = {'checking': [], 'savings': [], 'investment': []}
         if latest_date:
-            breakdown_rows = connection.execute(
-                """
-                SELECT account_id, description, account_type, account_class, status,
-                       balance_value, balance_currency, balance_eur_value, fx_rate_to_eur
-                FROM account_snapshots
-                WHERE snapshot_date = ?
-                ORDER BY account_type, description
-                """,
-                (latest_date,),
-            ).fetchall()
+            breakdown_rows = connection.execute(_BALANCE_BREAKDOWN_SQL, (latest_date,)).fetchall()
             for row in breakdown_rows:
                 account_type = row['account_type'] or 'checking'
                 if account_type not in breakdown:
@@ -5452,7 +9329,7 @@ def get_balance_history():
             'error': str(exc)
         }), 500
     finally:
-        connection.close()
+        release_data_db_connection(connection)
 
 @app.route('/api/demo-data', methods=['GET'])
 @requires_auth
@@ -5539,6 +9416,174 @@ def get_demo_data():
         'note': 'Synthetic demo data — shape mirrors real /api/transactions response'
     })
 
+# ============================================
+# BACKGROUND PRE-WARM SCHEDULER
+# ============================================
+
+_SCHEDULER_LEASE_NAME = 'prewarm'
+_SCHEDULER_OWNER_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+_SCHEDULER_STOP = threading.Event()
+_SCHEDULER_THREAD = None
+_SCHEDULER_STATE = {
+    'is_leader': False,
+    'runs': 0,
+    'last_run_at': None,
+    'last_duration_seconds': None,
+    'last_error': None,
+}
+
+def acquire_scheduler_lease(name, owner, lease_seconds):
+    """
+    Take or renew a named lease row in the data store.
+    Exactly one process holds a lease until it expires or is released, so all
+    gunicorn workers can run the scheduler loop while only one does the work.
+    """
+    connection = get_data_db_connection()
+    if connection is None:
+        return False
+    now = time.time()
+    try:
+        with connection:
+            cursor = connection.execute("""
+                INSERT INTO scheduler_lease (name, owner, expires_at, renewed_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    owner = excluded.owner,
+                    expires_at = excluded.expires_at,
+                    renewed_at = excluded.renewed_at
+                WHERE scheduler_lease.owner = excluded.owner
+                   OR scheduler_lease.expires_at < ?
+            """, (name, owner, now + lease_seconds, datetime.now(timezone.utc).isoformat(), now))
+            return cursor.rowcount == 1
+    except Exception as exc:
+        logger.warning(f"⚠️ Scheduler lease check failed: {exc}")
+        return False
+    finally:
+        release_data_db_connection(connection)
+
+def release_scheduler_lease(name, owner):
+    connection = get_data_db_connection()
+    if connection is None:
+        return
+    try:
+        with connection:
+            connection.execute(
+                "DELETE FROM scheduler_lease WHERE name = ? AND owner = ?",
+                (name, owner),
+            )
+    except Exception as exc:
+        logger.warning(f"⚠️ Could not release scheduler lease: {exc}")
+    finally:
+        release_data_db_connection(connection)
+
+def run_prewarm_cycle():
+    """
+    Refresh what the dashboard asks for first, without a request context:
+    accounts (+ daily balance snapshot) and the SCHEDULER_WARM_DAYS transaction
+    windows for the dashboard user, unfiltered and for the account filters it
+    requested recently. Only the widest window of each filter hits Bunq (and
+    syncs transaction_cache, which also keeps the SQL statistics path fresh;
+    after the unfiltered sync the filtered ones are incremental); narrower
+    windows are sliced from it. The dashboard always sends exclude_internal=false,
+    so only that variant is warmed.
+    """
+    if not ensure_bunq_initialized(force=False, refresh_key=False, run_auto_whitelist=False):
+        return False
+    if not ensure_bunq_session_active():
+        return False
+
+    username = os.getenv('BASIC_AUTH_USERNAME', 'admin')
+    accounts_response = build_accounts_response(username)
+    # Same key make_cache_key('accounts') produces for a plain /api/accounts request.
+    _store_revalidated(f"accounts:{username}:", accounts_response)
+
+    if not SCHEDULER_WARM_DAYS:
+        return True
+    widest_days = SCHEDULER_WARM_DAYS[-1]
+    account_filters = [None, *recent_warm_account_filters(username)]
+    widest_counts = []
+    for account_ids in account_filters:
+        widest = build_transaction_result_set(widest_days, account_ids, False, username)
+        widest_counts.append(len(widest['transactions']))
+        for days in SCHEDULER_WARM_DAYS:
+            snapshot = widest if days == widest_days else derive_transaction_result_set(widest, days)
+            if CACHE_ENABLED:
+                result_set_key = make_result_set_key('transactions_result_set', days, account_ids, False, username)
+                _store_revalidated(result_set_key, cache_transaction_snapshot(snapshot))
+    logger.info(
+        f"🔥 Pre-warmed accounts and {len(SCHEDULER_WARM_DAYS)} transaction window(s) for "
+        f"{len(account_filters)} account filter(s) ({widest_counts[0]} transactions in {widest_days} days)"
+    )
+    return True
+
+def _scheduler_loop():
+    global _BUNQ_CONTEXT_INITIALIZED
+    # Give the worker time to finish booting before the first cycle; stagger workers.
+    if _SCHEDULER_STOP.wait(30 + os.getpid() % 15):
+        return
+    while True:
+        is_leader = acquire_scheduler_lease(_SCHEDULER_LEASE_NAME, _SCHEDULER_OWNER_ID, SCHEDULER_LEASE_SECONDS)
+        _SCHEDULER_STATE['is_leader'] = is_leader
+        if is_leader:
+            started = time.time()
+            try:
+                run_prewarm_cycle()
+                _SCHEDULER_STATE['last_error'] = None
+            except UnauthorizedException as exc:
+                logger.warning(f"⚠️ Pre-warm cycle rejected by Bunq — resetting context: {exc}")
+                _BUNQ_CONTEXT_INITIALIZED = False
+                _SCHEDULER_STATE['last_error'] = str(exc)
+            except Exception as exc:
+                logger.warning(f"⚠️ Pre-warm cycle failed: {exc}")
+                _SCHEDULER_STATE['last_error'] = str(exc)
+            _SCHEDULER_STATE['runs'] += 1
+            _SCHEDULER_STATE['last_run_at'] = datetime.now(timezone.utc).isoformat()
+            _SCHEDULER_STATE['last_duration_seconds'] = round(time.time() - started, 2)
+        if _SCHEDULER_STOP.wait(SCHEDULER_INTERVAL_SECONDS):
+            return
+
+def stop_prewarm_scheduler():
+    _SCHEDULER_STOP.set()
+    if _SCHEDULER_STATE['is_leader']:
+        release_scheduler_lease(_SCHEDULER_LEASE_NAME, _SCHEDULER_OWNER_ID)
+        _SCHEDULER_STATE['is_leader'] = False
+
+def start_prewarm_scheduler():
+    """Start the scheduler thread once per process (no-op when disabled or in demo mode)."""
+    global _SCHEDULER_THREAD
+    if not SCHEDULER_ENABLED or not DATA_DB_ENABLED or not API_KEY:
+        return False
+    if _SCHEDULER_THREAD is not None:
+        return True
+    _SCHEDULER_THREAD = threading.Thread(target=_scheduler_loop, name='prewarm-scheduler', daemon=True)
+    _SCHEDULER_THREAD.start()
+    atexit.register(stop_prewarm_scheduler)
+    logger.info(
+        f"⏰ Pre-warm scheduler started (every {SCHEDULER_INTERVAL_SECONDS}s, windows {SCHEDULER_WARM_DAYS})"
+    )
+    return True
+
+def get_scheduler_status():
+    return {
+        'enabled': SCHEDULER_ENABLED,
+        'running': _SCHEDULER_THREAD is not None,
+        'owner_id': _SCHEDULER_OWNER_ID,
+        'interval_seconds': SCHEDULER_INTERVAL_SECONDS,
+        'warm_days': SCHEDULER_WARM_DAYS,
+        'warm_account_filters': recent_warm_account_filters(os.getenv('BASIC_AUTH_USERNAME', 'admin')),
+        **_SCHEDULER_STATE,
+    }
+
+# Initialize optional local data store (non-fatal on failure). Runs last: its
+# migrations and query-plan checks use helpers defined throughout this module.
+init_data_store()
+
+# Gunicorn imports this module in every worker; the preboot check and plain
+# imports (scripts, shells) must not start background work.
+if 'gunicorn' in sys.modules:
+    load_static_assets()
+    start_prewarm_scheduler()
+
 if __name__ == '__main__':
     debug_mode = get_bool_env('FLASK_DEBUG', False)
     print("🚀 Starting Bunq Dashboard API (SESSION-BASED AUTH, development server)...")
@@ -5554,6 +9599,9 @@ if __name__ == '__main__':
         print("✅ Bunq API initialized")
     else:
         print("⚠️ Running in demo mode only")
+    if not debug_mode:
+        # The debug reloader would start a second scheduler in its child process.
+        start_prewarm_scheduler()
     
     # Local development server (not for production)
     app.run(
@@ -1200,6 +1200,26 @@ function resizeAllCharts() {
 // DATA LOADING
 // ============================================
 
+// Rebuild row objects from the /transactions/export columnar payload:
+// one array per field, dictionary-encoded text columns hold indexes.
+function decodeColumnarTransactions(payload) {
+    const fields = Array.isArray(payload?.fields) ? payload.fields : [];
+    const columns = payload?.columns || {};
+    const dictionaries = payload?.dictionaries || {};
+    const count = Number(payload?.count || 0);
+    const rows = new Array(count);
+    for (let i = 0; i < count; i += 1) {
+        const row = {};
+        for (const field of fields) {
+            const value = columns[field] ? columns[field][i] : null;
+            const dictionary = dictionaries[field];
+            row[field] = dictionary && value !== null && value !== undefined ? dictionary[value] : value;
+        }
+        rows[i] = row;
+    }
+    return rows;
+}
+
 async function loadRealData() {
     if (!isAuthenticated) {
         console.warn('⚠️ Not authenticated - cannot load real data');
@@ -1216,7 +1236,9 @@ async function loadRealData() {
         // The backend fetches transactions from the Bunq SDK using cursor-based
         // pagination (older_id) internally — one backend call can cover many SDK
         // pages. We use offset-based page params here to page through the
-        // backend's aggregated result set efficiently.
+        // backend's aggregated result set efficiently. Page 1 returns a
+        // snapshot_id; later pages pass it so they are sliced from the same
+        // server-side snapshot instead of triggering a new Bunq sweep.
         const pageSize = 500;
         // Safety cap to prevent unbounded API loops on unexpected backend responses.
         const hardPageCap = 200;
@@ -1228,13 +1250,42 @@ async function loadRealData() {
         let truncatedBySafetyCap = false;
         let backendTruncated = false;
         let backendMissingEurCount = 0;
+        let snapshotId = null;
+        let snapshotRestarted = false;
         const truncatedAccounts = new Map();
         
         const accountParam = buildAccountFilterParam();
         const excludeParam = '&exclude_internal=false';
+
+        // One round-trip for the whole set; the paged walk below stays as the
+        // fallback for backends without the export endpoint or on errors.
+        const exportUrl = `${CONFIG.apiEndpoint}/transactions/export?days=${CONFIG.timeRange}&format=columnar${accountParam}${excludeParam}`;
+        const applyExport = (exportResponse) => {
+            if (!exportResponse || !exportResponse.success || !exportResponse.columns) return false;
+            lastResponse = exportResponse;
+            all = decodeColumnarTransactions(exportResponse);
+            total = exportResponse.count;
+            backendTruncated = Boolean(exportResponse.truncated);
+            truncatedAccounts.clear();
+            (exportResponse.truncated_accounts || []).forEach((item) => {
+                const key = String(item?.account_id ?? '');
+                if (key && !truncatedAccounts.has(key)) truncatedAccounts.set(key, item);
+            });
+            backendMissingEurCount = Number(exportResponse.amount_eur_missing_count || 0) || 0;
+            return true;
+        };
+        let usedExport = false;
+        const exportResponse = await authenticatedFetch(exportUrl);
+        if (applyExport(exportResponse)) {
+            usedExport = true;
+        } else if (exportResponse === null && !isAuthenticated) {
+            // Session expired - modal already shown
+            usedExport = true;
+        }
         
-        while (page <= hardPageCap) {
-            const url = `${CONFIG.apiEndpoint}/transactions?days=${CONFIG.timeRange}&page=${page}&page_size=${pageSize}${accountParam}${excludeParam}`;
+        while (!usedExport && page <= hardPageCap) {
+            const snapshotParam = snapshotId ? `&snapshot_id=${encodeURIComponent(snapshotId)}` : '';
+            const url = `${CONFIG.apiEndpoint}/transactions?days=${CONFIG.timeRange}&page=${page}&page_size=${pageSize}${accountParam}${excludeParam}${snapshotParam}`;
             const response = await authenticatedFetch(url);
             lastResponse = response;
             
@@ -1248,6 +1299,28 @@ async function loadRealData() {
                 break;
             }
 
+            if (snapshotId && response.snapshot_id && response.snapshot_id !== snapshotId) {
+                // Snapshot expired mid-walk and the backend rebuilt it: restart once
+                // so all pages come from one consistent result set. If it changes
+                // again, load the whole set in one unpaged request instead.
+                if (snapshotRestarted) {
+                    if (!applyExport(await authenticatedFetch(exportUrl))) {
+                        loadError = 'Transaction snapshot changed while loading. Please refresh.';
+                    }
+                    break;
+                }
+                snapshotRestarted = true;
+                page = 1;
+                all = [];
+                total = null;
+                truncatedAccounts.clear();
+                backendTruncated = false;
+                backendMissingEurCount = 0;
+                snapshotId = response.snapshot_id;
+                continue;
+            }
+            snapshotId = response.snapshot_id || snapshotId;
+
             if (response.truncated) {
                 backendTruncated = true;
                 (response.truncated_accounts || []).forEach((item) => {
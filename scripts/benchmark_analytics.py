@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Benchmark statistics/aggregation: per-row Python passes vs the TransactionFrame analytics core."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+
+def _load_api_proxy() -> Any:
+    os.environ.setdefault("USE_VAULTWARDEN", "false")
+    os.environ.setdefault("BUNQ_INIT_AUTO_ATTEMPT", "false")
+    os.environ.setdefault("DATA_DB_ENABLED", "false")
+    os.environ.setdefault("FX_ENABLED", "false")
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    import api_proxy  # noqa: E402 - configured through the environment above
+
+    return api_proxy
+
+
+_CATEGORIES = (
+    "Boodschappen", "Horeca", "Vervoer", "Wonen", "Abonnementen", "Winkelen", "Zorg", "Salaris", "Overig",
+)
+
+
+def _synthetic_transactions(api: Any, count: int, rng: random.Random) -> list:
+    now = datetime.now(timezone.utc)
+    merchants = [f"Merchant {index}" for index in range(2000)]
+    transactions = []
+    for index in range(count):
+        currency = "USD" if index % 17 == 0 else "EUR"
+        amount = round(rng.uniform(-250, 40) if index % 25 else rng.uniform(500, 4000), 2)
+        transactions.append(api.CompactTransaction(
+            id=index,
+            date=(now - timedelta(minutes=rng.randint(0, 3 * 365 * 24 * 60))).isoformat(),
+            amount=amount,
+            amount_eur=(round(amount * 0.92, 2) if index % 3 else None) if currency == "USD" else amount,
+            currency=currency,
+            category=rng.choice(_CATEGORIES),
+            merchant=rng.choice(merchants),
+            account_id=str(rng.randint(1, 6)),
+            is_internal_transfer=index % 40 == 0,
+        ))
+    return transactions
+
+
+def _stats_amount(api: Any, tx: Any) -> float:
+    amount_eur = tx.get("amount_eur")
+    if amount_eur is not None:
+        return api.safe_float(amount_eur, default=0.0, context="statistics amount_eur")
+    native_amount = api.safe_float(tx.get("amount"), default=0.0, context="statistics amount")
+    if (tx.get("currency") or "EUR").upper() != "EUR":
+        return 0.0
+    return native_amount
+
+
+def python_statistics(api: Any, transactions: list) -> tuple:
+    """The previous build_live_statistics_response passes."""
+    amounts = [(tx, _stats_amount(api, tx)) for tx in transactions]
+    income = sum(amount for _, amount in amounts if amount > 0)
+    expenses = abs(sum(amount for _, amount in amounts if amount < 0))
+    categories: dict = {}
+    for tx, amount in amounts:
+        if amount < 0:
+            categories[tx["category"]] = categories.get(tx["category"], 0) + abs(amount)
+    return income, expenses, categories
+
+
+def python_aggregates(api: Any, transactions: list, period: str, top: int) -> dict:
+    """The previous per-row compute_aggregates_from_transactions loop."""
+    period_totals: dict = defaultdict(lambda: [0.0, 0.0, 0])
+    category_totals: dict = defaultdict(float)
+    merchant_totals: dict = defaultdict(lambda: [0.0, 0])
+    for tx in transactions:
+        amount = _stats_amount(api, tx)
+        period_key = api.aggregate_period_start(str(tx.get("date"))[:10], period)
+        totals = period_totals[period_key]
+        totals[2] += 1
+        if amount > 0:
+            totals[0] += amount
+        elif amount < 0:
+            totals[1] -= amount
+            category = str(tx.get("category") or "").strip() or "Overig"
+            merchant = str(tx.get("merchant") or "").strip() or "Onbekend"
+            category_totals[(period_key, category)] -= amount
+            merchant_totals[merchant][0] -= amount
+            merchant_totals[merchant][1] += 1
+    ranked = sorted(merchant_totals.items(), key=lambda item: (-item[1][0], item[0]))[:top]
+    return api.shape_transaction_aggregates(
+        [(key, income, expenses, count) for key, (income, expenses, count) in period_totals.items()],
+        [(key, category, expense) for (key, category), expense in category_totals.items()],
+        [(merchant, expense, count) for merchant, (expense, count) in ranked],
+        period,
+    )
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def _close(left: float, right: float) -> bool:
+    return abs(left - right) <= 1e-6 * max(1.0, abs(left), abs(right))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="comma-separated row counts")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is reported)")
+    parser.add_argument("--top", type=int, default=10, help="top merchants")
+    args = parser.parse_args()
+
+    api = _load_api_proxy()
+    backend = f"numpy {api.np.__version__}" if api.np is not None else "pure-Python fallback (numpy not installed)"
+    print(f"analytics benchmark: TransactionFrame backend = {backend}, best of {args.repeat}")
+    rng = random.Random(11)
+    all_equal = True
+    for size in (int(value) for value in args.sizes.split(",")):
+        transactions = _synthetic_transactions(api, size, rng)
+        build, frame = _time(lambda: api.TransactionFrame.from_transactions(transactions), args.repeat)
+        print(f"  {size:>9,} rows   frame build {build * 1000:9.1f} ms")
+
+        legacy, expected = _time(lambda: python_statistics(api, transactions), args.repeat)
+
+        def frame_statistics() -> tuple:
+            income, expenses, _ = frame.totals()
+            return income, expenses, frame.expense_by_category()
+
+        vectorized, actual = _time(frame_statistics, args.repeat)
+        equal = (
+            _close(expected[0], actual[0]) and _close(expected[1], actual[1])
+            and expected[2].keys() == actual[2].keys()
+            and all(_close(expected[2][key], actual[2][key]) for key in expected[2])
+        )
+        all_equal &= equal
+        print(
+            f"    statistics          python {legacy * 1000:9.1f} ms | frame {vectorized * 1000:8.1f} ms"
+            f" | x{legacy / vectorized:6.1f} | equal {equal}"
+        )
+
+        for period in ("day", "week", "month"):
+            legacy, expected = _time(lambda: python_aggregates(api, transactions, period, args.top), args.repeat)
+            vectorized, actual = _time(lambda: api.compute_aggregates_from_frame(frame, period, args.top), args.repeat)
+            equal = expected == actual
+            all_equal &= equal
+            print(
+                f"    aggregates/{period:<6}   python {legacy * 1000:9.1f} ms | frame {vectorized * 1000:8.1f} ms"
+                f" | x{legacy / vectorized:6.1f} | equal {equal}"
+            )
+
+        profile, _ = _time(lambda: api.daily_expense_profile(frame.daily_expenses()), args.repeat)
+        print(f"    daily expense profile (percentiles, rolling 7d)     {profile * 1000:8.1f} ms")
+    return 0 if all_equal else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Benchmark categorize_transaction against the previous linear keyword scan."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any
+
+
+def _load_api_proxy() -> Any:
+    os.environ.setdefault("USE_VAULTWARDEN", "false")
+    os.environ.setdefault("BUNQ_INIT_AUTO_ATTEMPT", "false")
+    os.environ.setdefault("DATA_DB_ENABLED", "false")
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    import api_proxy  # noqa: E402 - configured through the environment above
+
+    return api_proxy
+
+
+def reference_categorize_transaction(description, counterparty_name, is_internal=False, merchant_category_code=None, amount=None):
+    """Linear keyword scan categorize_transaction used before the compiled matcher."""
+    if is_internal:
+        return 'Internal Transfer'
+
+    desc_lower = description.lower() if description else ''
+    counter_lower = counterparty_name.lower() if counterparty_name else ''
+    combined = f"{desc_lower} {counter_lower}".strip()
+    try:
+        amount_value = 0.0 if amount is None else float(amount)
+    except (TypeError, ValueError):
+        amount_value = 0.0
+
+    mcc = str(merchant_category_code or '').strip()
+    if mcc:
+        if mcc in {'5411', '5422', '5441', '5451', '5462', '5499'}:
+            return 'Boodschappen'
+        if mcc in {'5812', '5813', '5814'}:
+            return 'Horeca'
+        if mcc in {'4111', '4121', '4789', '5541', '5542'}:
+            return 'Vervoer'
+        if mcc in {'4900', '4814'}:
+            return 'Utilities'
+        if mcc in {'5960', '5966', '6300'}:
+            return 'Verzekering'
+        if mcc in {'9211', '9311', '9399'}:
+            return 'Belastingen'
+        if mcc in {'5912', '8011', '8021', '8099'}:
+            return 'Zorg'
+        if mcc in {'7832', '7922', '7997', '7999'}:
+            return 'Entertainment'
+        if mcc in {'4899', '5815', '5968', '5734'}:
+            return 'Abonnementen'
+        if mcc in {'5311', '5331', '5399', '5651', '5732'}:
+            return 'Shopping'
+
+    if amount_value > 0:
+        if any(word in combined for word in ['refund', 'terugbetaling', 'chargeback', 'retour', 'reversal']):
+            return 'Refund'
+        if any(word in combined for word in ['rente', 'interest']):
+            return 'Rente'
+        if any(word in combined for word in ['salaris', 'salary', 'loon', 'wage']):
+            return 'Salaris'
+
+    if any(word in combined for word in [
+        'albert heijn', ' ah ', 'jumbo', 'lidl', 'aldi', 'plus', 'dirk',
+        'picnic', 'ekoplaza', 'spar ', 'coop', 'supermarkt', 'carrefour',
+        'dekamarkt', 'hoogvliet', 'vomar', 'poiesz', 'jan linders', 'appie',
+        'flink', 'gorillas', 'getir', 'hellofresh'
+    ]):
+        return 'Boodschappen'
+    elif any(word in combined for word in [
+        'restaurant', 'cafe', 'bar', 'pizza', 'burger', 'starbucks',
+        'thuisbezorgd', 'ubereats', 'deliveroo', 'mcdonald', 'kfc', 'subway'
+    ]):
+        return 'Horeca'
+    elif any(word in combined for word in [
+        'ns ', 'train', 'bus', 'taxi', 'uber', 'ov ', 'parking',
+        'q-park', 'shell', 'texaco', 'esso', 'total', 'benzine',
+        'bp ', 'tinq', 'avia', 'ok tank', 'yellowbrick', 'anwb',
+        'ov-chip', 'ovchip', 'arriva', 'connexxion', 'ret ', 'gvb', 'qbuzz'
+    ]):
+        return 'Vervoer'
+    elif any(word in combined for word in ['huur', 'rent', 'hypotheek', 'mortgage', 'vve']):
+        return 'Wonen'
+    elif any(word in combined for word in [
+        'verzekering', 'insur', 'aegon', 'allianz', 'ohra', 'unive',
+        'zilveren kruis', 'interpolis', 'vgz', 'cz ', 'menzis', 'fbto', 'asr '
+    ]):
+        return 'Verzekering'
+    elif any(word in combined for word in [
+        'belasting', 'belastingdienst', 'tax', 'gemeente', 'waterschap',
+        'cjib', 'rdw', 'duo '
+    ]):
+        return 'Belastingen'
+    elif any(word in combined for word in [
+        'eneco', 'essent', 'energie', 'gas', 'water', 'ziggo', 'kpn', 'telecom',
+        'odido', 'vodafone', 't-mobile', 'tele2', 'youfone', 'hollandsnieuwe',
+        'delta fiber', 'caiway', 'budget energie', 'greenchoice', 'enexis', 'liander',
+        'stedin', 'waternet', 'vitens'
+    ]):
+        return 'Utilities'
+    elif any(word in combined for word in [
+        'netflix', 'spotify', 'disney+', 'videoland', 'amazon prime', 'youtube premium',
+        'adobe', 'microsoft 365', 'office 365', 'icloud', 'google one'
+    ]):
+        return 'Abonnementen'
+    elif any(word in combined for word in [
+        'bol.com', 'coolblue', 'mediamarkt', 'amazon', 'zara', 'h&m', 'shop',
+        'hema', 'action', 'ikea', 'primark', 'kruidvat', 'etos', 'zalando'
+    ]):
+        return 'Shopping'
+    elif any(word in combined for word in [
+        'youtube', 'cinema', 'pathé', 'concert', 'steam',
+        'nintendo', 'playstation', 'xbox'
+    ]):
+        return 'Entertainment'
+    elif any(word in combined for word in [
+        'apotheek', 'pharmacy', 'dokter', 'doctor', 'tandarts', 'dentist',
+        'huisarts', 'ziekenhuis', 'hospital', 'zorgverzekeraar'
+    ]):
+        return 'Zorg'
+    elif any(word in combined for word in ['salaris', 'salary', 'loon', 'wage']):
+        return 'Salaris'
+    else:
+        return 'Overig'
+
+
+_MERCHANTS = (
+    "Albert Heijn 1403", "Jumbo Utrecht", "Lidl", "Picnic", "Thuisbezorgd.nl", "Starbucks Schiphol",
+    "NS Groep", "Shell Express", "Q-Park Centrum", "Eneco", "Ziggo", "Vodafone Libertel", "Netflix.com",
+    "Spotify AB", "Amazon Prime", "Amazon EU", "bol.com", "Coolblue", "IKEA Delft", "Pathé Tuschinski",
+    "Steam Purchase", "Apotheek De Vecht", "Belastingdienst", "Gemeente Amsterdam", "Zilveren Kruis",
+    "Werkgever B.V.", "J. de Vries", "Bakkerij Bart", "Tikkie", "Onbekend",
+)
+_DESCRIPTIONS = (
+    "", "Betaling", "Salaris januari", "Huur appartement", "Terugbetaling bestelling", "Rente Q1",
+    "Pinbetaling", "iDEAL betaling", "Maandelijkse incasso", "Refund order 8812", "Youtube Premium",
+)
+_MCCS = ("", "", "", "5411", "5812", "4111", "4900", "5968", "5732", "7999", "1234")
+
+
+def _synthetic_transactions(count: int, distinct: int, seed: int) -> list[tuple]:
+    rng = random.Random(seed)
+    # Recurring payments: a limited pool of distinct rows, sampled with repetition.
+    pool = [
+        (
+            f"{rng.choice(_DESCRIPTIONS)} {rng.randint(1, 40) if rng.random() < 0.3 else ''}".strip(),
+            rng.choice(_MERCHANTS),
+            rng.random() < 0.05,
+            rng.choice(_MCCS) or None,
+            rng.choice((-1, -1, -1, 1)) * round(rng.uniform(1, 3000), 2),
+        )
+        for _ in range(distinct)
+    ]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transactions", type=int, default=100_000, help="synthetic transactions")
+    parser.add_argument("--distinct", type=int, default=5_000, help="distinct (text, mcc, amount) rows")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    api = _load_api_proxy()
+    rows = _synthetic_transactions(args.transactions, args.distinct, args.seed)
+
+    started = time.perf_counter()
+    expected = [reference_categorize_transaction(*row) for row in rows]
+    reference_seconds = time.perf_counter() - started
+
+    api._categorize_memoized.cache_clear()
+    started = time.perf_counter()
+    actual = [api.categorize_transaction(*row) for row in rows]
+    compiled_seconds = time.perf_counter() - started
+
+    api._categorize_memoized.cache_clear()
+    started = time.perf_counter()
+    for row in rows:
+        api._categorize_memoized.cache_clear()
+        api.categorize_transaction(*row)
+    uncached_seconds = time.perf_counter() - started
+
+    mismatches = [(row, want, got) for row, want, got in zip(rows, expected, actual) if want != got]
+    print(f"categorization benchmark: {len(rows)} transactions, {args.distinct} distinct rows")
+    print(f"  linear keyword scan   {reference_seconds * 1000:9.1f} ms")
+    print(f"  compiled, no memo     {uncached_seconds * 1000:9.1f} ms  x{reference_seconds / uncached_seconds:5.1f}")
+    print(f"  compiled + memo       {compiled_seconds * 1000:9.1f} ms  x{reference_seconds / compiled_seconds:5.1f}")
+    print(f"  identical outputs     {len(rows) - len(mismatches)}/{len(rows)}")
+    for row, want, got in mismatches[:10]:
+        print(f"    MISMATCH {row!r}: expected {want!r}, got {got!r}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
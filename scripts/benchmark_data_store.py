@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Benchmark history-store connection handling (per-call connect vs per-thread pool)."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator
+
+
+def _prepare_environment(db_dir: str) -> Any:
+    os.environ["USE_VAULTWARDEN"] = "false"
+    os.environ["BUNQ_INIT_AUTO_ATTEMPT"] = "false"
+    os.environ["FX_ENABLED"] = "true"
+    os.environ["DATA_DB_PATH"] = os.path.join(db_dir, "dashboard_data.db")
+    # Measure the writes themselves, not the write-behind queue in front of them.
+    os.environ["DATA_DB_WRITE_BEHIND_MS"] = "0"
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    import api_proxy  # noqa: E402 - configured through the environment above
+
+    return api_proxy
+
+
+@contextmanager
+def _per_call_connections(api: Any) -> Iterator[None]:
+    """Restore the previous behaviour: sqlite3.connect + close on every call."""
+
+    def legacy_connection() -> sqlite3.Connection:
+        connection = sqlite3.connect(api.DATA_DB_PATH, timeout=10)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def legacy_release(connection: sqlite3.Connection) -> None:
+        connection.close()
+
+    pooled = (api.get_data_db_connection, api.release_data_db_connection)
+    api.get_data_db_connection = legacy_connection
+    api.release_data_db_connection = legacy_release
+    try:
+        yield
+    finally:
+        api.get_data_db_connection, api.release_data_db_connection = pooled
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _synthetic_payments(count: int) -> list[SimpleNamespace]:
+    now = datetime.now(timezone.utc)
+    payments = []
+    for index in range(count):
+        created = now - timedelta(hours=index * 3)
+        payments.append(SimpleNamespace(
+            id_=100000 + index,
+            created=created.strftime("%Y-%m-%d %H:%M:%S.%f"),
+            description=f"Card payment {index % 40}",
+            amount=SimpleNamespace(value=f"-{(index % 90) + 1}.25", currency="USD"),
+            counterparty_alias=SimpleNamespace(display_name=f"Merchant {index % 40}"),
+            type_="MASTERCARD",
+        ))
+    return payments
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transactions", type=int, default=5000, help="synthetic transactions per run")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        api = _prepare_environment(db_dir)
+        api.requests.get = None  # never reach the network: every rate below is cached
+
+        payments = _synthetic_payments(args.transactions)
+        rate_dates = sorted({p.created[:10] for p in payments})
+        api.cache_fx_rates({("USD", rate_date): 0.92 for rate_date in rate_dates}, "EUR", source="benchmark")
+
+        def per_transaction_fx_lookups() -> None:
+            # The per-payment lookup pattern of fetch_fx_rate on a runtime-cache miss.
+            for payment in payments:
+                api.get_cached_fx_rate("USD", "EUR", rate_date=payment.created[:10])
+
+        api._FX_RUNTIME_CACHE.clear()
+        transactions = api.normalize_account_transactions(1, payments, {}, [], {}, account_name="Benchmark")
+
+        def small_batch_writes() -> None:
+            # Incremental syncs persist a handful of new rows per account stream.
+            api._TRANSACTION_CACHE_FINGERPRINTS.clear()
+            for start in range(0, len(transactions), 10):
+                api.persist_transactions(transactions[start:start + 10])
+
+        print(f"history store benchmark: {args.transactions} transactions, best of {args.repeat}")
+        for label, workload in (
+            ("per-transaction FX cache lookups", per_transaction_fx_lookups),
+            ("persist in batches of 10", small_batch_writes),
+        ):
+            with _per_call_connections(api):
+                legacy = _time(workload, args.repeat)
+            pooled = _time(workload, args.repeat)
+            print(
+                f"  {label:34s} per-call connect {legacy * 1000:9.1f} ms"
+                f" | pooled {pooled * 1000:9.1f} ms | speedup x{legacy / pooled:5.1f}"
+            )
+
+        api.close_data_db_connections()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
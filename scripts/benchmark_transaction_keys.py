@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Benchmark transaction_cache keys: SHA-256 hex text keys vs packed integer keys."""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+
+def _prepare_environment(db_dir: str) -> Any:
+    os.environ["USE_VAULTWARDEN"] = "false"
+    os.environ["BUNQ_INIT_AUTO_ATTEMPT"] = "false"
+    os.environ["FX_ENABLED"] = "false"
+    os.environ["DATA_DB_PATH"] = os.path.join(db_dir, "integer.db")
+    # Measure the writes themselves, not the write-behind queue in front of them.
+    os.environ["DATA_DB_WRITE_BEHIND_MS"] = "0"
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    import api_proxy  # noqa: E402 - configured through the environment above
+
+    return api_proxy
+
+
+def legacy_cache_key(transaction: Any) -> str:
+    """The previous build_transaction_cache_key."""
+    payload = "|".join([
+        str(transaction.get("id")),
+        str(transaction.get("account_id")),
+        str(transaction.get("date")),
+        str(transaction.get("amount")),
+        str(transaction.get("description")),
+    ])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _synthetic_transactions(api: Any, count: int, rng: random.Random) -> list:
+    now = datetime.now(timezone.utc)
+    transactions = []
+    for index in range(count):
+        amount = round(rng.uniform(-250, 40), 2)
+        transactions.append(api.CompactTransaction(
+            id=1_500_000_000 + index,
+            account_id=str(rng.randint(1_000_000, 9_999_999)),
+            account_name="Benchmark",
+            date=(now - timedelta(minutes=rng.randint(0, 3 * 365 * 24 * 60))).isoformat(),
+            amount=amount,
+            currency="EUR",
+            amount_eur=amount,
+            description=f"Card payment {rng.randint(0, 5000)}",
+            merchant=f"Merchant {rng.randint(0, 2000)}",
+            category="Boodschappen",
+            source="payment" if index % 5 else "card_payment",
+        ))
+    return transactions
+
+
+def _time(fn: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def _use_store(api: Any, path: str) -> None:
+    api.close_data_db_connections()
+    api.DATA_DB_PATH = path
+    api._TRANSACTION_CACHE_FINGERPRINTS.clear()
+    api.init_data_store()
+
+
+def _legacy_store(api: Any, path: str) -> None:
+    """Create a store whose transaction_cache still has the SHA-256 text key."""
+    _use_store(api, path)
+    connection = api.get_data_db_connection()
+    schema = [
+        row["sql"] for row in connection.execute(
+            "SELECT sql FROM sqlite_master WHERE tbl_name = 'transaction_cache' AND type IN ('table', 'index')"
+            " ORDER BY type DESC"
+        )
+    ]
+    with connection:
+        connection.execute("DROP TABLE transaction_cache")
+        for statement in schema:
+            connection.execute(statement.replace("tx_key INTEGER PRIMARY KEY", "tx_key TEXT PRIMARY KEY"))
+        # Schema v1 holds the key migration; make the next init run it again.
+        connection.execute("PRAGMA user_version = 0")
+    api.install_transaction_rollup(connection)
+
+
+def _store_size(api: Any) -> int:
+    connection = api.get_data_db_connection()
+    connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return os.path.getsize(api.DATA_DB_PATH)
+
+
+def _persist(api: Any, transactions: list, batch: int) -> None:
+    for start in range(0, len(transactions), batch):
+        api.persist_transactions(transactions[start:start + batch])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transactions", type=int, default=100000, help="synthetic transactions")
+    parser.add_argument("--batch", type=int, default=5000, help="rows per persist call")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        api = _prepare_environment(db_dir)
+        transactions = _synthetic_transactions(api, args.transactions, random.Random(3))
+        integer_key = api.build_transaction_cache_key
+
+        legacy_keys = _time(lambda: [legacy_cache_key(tx) for tx in transactions])
+        integer_keys = _time(lambda: [integer_key(tx) for tx in transactions])
+
+        legacy_path = os.path.join(db_dir, "legacy.db")
+        _legacy_store(api, legacy_path)
+        api.build_transaction_cache_key = legacy_cache_key
+        legacy_persist = _time(lambda: _persist(api, transactions, args.batch))
+        legacy_size = _store_size(api)
+        api.build_transaction_cache_key = integer_key
+
+        _use_store(api, os.path.join(db_dir, "integer.db"))
+        integer_persist = _time(lambda: _persist(api, transactions, args.batch))
+        integer_size = _store_size(api)
+
+        api.close_data_db_connections()
+        api.DATA_DB_PATH = legacy_path
+        migration = _time(api.init_data_store)
+        connection = api.get_data_db_connection()
+        migrated_rows = connection.execute("SELECT COUNT(*) FROM transaction_cache").fetchone()[0]
+        connection.execute("VACUUM")
+        migrated_size = _store_size(api)
+        api.close_data_db_connections()
+
+        mib = 1024 * 1024
+        rows = len(transactions)
+        print(f"transaction_cache keys: {rows} transactions, persisted in batches of {args.batch}")
+        print(f"  key build           sha256 {legacy_keys * 1e6 / rows:6.2f} us/row | integer {integer_keys * 1e6 / rows:6.2f} us/row")
+        print(
+            f"  persist (insert)    sha256 {rows / legacy_persist:8.0f} rows/s | integer {rows / integer_persist:8.0f} rows/s"
+            f" | x{legacy_persist / integer_persist:4.2f}"
+        )
+        print(f"  database size       sha256 {legacy_size / mib:8.1f} MiB   | integer {integer_size / mib:8.1f} MiB")
+        print(
+            f"  migration           {migration * 1000:.0f} ms for {migrated_rows} rows,"
+            f" {migrated_size / mib:.1f} MiB after VACUUM"
+        )
+    return 0 if migrated_rows == rows else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
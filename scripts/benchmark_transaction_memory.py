@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Measure memory of normalized transactions: plain dicts vs CompactTransaction records."""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import pickle
+import random
+import sys
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Callable
+
+
+def _load_api_proxy() -> Any:
+    os.environ.setdefault("USE_VAULTWARDEN", "false")
+    os.environ.setdefault("BUNQ_INIT_AUTO_ATTEMPT", "false")
+    os.environ.setdefault("DATA_DB_ENABLED", "false")
+    os.environ.setdefault("FX_ENABLED", "false")
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    import api_proxy  # noqa: E402 - configured through the environment above
+
+    return api_proxy
+
+
+_MERCHANTS = (
+    "Albert Heijn 1403", "Jumbo Utrecht", "Thuisbezorgd.nl", "NS Groep", "Shell Express", "Eneco",
+    "Ziggo", "Netflix.com", "bol.com", "Coolblue", "Apotheek De Vecht", "Werkgever B.V.", "J. de Vries",
+)
+
+
+def _synthetic_payments(days: int, per_day: int, account_id: int, rng: random.Random) -> list[SimpleNamespace]:
+    now = datetime.now(timezone.utc)
+    payments = []
+    for index in range(days * per_day):
+        created = now - timedelta(days=index / per_day, minutes=rng.randint(0, 600))
+        merchant = rng.choice(_MERCHANTS)
+        payments.append(SimpleNamespace(
+            id_=account_id * 10_000_000 + index,
+            created=created.strftime("%Y-%m-%d %H:%M:%S.%f"),
+            description=f"{merchant} {rng.randint(1000, 9999)}",
+            amount=SimpleNamespace(value=f"-{rng.randint(1, 20000) / 100:.2f}", currency="EUR"),
+            counterparty_alias=SimpleNamespace(display_name=merchant, iban=f"NL{rng.randint(10, 99)}BUNQ0{rng.randint(10**8, 10**9 - 1)}"),
+            type_="MASTERCARD",
+        ))
+    return payments
+
+
+def _measure(build: Callable[[], list]) -> tuple[list, int]:
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, current - baseline
+
+
+def _fresh_string(value: Any) -> Any:
+    # Strings decoded from a Bunq JSON response are separate objects per row.
+    return value.encode().decode() if isinstance(value, str) else value
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=3650)
+    parser.add_argument("--per-day", type=int, default=4, help="transactions per account per day")
+    parser.add_argument("--accounts", type=int, default=4)
+    args = parser.parse_args()
+
+    api = _load_api_proxy()
+    rng = random.Random(7)
+    transactions = []
+    for account_id in range(1, args.accounts + 1):
+        payments = _synthetic_payments(args.days, args.per_day, account_id, rng)
+        transactions.extend(api.normalize_account_transactions(
+            account_id, payments, {}, [], {}, account_name=f"Account {account_id}",
+        ))
+    rows = [tx.values() for tx in transactions]
+    del transactions
+
+    def fresh_fields(row: tuple) -> dict:
+        return {name: _fresh_string(value) for name, value in zip(api.TRANSACTION_FIELDS, row)}
+
+    # Both builds allocate their own field values, so interning shows up too.
+    dicts, dict_bytes = _measure(lambda: [fresh_fields(row) for row in rows])
+    records, record_bytes = _measure(lambda: [api.CompactTransaction(**fresh_fields(row)) for row in rows])
+    same_json = all(record.to_dict() == plain for record, plain in zip(records, dicts))
+
+    dict_pickle = len(pickle.dumps(dicts, protocol=pickle.HIGHEST_PROTOCOL))
+    record_pickle = len(pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL))
+
+    mib = 1024 * 1024
+    print(f"transaction memory: {len(rows)} transactions ({args.days} days x {args.accounts} accounts)")
+    print(f"  dict rows            {dict_bytes / mib:8.1f} MiB  ({dict_bytes / len(rows):6.0f} B/tx)")
+    print(f"  CompactTransaction   {record_bytes / mib:8.1f} MiB  ({record_bytes / len(rows):6.0f} B/tx)")
+    print(f"  pickled (cache)      {dict_pickle / mib:8.1f} MiB -> {record_pickle / mib:.1f} MiB")
+    print(f"  identical JSON rows  {same_json}")
+    return 0 if same_json else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
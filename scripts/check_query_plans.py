@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Check that the dashboard's hot history-store queries use the indexes they were written for."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+from typing import Any
+
+
+def _load_api_proxy(db_path: str) -> Any:
+    os.environ["USE_VAULTWARDEN"] = "false"
+    os.environ["BUNQ_INIT_AUTO_ATTEMPT"] = "false"
+    os.environ["FX_ENABLED"] = "false"
+    os.environ["DATA_DB_ENABLED"] = "true"
+    os.environ["DATA_DB_PATH"] = db_path
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    import api_proxy  # noqa: E402 - configured through the environment above
+
+    return api_proxy
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--db", help="existing history store (migrated to the current schema first; default: a new empty store)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        # Importing runs init_data_store(), which migrates the store like a worker would.
+        api = _load_api_proxy(os.path.abspath(args.db) if args.db else os.path.join(db_dir, "plans.db"))
+        connection = api.get_data_db_connection()
+        print(f"query plans: {api.DATA_DB_PATH} (schema v{api.get_data_store_version(connection)}, SQLite {api.sqlite3.sqlite_version})")
+        problems = {name: problem for name, problem, _ in api.check_data_store_query_plans(connection)}
+        scratch = api._schema_only_copy(connection)
+        for name, sql, params, _ in api._query_plan_expectations():
+            print(f"  {'FAIL' if name in problems else 'PASS'}  {name}")
+            for line in api.explain_query_plan(scratch, sql, params):
+                print(f"          {line}")
+            if name in problems:
+                print(f"          -> {problems[name]}")
+        api.close_data_db_connections()
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
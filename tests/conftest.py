@@ -0,0 +1,265 @@
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Schema of the history store as the first release created it.
+BASELINE_SCHEMA = """
+CREATE TABLE account_snapshots (
+    snapshot_date TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    description TEXT,
+    account_type TEXT,
+    account_class TEXT,
+    status TEXT,
+    balance_value REAL NOT NULL,
+    balance_currency TEXT NOT NULL,
+    balance_eur_value REAL,
+    fx_rate_to_eur REAL,
+    captured_at TEXT NOT NULL,
+    PRIMARY KEY (snapshot_date, account_id)
+);
+CREATE TABLE transaction_cache (
+    tx_key TEXT PRIMARY KEY,
+    tx_id TEXT,
+    account_id TEXT NOT NULL,
+    account_name TEXT,
+    tx_date TEXT NOT NULL,
+    amount REAL NOT NULL,
+    currency TEXT,
+    amount_eur REAL,
+    description TEXT,
+    counterparty TEXT,
+    merchant TEXT,
+    category TEXT,
+    tx_type TEXT,
+    is_internal_transfer INTEGER NOT NULL DEFAULT 0,
+    captured_at TEXT NOT NULL
+);
+CREATE TABLE fx_rates (
+    base_currency TEXT NOT NULL,
+    quote_currency TEXT NOT NULL,
+    rate_date TEXT NOT NULL,
+    rate REAL NOT NULL,
+    source TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (base_currency, quote_currency, rate_date)
+);
+CREATE INDEX idx_account_snapshots_date ON account_snapshots(snapshot_date);
+CREATE INDEX idx_transaction_cache_date ON transaction_cache(tx_date);
+CREATE INDEX idx_transaction_cache_account ON transaction_cache(account_id);
+CREATE INDEX idx_fx_rates_date ON fx_rates(rate_date);
+"""
+
+BASELINE_TRANSACTIONS = [
+    # (id, account_id, date, amount, description, captured_at)
+    (1000, '7', '2026-10-01T10:00:00+00:00', -12.5, 'Albert Heijn', '2026-10-01T12:00:00+00:00'),
+    (1001, '7', '2026-10-02T09:30:00+00:00', -40.0, 'NS Groep', '2026-10-02T12:00:00+00:00'),
+    (1002, '8', '2026-10-03T18:00:00+00:00', 2500.0, 'Salaris', '2026-10-03T19:00:00+00:00'),
+    # The baseline key hashed the description: an edit stored the payment twice.
+    (1001, '7', '2026-10-02T09:30:00+00:00', -40.0, 'NS Groep Utrecht', '2026-10-04T12:00:00+00:00'),
+]
+
+
+def baseline_key(tx_id, account_id, tx_date, amount, description):
+    payload = '|'.join(str(value) for value in (tx_id, account_id, tx_date, amount, description))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+@pytest.fixture
+def baseline_store(tmp_path):
+    path = tmp_path / 'dashboard_data.db'
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.executescript(BASELINE_SCHEMA)
+    with connection:
+        connection.executemany(
+            """
+            INSERT INTO transaction_cache (
+                tx_key, tx_id, account_id, account_name, tx_date, amount, currency, amount_eur,
+                description, counterparty, merchant, category, tx_type, is_internal_transfer, captured_at
+            ) VALUES (?, ?, ?, 'Main', ?, ?, 'EUR', ?, ?, ?, ?, 'Overig', 'payment', 0, ?)
+            """,
+            [
+                (
+                    baseline_key(tx_id, account_id, tx_date, amount, description), str(tx_id), account_id,
+                    tx_date, amount, amount, description, description, description, captured_at,
+                )
+                for tx_id, account_id, tx_date, amount, description, captured_at in BASELINE_TRANSACTIONS
+            ],
+        )
+    connection.close()
+    return path
+
+
+
+def api_environment(db_path, **overrides):
+    """Environment for importing api_proxy offline against one history store."""
+    env = dict(os.environ)
+    env.update({
+        'USE_VAULTWARDEN': 'false',
+        'BUNQ_INIT_AUTO_ATTEMPT': 'false',
+        'FX_ENABLED': 'false',
+        'DATA_DB_ENABLED': 'true',
+        'DATA_DB_PATH': str(db_path),
+        'DATA_DB_WRITE_BEHIND_MS': '0',
+        'RESPONSE_CACHE_BACKEND': 'simple',
+        'BUNQ_GET_RATE_LIMIT': '0',
+        'LOG_LEVEL': 'INFO',
+    })
+    env.update(overrides)
+    return env
+
+
+@pytest.fixture
+def run_api(tmp_path):
+    """
+    Run `code` in a fresh interpreter that imports api_proxy (so init_data_store
+    runs exactly as in a worker); returns (json of the last stdout line, stderr).
+    """
+    def run(code, db_path, **env):
+        script = f"import json, sys\nsys.path.insert(0, {str(ROOT)!r})\nimport api_proxy as api\n{code}"
+        result = subprocess.run(
+            [sys.executable, '-c', script],
+            env=api_environment(db_path, **env),
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        assert result.returncode == 0, result.stderr
+        return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+    return run
+
+
+@pytest.fixture(scope='session')
+def api(tmp_path_factory):
+    """api_proxy imported in this process, on an empty store of the current schema."""
+    db_dir = tmp_path_factory.mktemp('store')
+    os.environ.update(api_environment(db_dir / 'dashboard_data.db'))
+    sys.path.insert(0, str(ROOT))
+    import api_proxy
+
+    return api_proxy
+
+
+@pytest.fixture
+def client(api, monkeypatch):
+    """Logged-in test client with Bunq marked ready; empty response cache and rate limits."""
+    monkeypatch.setattr(api, 'API_KEY', 'test-key')
+    monkeypatch.setattr(api, '_BUNQ_CONTEXT_INITIALIZED', True)
+    api.cache.clear()
+    api.rate_limiter.requests.clear()
+    with api._TRANSACTION_SNAPSHOT_MEMO_LOCK:
+        api._TRANSACTION_SNAPSHOT_MEMO.clear()
+    client = api.app.test_client()
+    with client.session_transaction() as session:
+        session['authenticated'] = True
+        session['username'] = 'admin'
+    return client
+
+
+class FakeBunq:
+    """Accounts and payment lists standing in for the bunq-sdk endpoints; counts list calls."""
+
+    def __init__(self, account_ids=(1, 2)):
+        self.calls = Counter()
+        self.accounts = [
+            SimpleNamespace(id_=account_id, description=f'Account {account_id}', alias=[],
+                            balance=SimpleNamespace(value='100.00', currency='EUR'))
+            for account_id in account_ids
+        ]
+        self.payments = {account_id: [] for account_id in account_ids}
+        self.card_payments = {account_id: [] for account_id in account_ids}
+        self.next_id = 1000
+
+    def add_payment(self, account_id, hours_ago, amount='-10.00', description='Albert Heijn', card=False):
+        self.next_id += 1
+        created = datetime.now(timezone.utc) - timedelta(hours=hours_ago)
+        (self.card_payments if card else self.payments)[account_id].append(SimpleNamespace(
+            id_=self.next_id,
+            created=created.strftime('%Y-%m-%d %H:%M:%S.%f'),
+            description=description,
+            amount=SimpleNamespace(value=amount, currency='EUR'),
+            counterparty_alias=SimpleNamespace(display_name=description),
+            type_='BUNQ',
+        ))
+        return self.next_id
+
+    def endpoint(self, store, name):
+        fake = self
+
+        class Endpoint:
+            @staticmethod
+            def list(monetary_account_id=None, params=None):
+                fake.calls[name] += 1
+                params = params or {}
+                items = sorted(store[int(monetary_account_id)], key=lambda payment: -payment.id_)
+                if 'older_id' in params:
+                    items = [payment for payment in items if payment.id_ < int(params['older_id'])]
+                return SimpleNamespace(value=items[:int(params.get('count', 200))])
+
+        return Endpoint
+
+
+@pytest.fixture
+def bunq(api, monkeypatch):
+    """FakeBunq wired into api_proxy, on an emptied transaction store."""
+    fake = FakeBunq()
+    monkeypatch.setattr(api, 'ensure_bunq_session_active', lambda: True)
+    monkeypatch.setattr(api, 'list_monetary_accounts', lambda: fake.accounts)
+    monkeypatch.setattr(api, 'discover_payment_endpoints',
+                        lambda: [('fake', fake.endpoint(fake.payments, 'payment'))])
+    monkeypatch.setattr(api, 'discover_card_payment_endpoints',
+                        lambda: [('fake', fake.endpoint(fake.card_payments, 'card_payment'))])
+    for name in ('_PAYMENT_ENDPOINT', '_PAYMENT_LIST_MODE', '_CARD_PAYMENT_ENDPOINT', '_CARD_PAYMENT_LIST_MODE'):
+        monkeypatch.setattr(api, name, None)
+    connection = api.get_data_db_connection()
+    with connection:
+        connection.execute("DELETE FROM transaction_cache")
+        connection.execute("DELETE FROM transaction_sync_state")
+    api.release_data_db_connection(connection)
+    api._TRANSACTION_CACHE_FINGERPRINTS.clear()
+    return fake
+
+
+def make_snapshot(api, user='admin', days=90, account_ids=None, exclude_internal=False, rows=(('1', -5.0),)):
+    """A transaction result set as build_transaction_result_set returns it."""
+    transactions = [api.CompactTransaction(id=tx_id, amount=amount, date='2026-10-01T10:00:00+00:00') for tx_id, amount in rows]
+    content_hash = api.transaction_set_digest(transactions, [], 0)
+    return {
+        'snapshot_id': api.transaction_snapshot_id(user, days, account_ids, exclude_internal, content_hash),
+        'user': user,
+        'created_at': '2026-10-01T10:00:00+00:00',
+        'days': days,
+        'account_ids': list(account_ids) if account_ids else None,
+        'exclude_internal': exclude_internal,
+        'transactions': transactions,
+        'truncated_accounts': [],
+        'amount_eur_missing_count': 0,
+        'content_hash': content_hash,
+    }
+
+
+def serve_snapshot(api, monkeypatch, snapshot):
+    """Let build_transaction_result_set return `snapshot` for any filter; returns the built days."""
+    builds = []
+
+    def build(days, account_ids, exclude_internal, user):
+        builds.append(days)
+        return {**snapshot, 'snapshot_id': api.transaction_snapshot_id(
+            user, days, account_ids, exclude_internal, snapshot['content_hash'],
+        ), 'days': days}
+
+    monkeypatch.setattr(api, 'build_transaction_result_set', build)
+    return builds
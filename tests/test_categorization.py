@@ -0,0 +1,71 @@
+import importlib.util
+import itertools
+
+import pytest
+
+from conftest import ROOT
+
+
+@pytest.fixture(scope='module')
+def reference():
+    """The linear keyword scan categorize_transaction used before the compiled matchers."""
+    spec = importlib.util.spec_from_file_location('benchmark_categorization', ROOT / 'scripts' / 'benchmark_categorization.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def builtin_only(api, monkeypatch):
+    """Categorize with the built-in tables only (no user rules)."""
+    monkeypatch.setattr(api, 'get_category_rule_matcher', lambda: None)
+    api._categorize_memoized.cache_clear()
+    yield
+    api._categorize_memoized.cache_clear()
+
+
+def _keywords(api):
+    return sorted({
+        keyword
+        for rules in (api._CATEGORY_INCOME_KEYWORD_RULES, api._CATEGORY_KEYWORD_RULES)
+        for _, keywords in rules
+        for keyword in keywords
+    })
+
+
+def test_every_keyword_alone_matches_like_the_linear_scan(api, reference, builtin_only):
+    for keyword, amount, wrap in itertools.product(_keywords(api), (-5.0, 5.0), ('{}', 'x{}x', ' {} ')):
+        args = (wrap.format(keyword), '', False, None, amount)
+        assert api.categorize_transaction(*args) == reference.reference_categorize_transaction(*args), args
+
+
+def test_overlapping_keywords_keep_the_table_precedence(api, reference, builtin_only):
+    keywords = _keywords(api)
+    for first, second in itertools.permutations(keywords, 2):
+        for amount in (-5.0, 5.0):
+            args = (f"{first}{second}", f"{second} {first}", False, None, amount)
+            assert api.categorize_transaction(*args) == reference.reference_categorize_transaction(*args), args
+
+
+def test_synthetic_transactions_match_the_linear_scan(api, reference, builtin_only):
+    for row in reference._synthetic_transactions(20_000, 2_000, seed=7):
+        assert api.categorize_transaction(*row) == reference.reference_categorize_transaction(*row), row
+
+
+def test_user_rule_matcher_finds_patterns_that_overlap(api):
+    def rule(pattern, category, field='any'):
+        return {'pattern': pattern, 'category': category, 'field': field, 'mcc': None, 'amount_sign': 'any'}
+
+    # Ordered by priority: the longer pattern only wins where it comes first.
+    matcher = api.CategoryRuleMatcher([rule('heijn', 'Boodschappen'), rule('albert', 'Vrienden')])
+    assert matcher.match('albert heijn 1403', '', '', False) == 'Boodschappen'
+    assert matcher.match('albert de vries', '', '', False) == 'Vrienden'
+
+    matcher = api.CategoryRuleMatcher([
+        rule('netflix', 'Abonnementen', field='counterparty'),
+        rule('net', 'Overig'),
+        rule('ne', 'Nooit'),
+    ])
+    assert matcher.match('netflix', 'x', '', False) == 'Overig'
+    assert matcher.match('', 'Netflix.com', '', False) == 'Abonnementen'
+    assert matcher.match('one', '', '', False) == 'Nooit'
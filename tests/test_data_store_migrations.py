@@ -0,0 +1,154 @@
+import sqlite3
+
+import pytest
+
+from conftest import baseline_key
+
+
+def test_baseline_store_migrates_to_integer_keys_on_import(run_api, baseline_store):
+    result, stderr = run_api(
+        """
+connection = api.get_data_db_connection()
+rows = connection.execute(
+    "SELECT tx_id, typeof(tx_key) AS key_type, description FROM transaction_cache ORDER BY tx_id"
+).fetchall()
+T = api.CompactTransaction
+api.persist_transactions([
+    T(id=1000, account_id='7', date='2026-10-01T10:00:00+00:00', amount=-12.5, currency='EUR',
+      amount_eur=-12.5, description='Albert Heijn', source='payment'),
+    T(id=1001, account_id='7', date='2026-10-02T09:30:00+00:00', amount=-40.0, currency='EUR',
+      amount_eur=-40.0, description='NS Groep Utrecht', source='payment'),
+])
+print(json.dumps({
+    'rows': [list(row) for row in rows],
+    'after_refresh': connection.execute("SELECT COUNT(*) FROM transaction_cache").fetchone()[0],
+}))
+""",
+        baseline_store,
+    )
+    assert 'Failed to initialize historical data store' not in stderr
+    assert result['rows'] == [
+        ['1000', 'integer', 'Albert Heijn'],
+        ['1001', 'integer', 'NS Groep Utrecht'],
+        ['1002', 'integer', 'Salaris'],
+    ]
+    # Re-fetched payments update their migrated row instead of adding a second one.
+    assert result['after_refresh'] == 3
+
+
+
+def test_refreshed_card_payment_replaces_its_baseline_row(run_api, baseline_store):
+    card_payment = ('5000', '7', '2026-10-06T11:00:00+00:00', -20.0, 'Bakker Bart')
+    connection = sqlite3.connect(baseline_store)
+    with connection:
+        connection.execute(
+            """
+            INSERT INTO transaction_cache (
+                tx_key, tx_id, account_id, account_name, tx_date, amount, currency, amount_eur,
+                description, counterparty, merchant, category, tx_type, is_internal_transfer, captured_at
+            ) VALUES (?, ?, ?, 'Main', ?, ?, 'EUR', ?, ?, ?, ?, 'Overig', 'card_payment', 0, ?)
+            """,
+            (baseline_key(*card_payment), *card_payment[:4], card_payment[3], *card_payment[4:],
+             card_payment[4], card_payment[4], '2026-10-06T12:00:00+00:00'),
+        )
+    connection.close()
+    result, _ = run_api(
+        """
+T = api.CompactTransaction
+refresh = [
+    T(id=5000, account_id='7', date='2026-10-06T11:00:00+00:00', amount=-20.0, currency='EUR',
+      amount_eur=-20.0, description='Bakker Bart', category='Overig', source='card_payment'),
+]
+api.persist_transactions(refresh)
+api.persist_transactions(refresh)
+connection = api.get_data_db_connection()
+day = connection.execute("SELECT tx_day FROM transaction_cache WHERE tx_id = '5000'").fetchone()[0]
+print(json.dumps({
+    'rows': [list(row) for row in connection.execute(
+        "SELECT tx_id, source FROM transaction_cache WHERE tx_id = '5000'"
+    )],
+    'rollup': list(connection.execute(
+        "SELECT SUM(tx_count), SUM(expense_eur) FROM transaction_daily_rollup WHERE day = ?", (day,)
+    ).fetchone()),
+    'total': connection.execute("SELECT COUNT(*) FROM transaction_cache").fetchone()[0],
+}))
+""",
+        baseline_store,
+    )
+    assert result['rows'] == [['5000', 'card_payment']]
+    assert result['rollup'] == [1, 20.0]
+    assert result['total'] == 4
+
+def test_key_migration_is_atomic(api, baseline_store):
+    connection = sqlite3.connect(baseline_store)
+    connection.row_factory = sqlite3.Row
+    connection.execute("ALTER TABLE transaction_cache ADD COLUMN source TEXT")
+    original = api.build_transaction_cache_key
+
+    def failing_key(transaction):
+        if transaction['id'] == '1002':
+            raise RuntimeError('boom')
+        return original(transaction)
+
+    api.build_transaction_cache_key = failing_key
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            api.migrate_transaction_cache_keys(connection)
+    finally:
+        api.build_transaction_cache_key = original
+    tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert 'transaction_cache_migrating' not in tables
+    assert connection.execute("SELECT COUNT(*), MIN(typeof(tx_key)) FROM transaction_cache").fetchone()[:] == (4, 'text')
+    assert not connection.in_transaction
+    connection.close()
+
+
+def test_baseline_store_migrates_to_current_schema_on_import(run_api, baseline_store):
+    result, stderr = run_api(
+        """
+connection = api.get_data_db_connection()
+columns = {row['name'] for row in connection.execute("PRAGMA table_info(transaction_cache)")}
+T = api.CompactTransaction
+api.persist_transactions([
+    T(id=1003, account_id='8', date='2026-10-05T08:00:00+00:00', amount=-3.0, currency='EUR',
+      amount_eur=-3.0, description='Bakker', source='payment'),
+])
+print(json.dumps({
+    'version': api.get_data_store_version(connection),
+    'columns': sorted(columns & {'content_hash', 'tx_epoch', 'tx_day', 'source'}),
+    'epochs': connection.execute(
+        "SELECT COUNT(*) FROM transaction_cache WHERE tx_epoch IS NULL OR tx_day != tx_epoch / 86400"
+    ).fetchone()[0],
+    'rows': connection.execute("SELECT COUNT(*) FROM transaction_cache").fetchone()[0],
+    'rollup': connection.execute("SELECT SUM(tx_count) FROM transaction_daily_rollup").fetchone()[0],
+    'without_rowid': sorted(
+        row['name'] for row in connection.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table'")
+        if 'WITHOUT ROWID' in row['sql'].upper()
+    ),
+    'writer_failures': api.get_write_behind_stats()['transaction_cache']['failures'],
+}))
+""",
+        baseline_store,
+    )
+    assert 'Failed to initialize historical data store' not in stderr
+    assert 'Query plan regression' not in stderr
+    assert result['version'] == 2
+    assert result['columns'] == ['content_hash', 'source', 'tx_day', 'tx_epoch']
+    assert result['epochs'] == 0
+    assert result['rows'] == result['rollup'] == 4
+    assert result['without_rowid'] == [
+        'account_snapshots', 'fx_rates', 'transaction_daily_rollup', 'transaction_sync_state',
+    ]
+    assert result['writer_failures'] == 0
+
+
+def test_migrations_are_idempotent(api, baseline_store):
+    connection = sqlite3.connect(baseline_store)
+    connection.row_factory = sqlite3.Row
+    assert api.migrate_data_store(connection) == [1, 2]
+    assert api.migrate_data_store(connection) == []
+    # A step interrupted before the version bump is simply re-run.
+    connection.execute("PRAGMA user_version = 1")
+    assert api.migrate_data_store(connection) == [2]
+    assert connection.execute("SELECT COUNT(*) FROM transaction_cache").fetchone()[0] == 3
+    connection.close()
@@ -0,0 +1,50 @@
+import pytest
+
+
+class _FailingFrankfurter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, url, params=None, timeout=None):
+        self.calls += 1
+        raise ConnectionError('frankfurter unreachable')
+
+
+@pytest.fixture
+def frankfurter(api, monkeypatch):
+    monkeypatch.setattr(api, 'FX_ENABLED', True)
+    monkeypatch.setattr(api, 'FX_RATE_SOURCE', 'frankfurter')
+    monkeypatch.setattr(api, 'FX_NEGATIVE_CACHE_SECONDS', 300)
+    monkeypatch.setattr(api, '_FX_RUNTIME_CACHE', {})
+    fake = _FailingFrankfurter()
+    monkeypatch.setattr(api.requests, 'get', fake)
+    return fake
+
+
+def test_failed_batch_lookup_is_not_retried_within_the_ttl(api, frankfurter, monkeypatch):
+    pairs = [('XTS', '2026-10-01'), ('XTS', '2026-10-02')]
+    assert api.resolve_fx_rates(pairs) == {pair: None for pair in pairs}
+    assert frankfurter.calls == 1
+    assert api.resolve_fx_rates(pairs) == {pair: None for pair in pairs}
+    assert frankfurter.calls == 1
+
+    clock = api.time.time() + 301
+    monkeypatch.setattr(api.time, 'time', lambda: clock)
+    api.resolve_fx_rates(pairs)
+    assert frankfurter.calls == 2
+
+
+def test_failed_single_lookup_is_not_retried_within_the_ttl(api, frankfurter):
+    assert api.fetch_fx_rate('XTS', rate_date='2026-10-01') is None
+    assert api.fetch_fx_rate('XTS', rate_date='2026-10-01') is None
+    assert frankfurter.calls == 1
+    # The batch path shares the remembered failure.
+    assert api.resolve_fx_rates([('XTS', '2026-10-01')]) == {('XTS', '2026-10-01'): None}
+    assert frankfurter.calls == 1
+
+
+def test_zero_ttl_retries_every_time(api, frankfurter, monkeypatch):
+    monkeypatch.setattr(api, 'FX_NEGATIVE_CACHE_SECONDS', 0)
+    api.resolve_fx_rates([('XTS', '2026-10-01')])
+    api.resolve_fx_rates([('XTS', '2026-10-01')])
+    assert frankfurter.calls == 2
@@ -0,0 +1,72 @@
+import gzip
+import json
+
+import brotli
+import pytest
+
+from conftest import make_snapshot, serve_snapshot
+
+
+@pytest.mark.parametrize('accept, expected', [
+    ('gzip, br', 'br'),
+    ('gzip', 'gzip'),
+    ('br;q=0, gzip', 'gzip'),
+    ('gzip;q=0', None),
+    ('identity', None),
+    ('', None),
+])
+def test_negotiate_content_encoding(api, accept, expected):
+    with api.app.test_request_context('/api/transactions', headers={'Accept-Encoding': accept}):
+        assert api.negotiate_content_encoding() == expected
+
+
+def _decode(response):
+    encoding = response.headers.get('Content-Encoding')
+    body = response.get_data()
+    if encoding == 'br':
+        return brotli.decompress(body)
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    assert encoding is None
+    return body
+
+
+@pytest.mark.parametrize('encoding', ['br', 'gzip'])
+def test_streamed_page_decompresses_to_the_identity_body(api, client, monkeypatch, encoding):
+    monkeypatch.setattr(api, 'STREAM_JSON_MIN_ROWS', 10)
+    serve_snapshot(api, monkeypatch, make_snapshot(api, rows=[(str(n), -1.0 - n) for n in range(40)]))
+    plain = client.get('/api/transactions?days=90&page_size=40')
+    compressed = client.get('/api/transactions?days=90&page_size=40', headers={'Accept-Encoding': encoding})
+    assert plain.is_streamed and compressed.is_streamed
+    assert compressed.headers['Content-Encoding'] == encoding
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert _decode(compressed) == plain.get_data()
+    assert len(json.loads(plain.get_data())['data']) == 40
+
+
+def test_each_encoding_has_its_own_etag(api, client, monkeypatch):
+    serve_snapshot(api, monkeypatch, make_snapshot(api))
+    tags = {}
+    for encoding in ('br', 'gzip', ''):
+        response = client.get('/api/transactions?days=90', headers={'Accept-Encoding': encoding})
+        assert response.status_code == 200
+        tags[encoding] = response.headers['ETag']
+    assert len(set(tags.values())) == 3
+
+    repeat = client.get('/api/transactions?days=90', headers={'Accept-Encoding': 'gzip', 'If-None-Match': tags['gzip']})
+    assert repeat.status_code == 304
+    assert repeat.get_data() == b''
+    other = client.get('/api/transactions?days=90', headers={'Accept-Encoding': 'br', 'If-None-Match': tags['gzip']})
+    assert other.status_code == 200
+
+
+def test_uncached_json_is_tagged_by_content(api, client):
+    first = client.get('/api/admin/category-rules', headers={'Accept-Encoding': 'gzip'})
+    assert first.status_code == 200
+    assert first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+    assert len(first.get_data()) < api.COMPRESS_MIN_BYTES
+    assert 'Content-Encoding' not in first.headers
+
+    again = client.get('/api/admin/category-rules', headers={'Accept-Encoding': 'gzip', 'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
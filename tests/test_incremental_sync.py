@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+
+
+def _refresh(api, bunq, days=30):
+    """One refresh as build_transaction_result_set runs it: fetch, then queue rows and sync marks."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    transactions, _, sync_updates = api.fetch_transactions_for_accounts(bunq.accounts, cutoff, set(), set())
+    api.persist_synced_transactions(transactions, sync_updates)
+    return sorted((str(tx['id']), tx['date'], tx['amount'], tx['category']) for tx in transactions)
+
+
+def test_second_refresh_only_walks_payments_above_the_high_water_mark(api, bunq, monkeypatch):
+    monkeypatch.setattr(api, '_BUNQ_PAYMENT_PAGE_SIZE', 5)
+    ids = [bunq.add_payment(1, hours_ago=200 - hour) for hour in range(20)]
+
+    full = _refresh(api, bunq)
+    assert bunq.calls['payment'] >= 5  # 20 payments in pages of 5, plus account 2
+    assert api.load_transaction_sync_state(1, 'payment')['high_water_id'] == max(ids)
+
+    bunq.calls.clear()
+    incremental = _refresh(api, bunq)
+    assert bunq.calls['payment'] == 2  # one page per account, stopped at the mark
+    # Older rows come from transaction_cache: same result as the full walk.
+    assert incremental == full
+
+    bunq.calls.clear()
+    new_id = bunq.add_payment(1, hours_ago=0)
+    assert len(_refresh(api, bunq)) == len(full) + 1
+    assert bunq.calls['payment'] == 2
+    assert api.load_transaction_sync_state(1, 'payment')['high_water_id'] == new_id
+
+
+def test_wider_window_than_the_synced_range_walks_everything_again(api, bunq, monkeypatch):
+    monkeypatch.setattr(api, '_BUNQ_PAYMENT_PAGE_SIZE', 5)
+    for hour in range(20):
+        bunq.add_payment(1, hours_ago=24 * 40 - hour * 24)
+    _refresh(api, bunq, days=30)
+    synced_from = api.load_transaction_sync_state(1, 'payment')['synced_from']
+
+    bunq.calls.clear()
+    assert len(_refresh(api, bunq, days=60)) == 20
+    assert bunq.calls['payment'] > 2
+    assert api.load_transaction_sync_state(1, 'payment')['synced_from'] < synced_from
+
+
+def test_high_water_mark_only_advances_with_its_rows(api, bunq, monkeypatch):
+    bunq.add_payment(1, hours_ago=5)
+    _refresh(api, bunq)
+    before = api.load_transaction_sync_state(1, 'payment')
+
+    new_id = bunq.add_payment(1, hours_ago=1)
+    real_connection = api.get_data_db_connection
+    monkeypatch.setattr(api, 'get_data_db_connection', lambda: None)
+    cutoff = datetime.now(timezone.utc) - timedelta(days=30)
+    transactions, _, sync_updates = api.fetch_transactions_for_accounts(bunq.accounts, cutoff, set(), set())
+    api.persist_synced_transactions(transactions, sync_updates)
+    monkeypatch.setattr(api, 'get_data_db_connection', real_connection)
+    # The failed batch held the rows and their mark: neither reached the store.
+    assert api.load_transaction_sync_state(1, 'payment') == before
+
+    api._TRANSACTION_CACHE_WRITER.flush()
+    assert api.load_transaction_sync_state(1, 'payment')['high_water_id'] == new_id
+    connection = real_connection()
+    assert connection.execute(
+        "SELECT COUNT(*) FROM transaction_cache WHERE tx_id = ?", (str(new_id),)
+    ).fetchone()[0] == 1
+    api.release_data_db_connection(connection)
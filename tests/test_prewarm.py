@@ -0,0 +1,46 @@
+import pytest
+
+
+@pytest.fixture
+def scheduler(api, monkeypatch):
+    monkeypatch.setattr(api, 'ensure_bunq_initialized', lambda **kwargs: True)
+    monkeypatch.setattr(api, 'SCHEDULER_ENABLED', True)
+    monkeypatch.setattr(api, 'SCHEDULER_WARM_DAYS', [30, 90])
+    monkeypatch.setattr(api, 'SCHEDULER_WARM_ACCOUNT_FILTERS', 2)
+    monkeypatch.setenv('BASIC_AUTH_USERNAME', 'admin')
+    monkeypatch.setattr(api, '_WARM_ACCOUNT_FILTERS_RECORDED', {})
+
+
+def _warmed(api, days, account_ids):
+    return api.cache.get(api.make_result_set_key('transactions_result_set', days, account_ids, False, 'admin'))
+
+
+def test_requested_account_filters_are_warmed(api, client, bunq, scheduler):
+    for account_id in (1, 2):
+        bunq.add_payment(account_id, hours_ago=5)
+    client.get('/api/transactions?days=30&account_ids=2')
+    client.get('/api/transactions/export?days=90&account_ids=1,2&format=columnar')
+    assert api.recent_warm_account_filters('admin') == [('1', '2'), ('2',)]
+
+    assert _warmed(api, 90, ('2',)) is None
+    assert api.run_prewarm_cycle()
+    for account_ids in (None, ('2',), ('1', '2')):
+        for days in (30, 90):
+            assert _warmed(api, days, account_ids) is not None
+    assert _warmed(api, 30, ('1',)) is None
+
+
+def test_warm_list_keeps_the_most_recent_filters(api, client, bunq, scheduler):
+    for account_ids in ('1', '2', '1,2'):
+        client.get(f'/api/transactions?days=30&account_ids={account_ids}')
+    assert api.recent_warm_account_filters('admin') == [('1', '2'), ('2',)]
+    # Unfiltered and pinned-snapshot requests are not recorded.
+    first = client.get('/api/transactions?days=30&page_size=1').get_json()
+    client.get(f"/api/transactions?days=30&page_size=1&page=2&snapshot_id={first['snapshot_id']}")
+    assert api.recent_warm_account_filters('admin') == [('1', '2'), ('2',)]
+
+
+def test_account_filters_can_be_switched_off(api, client, bunq, scheduler, monkeypatch):
+    monkeypatch.setattr(api, 'SCHEDULER_WARM_ACCOUNT_FILTERS', 0)
+    client.get('/api/transactions?days=30&account_ids=2')
+    assert api.recent_warm_account_filters('admin') == []
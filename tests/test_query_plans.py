@@ -0,0 +1,39 @@
+import sqlite3
+
+
+def _plan_problems(api, connection):
+    return [
+        f"{name}: {problem}\n    " + '\n    '.join(plan)
+        for name, problem, plan in api.check_data_store_query_plans(connection)
+    ]
+
+
+def test_fresh_store_query_plans(api):
+    connection = api.get_data_db_connection()
+    try:
+        assert api.get_data_store_version(connection) == api.DATA_STORE_SCHEMA_VERSION
+        assert _plan_problems(api, connection) == []
+    finally:
+        api.release_data_db_connection(connection)
+
+
+def test_migrated_baseline_store_query_plans(api, baseline_store):
+    connection = sqlite3.connect(baseline_store)
+    connection.row_factory = sqlite3.Row
+    api.migrate_data_store(connection)
+    api.install_transaction_rollup(connection)
+    connection.execute("ANALYZE")
+    assert _plan_problems(api, connection) == []
+    connection.close()
+
+
+def test_plan_check_reports_a_missing_index(api, tmp_path):
+    connection = sqlite3.connect(tmp_path / 'store.db')
+    connection.row_factory = sqlite3.Row
+    api.migrate_data_store(connection)
+    api.install_transaction_rollup(connection)
+    connection.execute("DROP INDEX idx_transaction_cache_merchant_window")
+    problems = {name for name, _, _ in api.check_data_store_query_plans(connection)}
+    assert 'merchant ranking' in problems
+    connection.close()
+
@@ -0,0 +1,44 @@
+def _live(api, **fields):
+    return api.CompactTransaction(**{
+        'id': 7001, 'account_id': '9', 'account_name': 'Main', 'date': '2026-10-07T10:00:00+00:00',
+        'amount': -30.0, 'currency': 'EUR', 'amount_eur': -30.0, 'fx_rate_to_eur': 1.0,
+        'description': 'Albert Heijn 1234', 'counterparty': 'Albert Heijn', 'merchant': 'Albert Heijn',
+        'category': 'Boodschappen', 'merchant_category_code': '', 'type': 'PAYMENT', 'source': 'payment',
+        'is_internal_transfer': False, **fields,
+    })
+
+
+def test_recategorize_reapplies_builtin_rules_and_refreshes_fingerprints(api):
+    connection = api.get_data_db_connection()
+    # Stored while the keyword tables did not know the merchant yet.
+    api.persist_transactions([_live(api, category='Overig')])
+    tx_key = api.build_transaction_cache_key(_live(api))
+    with connection:
+        # Captured before MCCs were stored.
+        connection.execute(
+            """
+            INSERT INTO transaction_cache (
+                tx_key, tx_id, account_id, tx_date, amount, currency, amount_eur, description,
+                counterparty, category, is_internal_transfer, captured_at, tx_epoch, tx_day
+            ) VALUES (-7002, '7002', '9', '2026-10-07T11:00:00+00:00', -5.0, 'EUR', -5.0, 'Lidl Utrecht',
+                      'Lidl', 'Overig', 0, '2026-10-07T12:00:00+00:00', 1791370800, 20733)
+            """
+        )
+
+    counts = api.recategorize_transaction_cache()
+
+    stored = dict(connection.execute(
+        "SELECT tx_key, category FROM transaction_cache WHERE tx_key IN (?, -7002)", (tx_key,)
+    ).fetchall())
+    assert stored == {tx_key: 'Boodschappen', -7002: 'Boodschappen'}
+    assert counts['updated'] >= 2
+    content_hash = connection.execute(
+        "SELECT content_hash FROM transaction_cache WHERE tx_key = ?", (tx_key,)
+    ).fetchone()[0]
+    assert content_hash == api.transaction_content_fingerprint(api._transaction_cache_content(_live(api)))
+
+    # The next refresh of the same payment is a no-op against the stored fingerprint.
+    api._TRANSACTION_CACHE_FINGERPRINTS.pop(tx_key, None)
+    api.persist_transactions([_live(api)])
+    assert api._TRANSACTION_CACHE_LAST['batch'] == {'inserted': 0, 'updated': 0, 'unchanged': 1}
+    api.release_data_db_connection(connection)
@@ -0,0 +1,35 @@
+def test_sqlite_response_cache_is_created_on_first_use(run_api, tmp_path):
+    result, _ = run_api(
+        """
+import os
+before = os.path.exists(api.cache.path)
+stats = api.get_response_cache_stats()
+after_stats = os.path.exists(api.cache.path)
+api.cache.set('probe', {'ok': True})
+print(json.dumps({
+    'before': before,
+    'stats_entries': stats['entries'],
+    'after_stats': after_stats,
+    'value': api.cache.get('probe'),
+    'after_set': os.path.exists(api.cache.path),
+}))
+""",
+        tmp_path / 'dashboard_data.db',
+        RESPONSE_CACHE_BACKEND='sqlite',
+        CACHE_ENABLED='false',
+    )
+    assert result == {
+        'before': False,
+        'stats_entries': 0,
+        'after_stats': False,
+        'value': {'ok': True},
+        'after_set': True,
+    }
+
+
+def test_oversized_values_are_not_stored(api, tmp_path):
+    cache = api.SQLiteResponseCache(str(tmp_path / 'response_cache.db'), max_entry_bytes=1024)
+    assert cache.set('small', 'x' * 100)
+    assert not cache.set('large', 'x' * 4096)
+    assert cache.get('large') is None
+    assert cache.stats()['oversized'] == 1
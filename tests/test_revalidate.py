@@ -0,0 +1,65 @@
+import threading
+import time
+
+
+def _entry(value, age_seconds):
+    return {'swr_value': value, 'swr_created_at': time.time() - age_seconds}
+
+
+def _builder(value, gate=None):
+    calls = []
+
+    def build():
+        calls.append(threading.current_thread().name)
+        if gate is not None:
+            gate.wait(5)
+        return value
+
+    return build, calls
+
+
+def test_fresh_entry_is_served_without_a_build(api, client):
+    api.cache.set('swr:fresh', _entry('cached', 1))
+    build, calls = _builder('rebuilt')
+    with api.app.test_request_context('/'):
+        value, age, stale = api.get_with_revalidate('swr:fresh', build)
+    assert (value, stale, calls) == ('cached', False, [])
+    assert 1 <= age < 2
+
+
+def test_stale_entry_is_served_while_one_background_refresh_runs(api, client):
+    api.cache.set('swr:stale', _entry('old', api.CACHE_TTL_SECONDS + 1))
+    gate = threading.Event()
+    build, calls = _builder('new', gate)
+    with api.app.test_request_context('/'):
+        first = api.get_with_revalidate('swr:stale', build)
+        second = api.get_with_revalidate('swr:stale', build)
+    assert [value for value, _, _ in (first, second)] == ['old', 'old']
+    assert first[2] and second[2]
+
+    gate.set()
+    deadline = time.monotonic() + 5
+    while api.cache.get('swr:stale')['swr_value'] != 'new' and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert calls == ['cache-revalidate']
+    with api.app.test_request_context('/'):
+        value, _, stale = api.get_with_revalidate('swr:stale', build)
+    assert (value, stale) == ('new', False)
+
+
+def test_entry_past_the_stale_window_is_rebuilt_on_the_request_path(api, client):
+    api.cache.set('swr:expired', _entry('old', api.CACHE_TTL_SECONDS + api.CACHE_MAX_STALE_SECONDS + 1))
+    build, calls = _builder('rebuilt')
+    with api.app.test_request_context('/'):
+        value, age, stale = api.get_with_revalidate('swr:expired', build)
+    assert (value, age, stale) == ('rebuilt', 0.0, False)
+    assert calls == [threading.current_thread().name]
+    assert api.cache.get('swr:expired')['swr_value'] == 'rebuilt'
+
+
+def test_cache_false_always_rebuilds(api, client):
+    api.cache.set('swr:bypass', _entry('cached', 1))
+    build, calls = _builder('rebuilt')
+    with api.app.test_request_context('/?cache=false'):
+        assert api.get_with_revalidate('swr:bypass', build)[0] == 'rebuilt'
+    assert len(calls) == 1
@@ -0,0 +1,82 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+
+def _wait_until_waiting(flight, waiters):
+    """Block until `waiters` callers are parked behind the leader."""
+    while flight.stats()['coalesced'] < waiters:
+        time.sleep(0.005)
+
+
+def test_concurrent_callers_share_one_run(api):
+    flight = api.SingleFlight()
+    release = threading.Event()
+    runs = []
+
+    def work():
+        runs.append(1)
+        release.wait(5)
+        return {'rows': 3}
+
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(flight.do, 'key', work) for _ in range(4)]
+        _wait_until_waiting(flight, 3)
+        release.set()
+        results = [future.result(5) for future in futures]
+
+    assert runs == [1]
+    assert results == [{'rows': 3}] * 4
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {'leaders': 1, 'coalesced': 3, 'in_flight': 0}
+
+
+def test_errors_are_shared_and_the_next_call_runs_again(api):
+    flight = api.SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise RuntimeError('bunq down')
+
+    with ThreadPoolExecutor(2) as pool:
+        futures = [pool.submit(flight.do, 'key', failing) for _ in range(2)]
+        _wait_until_waiting(flight, 1)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError, match='bunq down'):
+                future.result(5)
+
+    assert flight.do('key', lambda: 'fresh') == 'fresh'
+    assert flight.do('other', lambda: 'other') == 'other'
+    assert flight.stats()['leaders'] == 3
+
+
+def test_identical_stream_fetches_hit_bunq_once(api, bunq, monkeypatch):
+    bunq.add_payment(1, hours_ago=2)
+    flight = api.SingleFlight()
+    monkeypatch.setattr(api, '_SINGLE_FLIGHT', flight)
+    release = threading.Event()
+    endpoint = bunq.endpoint(bunq.payments, 'payment')
+
+    class GatedEndpoint:
+        @staticmethod
+        def list(monetary_account_id=None, params=None):
+            release.wait(5)
+            return endpoint.list(monetary_account_id, params)
+
+    monkeypatch.setattr(api, 'discover_payment_endpoints', lambda: [('fake', GatedEndpoint)])
+    cutoff = datetime.now(timezone.utc) - timedelta(days=30)
+    with ThreadPoolExecutor(3) as pool:
+        futures = [pool.submit(api.fetch_account_payment_stream, 1, 'payment', cutoff) for _ in range(3)]
+        _wait_until_waiting(flight, 2)
+        release.set()
+        streams = [future.result(5) for future in futures]
+
+    assert bunq.calls['payment'] == 1
+    assert [len(payments) for payments, _, _ in streams] == [1, 1, 1]
+    # Callers annotate meta: every caller gets its own copy.
+    assert len({id(meta) for _, meta, _ in streams}) == 3
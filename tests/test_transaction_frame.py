@@ -0,0 +1,21 @@
+def test_frame_amounts_follow_the_statistics_rules(api):
+    def T(**fields):
+        return api.CompactTransaction(date='2026-10-01T10:00:00+00:00', **fields)
+
+    frame = api.TransactionFrame.from_transactions([
+        T(id=1, amount=-10.0, currency='EUR', amount_eur=-9.0),
+        T(id=2, amount=-4.0, currency='', amount_eur=None),
+        T(id=3, amount=-3.0, currency=None, amount_eur=None),
+        T(id=4, amount=-7.0, currency='eur', amount_eur=None),
+        T(id=5, amount=-8.0, currency='USD', amount_eur=None),
+    ])
+    assert [float(value) for value in frame.amount] == [-9.0, -4.0, -3.0, -7.0, 0.0]
+
+
+def test_frame_amounts_tolerate_unparseable_values(api):
+    frame = api.TransactionFrame.from_transactions([
+        {'amount': '12,50', 'currency': 'EUR', 'amount_eur': None, 'date': '2026-10-01'},
+        {'amount': 'n/a', 'currency': 'EUR', 'amount_eur': None, 'date': '2026-10-01'},
+        {'amount': -1.0, 'currency': 'USD', 'amount_eur': '-0,90', 'date': '2026-10-01'},
+    ])
+    assert [float(value) for value in frame.amount] == [12.5, 0.0, -0.9]
@@ -0,0 +1,105 @@
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def store(api, tmp_path):
+    connection = sqlite3.connect(tmp_path / 'store.db')
+    connection.row_factory = sqlite3.Row
+    api.migrate_data_store(connection)
+    api.install_transaction_rollup(connection)
+    yield connection
+    connection.close()
+
+
+def _insert(connection, tx_key, day, amount, category='Boodschappen', account_id='1', merchant='Albert Heijn',
+            currency='EUR', amount_eur=None, internal=0, captured_at='2026-10-07T12:00:00+00:00'):
+    with connection:
+        connection.execute(
+            """
+            INSERT INTO transaction_cache (
+                tx_key, tx_id, account_id, tx_date, amount, currency, amount_eur, merchant,
+                category, is_internal_transfer, captured_at, tx_epoch, tx_day
+            ) VALUES (?, ?, ?, date(? * 86400, 'unixepoch') || 'T10:00:00+00:00', ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (tx_key, str(tx_key), account_id, day, amount, currency,
+             amount if amount_eur is None else amount_eur, merchant, category, internal, captured_at,
+             day * 86400 + 36000, day),
+        )
+
+
+def _rollup(api, connection):
+    """Rollup rows keyed by their dimensions, measures rounded; last_captured_at left out."""
+    dimension_count = len(api._ROLLUP_DIMENSIONS)
+    return {
+        tuple(row[:dimension_count]): tuple(round(value, 6) for value in row[dimension_count:-1])
+        for row in connection.execute(f"SELECT {', '.join(api._ROLLUP_COLUMNS)} FROM transaction_daily_rollup")
+    }
+
+
+def _assert_matches_raw_rows(api, connection):
+    maintained = _rollup(api, connection)
+    with connection:
+        api.rebuild_transaction_rollup(connection)
+    assert maintained == _rollup(api, connection)
+
+
+def _seed(connection):
+    _insert(connection, 1, 20733, -20.0)
+    _insert(connection, 2, 20733, -5.5)
+    _insert(connection, 3, 20733, 1500.0, category='Salaris', merchant='')
+    _insert(connection, 4, 20734, -12.0, currency='USD', amount_eur=-11.0, account_id='2')
+    _insert(connection, 5, 20734, -40.0, internal=1, category=None, merchant='unknown')
+    _insert(connection, 6, 20735, -3.0, currency='USD', amount_eur=None)
+
+
+def test_inserts_match_the_raw_aggregate(api, store):
+    _seed(store)
+    assert sum(row[0] for row in store.execute("SELECT tx_count FROM transaction_daily_rollup")) == 6
+    _assert_matches_raw_rows(api, store)
+
+
+def test_updates_move_rows_between_groups(api, store):
+    _seed(store)
+    with store:
+        store.execute("UPDATE transaction_cache SET category = 'Horeca' WHERE tx_key = 1")
+        store.execute("UPDATE transaction_cache SET amount = -7.5, amount_eur = -7.5 WHERE tx_key = 2")
+        # A re-dated row, with its typed columns, as the writers store it.
+        store.execute(
+            "UPDATE transaction_cache SET tx_date = '2026-10-10T10:00:00+00:00', tx_epoch = ?, tx_day = 20736 "
+            "WHERE tx_key = 3",
+            (20736 * 86400 + 36000,),
+        )
+        store.execute("UPDATE transaction_cache SET merchant = 'Lidl', is_internal_transfer = 0 WHERE tx_key = 5")
+        store.execute("UPDATE transaction_cache SET amount_eur = -2.7 WHERE tx_key = 6")
+        # Columns outside the rollup leave it untouched.
+        store.execute("UPDATE transaction_cache SET description = 'edited' WHERE tx_key = 4")
+    _assert_matches_raw_rows(api, store)
+
+
+def test_deletes_remove_emptied_groups(api, store):
+    _seed(store)
+    with store:
+        store.execute("DELETE FROM transaction_cache WHERE tx_key IN (3, 5)")
+        store.execute("DELETE FROM transaction_cache WHERE tx_day = 20735")
+    _assert_matches_raw_rows(api, store)
+    assert store.execute(
+        "SELECT COUNT(*) FROM transaction_daily_rollup WHERE category = 'Salaris' OR day = 20735"
+    ).fetchone()[0] == 0
+    with store:
+        store.execute("DELETE FROM transaction_cache")
+    assert store.execute("SELECT COUNT(*) FROM transaction_daily_rollup").fetchone()[0] == 0
+
+
+def test_recapture_only_moves_last_captured_at(api, store):
+    _seed(store)
+    before = _rollup(api, store)
+    with store:
+        store.execute(
+            "UPDATE transaction_cache SET captured_at = '2026-10-08T12:00:00+00:00' WHERE tx_key = 1"
+        )
+    assert _rollup(api, store) == before
+    assert store.execute(
+        "SELECT last_captured_at FROM transaction_daily_rollup WHERE day = 20733 AND category = 'Boodschappen'"
+    ).fetchone()[0] == '2026-10-08T12:00:00+00:00'
@@ -0,0 +1,91 @@
+from conftest import make_snapshot, serve_snapshot
+
+
+def test_rebuilt_identical_snapshot_keeps_its_id(api):
+    assert make_snapshot(api)['snapshot_id'] == make_snapshot(api)['snapshot_id']
+    assert make_snapshot(api)['snapshot_id'] != make_snapshot(api, rows=(('1', -6.0),))['snapshot_id']
+    assert make_snapshot(api)['snapshot_id'] != make_snapshot(api, user='other')['snapshot_id']
+    assert make_snapshot(api)['snapshot_id'] != make_snapshot(api, days=30)['snapshot_id']
+
+
+def test_pinned_snapshot_must_match_the_request_filter(api):
+    snapshot = make_snapshot(api, account_ids=('7',))
+    snapshot_id = api.cache_transaction_snapshot(snapshot)
+    assert api.load_transaction_snapshot(snapshot_id, 'admin', 90, ('7',), False) is not None
+    assert api.load_transaction_snapshot(snapshot_id, 'other', 90, ('7',), False) is None
+    assert api.load_transaction_snapshot(snapshot_id, 'admin', 30, ('7',), False) is None
+    assert api.load_transaction_snapshot(snapshot_id, 'admin', 90, ('8',), False) is None
+    assert api.load_transaction_snapshot(snapshot_id, 'admin', 90, None, False) is None
+    assert api.load_transaction_snapshot(snapshot_id, 'admin', 90, ('7',), True) is None
+
+
+class _CacheReads:
+    """Records the response-cache keys a test reads."""
+
+    def __init__(self, api, monkeypatch):
+        self.keys = []
+        get = api.cache.get
+
+        def recording_get(key):
+            self.keys.append(key)
+            return get(key)
+
+        monkeypatch.setattr(api.cache, 'get', recording_get)
+
+    def rows(self):
+        return [key for key in self.keys if key.startswith('transactions_snapshot_rows:')]
+
+
+def test_pages_of_one_walk_are_served_from_memory(api, client, monkeypatch):
+    builds = serve_snapshot(api, monkeypatch, make_snapshot(api, rows=[(str(n), -1.0 - n) for n in range(5)]))
+    first = client.get('/api/transactions?days=90&page_size=2').get_json()
+    reads = _CacheReads(api, monkeypatch)
+    pages = [
+        client.get(f"/api/transactions?days=90&page_size=2&page={page}&snapshot_id={first['snapshot_id']}").get_json()
+        for page in (2, 3)
+    ]
+    assert [len(page['data']) for page in pages] == [2, 1]
+    assert {page['snapshot_id'] for page in pages} == {first['snapshot_id']}
+    assert builds == [90]
+    assert reads.rows() == []
+
+    # Another worker (empty memo) loads the rows once, then serves from memory.
+    with api._TRANSACTION_SNAPSHOT_MEMO_LOCK:
+        api._TRANSACTION_SNAPSHOT_MEMO.clear()
+    for page in (1, 2, 3):
+        client.get(f"/api/transactions?days=90&page_size=2&page={page}&snapshot_id={first['snapshot_id']}")
+    assert len(reads.rows()) == 1
+    assert builds == [90]
+
+
+def test_conditional_request_is_answered_from_the_header(api, client, monkeypatch):
+    serve_snapshot(api, monkeypatch, make_snapshot(api))
+    first = client.get('/api/transactions?days=90')
+    with api._TRANSACTION_SNAPSHOT_MEMO_LOCK:
+        api._TRANSACTION_SNAPSHOT_MEMO.clear()
+    reads = _CacheReads(api, monkeypatch)
+    again = client.get('/api/transactions?days=90', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    assert reads.rows() == []
+    export = client.get('/api/transactions/export?days=90')
+    assert export.status_code == 200
+    assert export.get_json()['count'] == 1
+    assert reads.rows() == [f"transactions_snapshot_rows:{first.get_json()['snapshot_id']}:0"]
+
+
+def test_snapshot_rows_are_stored_in_slices(api, client, monkeypatch):
+    monkeypatch.setattr(api, 'TRANSACTION_SNAPSHOT_SLICE_ROWS', 2)
+    snapshot = make_snapshot(api, rows=[(str(n), -1.0 - n) for n in range(5)])
+    snapshot_id = api.cache_transaction_snapshot(snapshot)
+    with api._TRANSACTION_SNAPSHOT_MEMO_LOCK:
+        api._TRANSACTION_SNAPSHOT_MEMO.clear()
+    reads = _CacheReads(api, monkeypatch)
+    loaded = api.load_transaction_snapshot(snapshot_id, 'admin', 90, None, False)
+    assert loaded['transactions'] == snapshot['transactions']
+    assert reads.rows() == [f"transactions_snapshot_rows:{snapshot_id}:{index}" for index in range(3)]
+
+    # A missing slice makes the whole set a miss, never a partial one.
+    with api._TRANSACTION_SNAPSHOT_MEMO_LOCK:
+        api._TRANSACTION_SNAPSHOT_MEMO.clear()
+    api.cache.delete(f"transactions_snapshot_rows:{snapshot_id}:1")
+    assert api.load_transaction_snapshot(snapshot_id, 'admin', 90, None, False) is None
@@ -0,0 +1,78 @@
+import sqlite3
+import time
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_failed_connection_requeues_the_batch(api, monkeypatch):
+    written = []
+    queue = api.WriteBehindQueue('test', lambda connection, rows: written.extend(rows), interval_ms=0)
+
+    def unavailable():
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(api, 'get_data_db_connection', unavailable)
+    queue.submit('a', 1)
+    stats = queue.stats()
+    assert (stats['pending'], stats['failures'], written) == (1, 1, [])
+    assert 'database is locked' in stats['last_error']
+
+    monkeypatch.setattr(api, 'get_data_db_connection', lambda: None)
+    assert queue.flush() == 0
+    assert queue.stats()['pending'] == 1
+
+    monkeypatch.undo()
+    assert queue.flush() == 1
+    assert written == [1]
+    assert queue.stats()['pending'] == 0
+
+
+def test_failed_batch_is_requeued_whole_past_the_bound(api, monkeypatch):
+    written = []
+    queue = api.WriteBehindQueue(
+        'test', lambda connection, rows: written.extend(rows), interval_ms=0, max_pending=2,
+    )
+    monkeypatch.setattr(api, 'get_data_db_connection', lambda: None)
+    queue.submit_many([(key, f'{key}1') for key in 'abcde'] + [('sync', 'mark')])
+    queue.submit('a', 'a2')
+    stats = queue.stats()
+    assert (stats['pending'], stats['requeued']) == (6, 12)
+
+    monkeypatch.undo()
+    assert queue.flush() == 6
+    assert written == ['a2', 'b1', 'c1', 'd1', 'e1', 'mark']
+
+def test_writer_thread_survives_a_failing_flush(api):
+    written = []
+    queue = api.WriteBehindQueue('test', lambda connection, rows: written.extend(rows), interval_ms=10)
+    real_flush = queue.flush
+    calls = []
+
+    def flaky_flush():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError('boom')
+        return real_flush()
+
+    queue.flush = flaky_flush
+    queue.submit('a', 1)
+    assert _wait_for(lambda: written == [1])
+    assert queue._thread.is_alive()
+
+
+def test_account_snapshot_queue_errors_do_not_reach_the_request(api, monkeypatch):
+    def broken(items):
+        raise RuntimeError('queue broken')
+
+    monkeypatch.setattr(api._ACCOUNT_SNAPSHOT_WRITER, 'submit_many', broken)
+    account = {'id': 991, 'balance': {'value': '1.00', 'currency': 'EUR'}, 'balance_eur': {'value': '1.00'}}
+    api.persist_account_snapshots([account])
+    # Not remembered as queued: the next accounts refresh tries again.
+    assert '991' not in api._ACCOUNT_SNAPSHOT_LAST_QUEUED